@@ -1,21 +1,66 @@
 import re
-import time
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from http.client import HTTPException
 from pathlib import Path
-from typing import Optional, Union
+from typing import Literal, Optional, Union
 from xml.etree import ElementTree
 
-import requests
 import requests_cache
 from bs4 import BeautifulSoup
 from lxml import etree
 from requests import Response, Session
 from tqdm import tqdm
 
+from premier_league.utils.async_fetch import fetch_all
+from premier_league.utils.instrumentation import measure
 from premier_league.utils.methods import clean_xml_text
+from premier_league.utils.page_store import PageStore
+from premier_league.utils.pipeline import run_pipeline
+from premier_league.utils.rate_limit import rate_limiter, request_with_backoff
+from premier_league.utils.session import session_provider
 from premier_league.utils.threading import threaded
+from premier_league.utils.xpath import evaluate_xpath
+
+PARSERS = ("lxml", "html.parser")
+
+_local = threading.local()
+
+
+def get_html_parser(encoding: Optional[str] = None) -> etree.HTMLParser:
+    """
+    Get a reusable lxml HTML parser for the current thread.
+
+    lxml parsers must not be shared between threads, so one parser per encoding is kept per thread.
+
+    Args:
+        encoding (str, optional): The encoding of the documents to parse. Defaults to detecting it.
+
+    Returns:
+        etree.HTMLParser: The HTML parser.
+    """
+    parsers = getattr(_local, "html_parsers", None)
+    if parsers is None:
+        parsers = _local.html_parsers = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        parser = parsers[encoding] = etree.HTMLParser(encoding=encoding)
+    return parser
+
+
+def current_season_start(now: Optional[datetime] = None) -> int:
+    """
+    Get the year the current season started in. Seasons start in August.
+
+    Args:
+        now (datetime, optional): The current date. Defaults to today.
+
+    Returns:
+        int: The start year of the current season.
+    """
+    now = now or datetime.now()
+    return now.year if now.month >= 8 else now.year - 1
 
 
 @dataclass
@@ -33,8 +78,12 @@ class BaseScrapper:
         target_season (str): The target season (parameter) for scraping data.
         cache (bool): Whether to cache the HTTP requests. Defaults to True.
         season_limit (int): The lower limit for the season. Defaults to 1992.
-        expire_cache (int): The expiry time for the cache in seconds. Defaults to 7200.
-        session (Union[requests_cache.CachedSession, requests]): The requests session object.
+        expire_cache (int): The expiry time for the cache of current season pages in seconds. Defaults to 7200.
+            Expired pages are revalidated with conditional requests, and pages of past seasons never expire.
+        parser (str): The parser for the web page. "lxml" feeds the response straight into lxml's HTML parser,
+            "html.parser" parses it with BeautifulSoup first, which is slower but more lenient with
+            malformed pages. Defaults to "lxml".
+        session (Union[requests_cache.CachedSession, requests]): The shared, pooled requests session object.
     """
 
     url: str
@@ -45,6 +94,7 @@ class BaseScrapper:
     cache: bool = field(default=True)
     season_limit: int = field(default=1992)
     expire_cache: int = field(default=7200)
+    parser: Literal["lxml", "html.parser"] = field(default="lxml")
     session: Union[requests_cache.CachedSession, Session] = field(
         default=None, init=False
     )
@@ -56,16 +106,16 @@ class BaseScrapper:
         Raises:
             ValueError: If the target_season is invalid or in an incorrect format.
         """
+        if self.parser not in PARSERS:
+            raise ValueError(
+                f"Invalid parser {self.parser}. The Available Parsers are: {', '.join(PARSERS)}"
+            )
+
+        self.session = session_provider.get(cache=self.cache)
+
         if not self.requires_season:
             return
 
-        if self.cache:
-            self.session = requests_cache.CachedSession(
-                "prem_cache", expire_after=self.expire_cache
-            )
-        else:
-            self.session = requests.session()
-
         current_date = datetime.now()
         if not self.target_season:
             current_year = current_date.year
@@ -100,28 +150,70 @@ class BaseScrapper:
 
         self.url = self.url.replace("{SEASON}", self.season)
 
+    @property
+    def cache_expiry(self) -> int:
+        """
+        The cache expiry of the page in seconds.
+
+        Pages of past seasons no longer change, so they never expire. Pages of the current season (and pages
+        without a season) expire after expire_cache seconds, after which they are revalidated with a conditional
+        request (If-None-Match / If-Modified-Since) and only downloaded again if they changed.
+
+        Returns:
+            int: The cache expiry in seconds, or requests_cache.NEVER_EXPIRE.
+        """
+        if self.target_season and int(self.target_season[:4]) < current_season_start():
+            return requests_cache.NEVER_EXPIRE
+        return self.expire_cache
+
     def make_request(self) -> Response:
         """
         Make an HTTP GET request to the specified URL.
 
+        The request is sent within the per-host budget of the shared rate limiter, and throttled
+        responses are retried with exponential backoff. Cached responses expire according to cache_expiry.
+
         Returns:
             Response: The HTTP response object.
 
         Raises:
             HTTPException: If an error occurs during the request.
         """
+        cached = isinstance(self.session, requests_cache.CachedSession)
+        cache_kwargs = {"expire_after": self.cache_expiry} if cached else {}
+        headers = {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/113.0.0.0 "
+                "Safari/537.36"
+            ),
+        }
+
+        def lookup() -> Optional[Response]:
+            # Misses and expired pages come back as a 504 and go through the rate limiter.
+            response = self.session.get(
+                url=self.url, headers=headers, only_if_cached=True, **cache_kwargs
+            )
+            return response if response.status_code != 504 else None
+
         try:
-            response: Response = self.session.get(
-                url=self.url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/113.0.0.0 "
-                        "Safari/537.36"
+            with measure("request") as measurement:
+                response: Response = request_with_backoff(
+                    lambda: self.session.get(
+                        url=self.url, headers=headers, **cache_kwargs
                     ),
-                },
-            )
+                    rate_limiter.bucket(self.url),
+                    lookup=lookup if cached else None,
+                )
+                measurement.nbytes = len(response.content)
+                if cached:
+                    if getattr(response, "revalidated", False):
+                        measurement.stage = "request.cache_revalidated"
+                    elif getattr(response, "from_cache", False):
+                        measurement.stage = "request.cache_hit"
+                    else:
+                        measurement.stage = "request.cache_miss"
             return response
         except Exception as e:
             raise HTTPException(f"An error occurred: {e} for url: {self.url}")
@@ -134,7 +226,8 @@ class BaseScrapper:
             BeautifulSoup: The parsed HTML content.
         """
         response: Response = self.make_request()
-        return BeautifulSoup(markup=response.content, features="html.parser")
+        with measure("parse.bs4", len(response.content)):
+            return BeautifulSoup(markup=response.content, features="html.parser")
 
     def clear_cache(self):
         """
@@ -153,21 +246,55 @@ class BaseScrapper:
         Returns:
             ElementTree: The converted XML tree.
         """
-        return etree.HTML(bsoup.encode())
+        with measure("convert"):
+            return etree.HTML(bsoup.encode())
+
+    @staticmethod
+    def parse_to_xml(response: Response) -> ElementTree:
+        """
+        Parse the HTTP response content directly into a lxml ElementTree.
+
+        The raw bytes are fed to a reusable lxml HTML parser, honouring the charset of the response
+        headers when one is declared and the charset of the page otherwise.
+
+        Args:
+            response (Response): The HTTP response to parse.
+
+        Returns:
+            ElementTree: The parsed XML tree.
+        """
+        encoding = None
+        if "charset" in response.headers.get("Content-Type", "").lower():
+            encoding = response.encoding
+        with measure("parse.lxml", len(response.content)):
+            return etree.HTML(response.content, parser=get_html_parser(encoding))
 
     @staticmethod
-    def additional_scrapper(additional_url: str, cache: Optional[bool] = True):
+    def additional_scrapper(
+        additional_url: str,
+        cache: Optional[bool] = True,
+        parser: Literal["lxml", "html.parser"] = "lxml",
+        expire_cache: int = 7200,
+    ):
         """
         Create a new BaseScrapper instance for an additional URL without creating a new object.
 
         Args:
             additional_url (str): The URL to scrape.
             cache (bool): Whether to cache the HTTP requests. Defaults to True.
+            parser (str): The parser for the web page. Defaults to "lxml".
+            expire_cache (int): The expiry time for the cache in seconds. Defaults to 7200.
 
         Returns:
             BaseScrapper: A new BaseScrapper instance with the page loaded.
         """
-        scrapper = BaseScrapper(url=additional_url, requires_season=False, cache=cache)
+        scrapper = BaseScrapper(
+            url=additional_url,
+            requires_season=False,
+            cache=cache,
+            parser=parser,
+            expire_cache=expire_cache,
+        )
         scrapper.page = BaseScrapper.request_url_page(scrapper)
         return scrapper
 
@@ -175,37 +302,45 @@ class BaseScrapper:
         """
         Request the URL and parse it into an XML ElementTree.
 
+        The response is parsed by lxml in a single pass, unless the "html.parser" parser is selected,
+        in which case it is parsed by BeautifulSoup and converted to lxml.
+
         Returns:
             ElementTree: The parsed XML representation of the web page.
         """
+        if self.parser == "lxml":
+            return self.parse_to_xml(self.make_request())
+
         bsoup: BeautifulSoup = self.parse_to_html()
         return self.convert_to_xml(bsoup=bsoup)
 
     def get_list_by_xpath(
-        self, xpath: str, clean: Optional[bool] = True
+        self, xpath: Union[str, etree.XPath], clean: Optional[bool] = True, **variables
     ) -> Optional[list]:
         """
         Get a list of elements matching the given XPath.
 
         Args:
-            xpath (str): The XPath query to execute.
+            xpath (Union[str, etree.XPath]): The XPath query to execute. Plain strings are compiled once and cached.
             clean (bool, optional): Whether to clean the text content of the elements. Defaults to True.
+            **variables: Values for the XPath variables of the query.
 
         Returns:
             Optional[list]: A list of matching elements, or an empty list if no matches are found.
         """
-        elements: list = self.page.xpath(xpath)
+        elements: list = evaluate_xpath(self.page, xpath, **variables)
         if clean:
-            elements_valid: list = [
-                clean_xml_text(e) for e in elements if clean_xml_text(e)
-            ]
+            with measure("clean"):
+                elements_valid: list = [
+                    clean_xml_text(e) for e in elements if clean_xml_text(e)
+                ]
         else:
             elements_valid: list = [e for e in elements]
         return elements_valid or []
 
     def get_text_by_xpath(
         self,
-        xpath: str,
+        xpath: Union[str, etree.XPath],
         pos: int = 0,
         index: Optional[int] = None,
         index_from: Optional[int] = None,
@@ -218,7 +353,7 @@ class BaseScrapper:
         This method provides various ways to select and manipulate the matched elements.
 
         Args:
-            xpath (str): The XPath query to execute.
+            xpath (Union[str, etree.XPath]): The XPath query to execute. Plain strings are compiled once and cached.
             pos (int, optional): The position of the element to return. Defaults to 0.
             index (int, optional): The index of the element to return.
             index_from (int, optional): The starting index for slicing the result list.
@@ -228,13 +363,14 @@ class BaseScrapper:
         Returns:
             Optional[str]: The extracted text content, or None if no match is found.
         """
-        element = self.page.xpath(xpath)
+        element = evaluate_xpath(self.page, xpath)
 
         if not element:
             return None
 
         if isinstance(element, list):
-            element = [clean_xml_text(e) for e in element if clean_xml_text(e)]
+            with measure("clean"):
+                element = [clean_xml_text(e) for e in element if clean_xml_text(e)]
 
         if isinstance(index, int):
             element = element[index]
@@ -268,54 +404,110 @@ class BaseDataSetScrapper:
     Attributes:
         url (list): The List of URL to scrape.
         page (ElementTree): The parsed XML representation of the web page.
+        page_store (PageStore): The compressed store of raw pages kept in the cache directory.
     """
 
     def __init__(self, cache_dir="cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.page_store = PageStore(self.cache_dir / "pages")
         self.pages = []
 
-    def fetch_page(
-        self, url, pbar, rate_limit, return_html
-    ) -> Union[etree.ElementTree, str, None]:
+    def request_page(self, url, rate_limit=None) -> Optional[str]:
         """
-        Fetch a page from the given URL with rate limits and progress bar.
+        Request a page from the given URL within the request budget of its host.
+
+        Throttled requests (HTTP 429 or 503) are retried with exponential backoff, honouring the
+        Retry-After header, and slow down every subsequent request to the same host.
 
         Args:
             url (str): The URL to fetch.
-            pbar (tqdm): The progress bar object.
-            rate_limit (int): The rate limit for requests in seconds.
-            return_html (bool): Whether to return the HTML content as a string.
+            rate_limit (float, optional): The minimum number of seconds between requests to the host.
+                Defaults to the budget the host is already configured with.
+
+        Returns:
+            Optional[str]: The HTML content of the page, or None if the request failed.
         """
+        bucket = rate_limiter.bucket(url, rate=1 / rate_limit if rate_limit else None)
+        session = session_provider.get(cache=False)
         try:
-            response = requests.get(
-                url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_3_1) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0.0.0 "
-                        "Safari/537.36"
+            with measure("request") as measurement:
+                response = request_with_backoff(
+                    lambda: session.get(
+                        url,
+                        headers={
+                            "User-Agent": (
+                                "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_3_1) "
+                                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                                "Chrome/122.0.0.0 "
+                                "Safari/537.36"
+                            ),
+                        },
                     ),
-                },
-            )
+                    bucket,
+                )
+                measurement.nbytes = len(response.content)
 
             if response.status_code == 429:
-                print(f"Rate limited on {url}. Exiting...")
-                exit(1)
+                print(f"Rate limited on {url}. Skipping...")
+                return None
             if response.status_code != 200:
                 print(f"Error status {response.status_code} for {url}")
                 return None
 
-            html = response.text
-            pbar.update(1)
-            time.sleep(rate_limit)
-            return etree.HTML(html) if return_html else html
+            return response.text
 
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
 
+    def load_page(self, url, rate_limit=None, persist=False) -> Optional[str]:
+        """
+        Load the HTML of a page, from the page store if it was persisted before or from the network.
+
+        Args:
+            url (str): The URL to load.
+            rate_limit (float, optional): The minimum number of seconds between requests to the host.
+            persist (bool, optional): Whether to read the page from and write it to the page store.
+                Only use it for pages that no longer change. Defaults to False.
+
+        Returns:
+            Optional[str]: The HTML content of the page, or None if the request failed.
+        """
+        if persist:
+            with measure("page_store.hit") as measurement:
+                html = self.page_store.get(url)
+                if html is not None:
+                    measurement.nbytes = len(html)
+                    return html
+                measurement.stage = "page_store.miss"
+
+        html = self.request_page(url, rate_limit)
+        if html is not None and persist:
+            with measure("page_store.put", len(html)):
+                self.page_store.put(url, html)
+        return html
+
+    def fetch_page(
+        self, url, pbar, rate_limit, return_html, persist=False
+    ) -> Union[etree.ElementTree, str, None]:
+        """
+        Fetch a page from the given URL with rate limits and progress bar.
+
+        Args:
+            url (str): The URL to fetch.
+            pbar (tqdm): The progress bar object.
+            rate_limit (int): The minimum number of seconds between requests to the host.
+            return_html (bool): Whether to return the HTML content as a string.
+            persist (bool, optional): Whether to use the page store. Defaults to False.
+        """
+        html = self.load_page(url, rate_limit, persist)
+        if html is None:
+            return None
+
+        pbar.update(1)
+        return self._parse_html(html) if return_html else html
+
     def scrape_and_process_all(
         self,
         urls,
@@ -323,32 +515,180 @@ class BaseDataSetScrapper:
         return_html=True,
         desc="Scraping Progress",
         process_func=None,
+        max_concurrency=1,
+        requests_per_second=None,
+        persist=False,
+        parse_func=None,
+        parse_workers=0,
+        ordered=True,
     ) -> list:
         """
         Scrape and process all URLs in the list with rate limits.
 
+        Requests to each host share a token bucket, so the scraper runs at the configured rate and slows
+        down adaptively when the host starts throttling. With max_concurrency greater than 1, pages are
+        fetched by an asyncio engine that keeps several requests in flight within that budget, and
+        process_func is run as soon as each page lands. Otherwise, the URLs are fetched sequentially.
+
+        With parse_workers greater than 0, fetching and parsing are pipelined: pages are handed to a
+        pool of parse worker threads through a bounded queue, which run the HTML parsing and parse_func
+        while the next requests wait on the rate limit. process_func still runs on the calling thread.
+
         Args:
             urls (list): The list of URLs to scrape.
-            rate_limit (int, optional): The rate limit for requests in seconds. Defaults to 1.
+            rate_limit (int, optional): The minimum number of seconds between requests to a host. Defaults to 1.
             return_html (bool, optional): Whether to return the HTML content as a string. Defaults to True.
             desc (str, optional): The description for the progress bar. Defaults to "Scraping Progress".
             process_func (Callable, optional): The function to process the results. Defaults to None.
+            max_concurrency (int, optional): The maximum number of requests in flight. Defaults to 1.
+            requests_per_second (float, optional): The per-host request budget. Overrides rate_limit if given.
+            persist (bool, optional): Whether to keep the raw pages in the page store and read them from it
+                instead of the network on later runs. Only use it for pages that no longer change. Defaults to False.
+            parse_func (Callable, optional): A thread-safe function run on each fetched page in the parse workers,
+                whose result is passed on to process_func. Defaults to None.
+            parse_workers (int, optional): The number of parse worker threads. Defaults to 0 (no pipelining).
+            ordered (bool, optional): Whether pipelined results are processed in the order of the URLs, rather
+                than as soon as they are parsed. Defaults to True.
         """
+        if requests_per_second:
+            rate_limit = 1 / requests_per_second
+
+        if parse_workers > 0:
+            return self._scrape_and_process_all_pipelined(
+                urls,
+                rate_limit,
+                return_html,
+                desc,
+                process_func,
+                max_concurrency,
+                persist,
+                parse_func,
+                parse_workers,
+                ordered,
+            )
+
+        if parse_func:
+            process_func = self._chain_parse_func(parse_func, process_func)
+
+        if max_concurrency > 1:
+            return self._scrape_and_process_all_async(
+                urls,
+                rate_limit,
+                return_html,
+                desc,
+                process_func,
+                max_concurrency,
+                persist,
+            )
+
         results = []
         with tqdm(total=len(urls), desc=desc) as pbar:
             for url in urls:
-                result = self.fetch_page(url, pbar, rate_limit, return_html)
+                result = self.fetch_page(url, pbar, rate_limit, return_html, persist)
+                if process_func:
+                    result = process_func(result, url=url)
+                if result is not None:
+                    results.append(result)
+        return results
+
+    def _scrape_and_process_all_async(
+        self,
+        urls,
+        rate_limit,
+        return_html,
+        desc,
+        process_func,
+        max_concurrency,
+        persist=False,
+    ) -> list:
+        """
+        Scrape and process all URLs concurrently using the asyncio fetch engine.
+
+        Results are returned in the same order as the input URLs.
+        """
+
+        def fetch(url):
+            html = self.load_page(url, rate_limit, persist)
+            if html is None:
+                return None
+            return self._parse_html(html) if return_html else html
+
+        results = [None] * len(urls)
+        with tqdm(total=len(urls), desc=desc) as pbar:
+
+            def on_result(index, url, result):
+                if result is not None:
+                    pbar.update(1)
+                if process_func:
+                    result = process_func(result, url=url)
+                results[index] = result
+
+            fetch_all(urls, fetch, on_result, max_concurrency=max_concurrency)
+        return [result for result in results if result is not None]
+
+    def _scrape_and_process_all_pipelined(
+        self,
+        urls,
+        rate_limit,
+        return_html,
+        desc,
+        process_func,
+        max_concurrency,
+        persist,
+        parse_func,
+        parse_workers,
+        ordered,
+    ) -> list:
+        """
+        Scrape and process all URLs with fetching and parsing running in overlapping stages.
+        """
+
+        def parse(html, url):
+            if html is None:
+                return None
+            page = self._parse_html(html) if return_html else html
+            return parse_func(page, url=url) if parse_func else page
+
+        results = []
+        with tqdm(total=len(urls), desc=desc) as pbar:
+
+            def on_result(url, result):
+                pbar.update(1)
                 if process_func:
                     result = process_func(result, url=url)
                 if result is not None:
                     results.append(result)
+
+            run_pipeline(
+                urls,
+                lambda url: self.load_page(url, rate_limit, persist),
+                parse,
+                on_result,
+                max_concurrency=max_concurrency,
+                parse_workers=parse_workers,
+                ordered=ordered,
+            )
         return results
 
+    @staticmethod
+    def _parse_html(html: str) -> ElementTree:
+        with measure("parse.lxml", len(html)):
+            return etree.HTML(html)
+
+    @staticmethod
+    def _chain_parse_func(parse_func, process_func):
+        def chained(result, url=None):
+            if result is not None:
+                result = parse_func(result, url=url)
+            return process_func(result, url=url) if process_func else result
+
+        return chained
+
     @threaded(show_progress=True)
     def get_list_by_xpath(
         self,
         page: ElementTree,
-        xpath: str,
+        xpath: Union[str, etree.XPath],
         clean: Optional[bool] = True,
         show_progress=True,
     ) -> Optional[list]:
@@ -357,25 +697,26 @@ class BaseDataSetScrapper:
 
         Args:
             page (ElementTree): The parsed XML representation of the web page.
-            xpath (str): The XPath query to execute.
+            xpath (Union[str, etree.XPath]): The XPath query to execute. Plain strings are compiled once and cached.
             clean (bool, optional): Whether to clean the text content of the elements. Defaults to True.
             show_progress (bool, optional): Whether to show a progress bar. Defaults to True.
 
         Returns:
             Optional[list]: A list of matching elements, or an empty list if no matches are found.
         """
-        elements: list = page.xpath(xpath)
+        elements: list = evaluate_xpath(page, xpath)
         if clean:
-            elements_valid: list = [
-                clean_xml_text(e) for e in elements if clean_xml_text(e)
-            ]
+            with measure("clean"):
+                elements_valid: list = [
+                    clean_xml_text(e) for e in elements if clean_xml_text(e)
+                ]
         else:
             elements_valid: list = [e for e in elements]
         return elements_valid or []
 
     def process_xpath(
         self,
-        xpath: str,
+        xpath: Union[str, etree.XPath],
         clean: Optional[bool] = True,
         add_str: Optional[str] = None,
         desc: Optional[str] = None,
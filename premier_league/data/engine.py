@@ -0,0 +1,161 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+# Applied to every new connection. In WAL mode readers never block the writer and the writer never blocks
+# readers, and synchronous=NORMAL is safe against corruption (a power loss may only lose the last commits).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Negative sizes are in KiB: 64 MiB of page cache per connection.
+    "cache_size": -65536,
+    # Read pages through a 256 MiB memory map instead of read() calls.
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def _set_pragmas(pragmas: Dict[str, Union[str, int]]):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def create_sqlite_engine(
+    db_path: Optional[str] = None,
+    pragmas: Optional[Dict[str, Union[str, int]]] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    busy_timeout: float = 30.0,
+) -> Engine:
+    """
+    Create an SQLite engine tuned for one writer and concurrent readers.
+
+    Every connection of the pool gets the SQLITE_PRAGMAS (WAL journal, synchronous=NORMAL, a larger page
+    cache, memory mapped reads and in-memory temporary tables). Connections can be used from any thread,
+    and wait up to busy_timeout seconds for a lock instead of failing.
+
+    Args:
+        db_path (str, optional): The path of the database file. Defaults to an in-memory database,
+            shared by every session of the engine.
+        pragmas (dict, optional): Pragmas overriding or extending SQLITE_PRAGMAS.
+        pool_size (int, optional): The number of connections kept open. Defaults to 5.
+        max_overflow (int, optional): The number of extra connections opened under load. Defaults to 10.
+        busy_timeout (float, optional): The number of seconds to wait for a lock. Defaults to 30.
+
+    Returns:
+        Engine: The SQLAlchemy engine.
+    """
+    pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+    connect_args = {"check_same_thread": False, "timeout": busy_timeout}
+
+    if db_path is None or db_path == ":memory:":
+        # A single connection, since every connection to :memory: is a separate database.
+        pragmas.pop("journal_mode", None)
+        engine = create_engine(
+            "sqlite://", connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+        )
+    event.listen(engine, "connect", _set_pragmas(pragmas))
+    return engine
+
+
+def get_engine(db_path: str, **kwargs) -> Engine:
+    """
+    Get the engine of a database file, creating it on first use.
+
+    Every caller in the process shares the engine, and so its connection pool.
+
+    Args:
+        db_path (str): The path of the database file.
+        **kwargs: Arguments of create_sqlite_engine(), only used when the engine is created.
+
+    Returns:
+        Engine: The SQLAlchemy engine.
+    """
+    key = os.path.abspath(db_path)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = create_sqlite_engine(key, **kwargs)
+        return engine
+
+
+def dispose_engines():
+    """
+    Close the connections of every engine created by get_engine().
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def session_factory(engine: Engine) -> scoped_session:
+    """
+    Create a thread-local session registry bound to an engine.
+
+    Calling the registry returns the session of the current thread, so threads never share a session.
+
+    Args:
+        engine (Engine): The engine.
+
+    Returns:
+        scoped_session: The session registry.
+    """
+    return scoped_session(
+        sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    )
+
+
+@contextmanager
+def session_scope(
+    bind: Union[Engine, sessionmaker, scoped_session]
+) -> Iterator[Session]:
+    """
+    Run a unit of work in a new session, committed on success and rolled back on error.
+
+    Args:
+        bind (Union[Engine, sessionmaker, scoped_session]): The engine, or a factory of sessions. A new session
+            is created even from a scoped_session, leaving the session of the current thread untouched.
+
+    Yields:
+        Session: The session.
+    """
+    if isinstance(bind, Engine):
+        session = Session(bind=bind, autoflush=False, expire_on_commit=False)
+    elif isinstance(bind, scoped_session):
+        session = bind.session_factory()
+    else:
+        session = bind()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,11 +1,11 @@
 import os
-import sqlite3
-from importlib.resources import files
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from .models.league import League
+from .engine import get_engine
+from .migrations import SCHEMA_VERSION, migrate, schema_version, seed_leagues
+from .models.base import Base
+from .snapshot import install_database
 
 
 def init_db(db_filename: str, db_directory: str) -> Session:
@@ -26,18 +26,18 @@ def init_db(db_filename: str, db_directory: str) -> Session:
     db_path = os.path.join(data_dir, db_filename)
 
     if not os.path.exists(db_path):
-        conn = sqlite3.connect(db_path)
-        sql_path = files("premier_league").joinpath("data/premier_league.sql")
-        with sql_path.open("r") as sql_file:
-            conn.executescript(sql_file.read())
-        conn.close()
-
-    engine = create_engine(f"sqlite:///{db_path}")
+        install_database(db_path)
+
+    # Shared per database file: WAL journal and pooled connections, so readers can query while data is written.
+    engine = get_engine(db_path)
+    # Databases at the current schema version (e.g. the bundled snapshot) are already created and seeded.
+    with engine.connect() as connection:
+        current_version = schema_version(connection)
+    if current_version < SCHEMA_VERSION:
+        Base.metadata.create_all(engine)
+        migrate(engine)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-
-    seed_initial_data(session)
-    return session
+    return SessionLocal()
 
 
 def seed_initial_data(session: Session):
@@ -47,40 +47,9 @@ def seed_initial_data(session: Session):
     Args:
         session: SQLAlchemy session object
     """
-
-    all_current_league_names = [
-        league[0] for league in session.query(League.name).all()
-    ]
-
-    for potential_league in [
-        "Premier League",
-        "La Liga",
-        "Serie A",
-        "Fußball-Bundesliga",
-        "Ligue 1",
-        "EFL Championship",
-    ]:
-        if potential_league not in all_current_league_names:
-            if potential_league == "EFL Championship":
-                session.add(
-                    League(
-                        name=potential_league,
-                        up_to_date_season="2018-2019",
-                        up_to_date_match_week=1,
-                    )
-                )
-            else:
-                session.add(
-                    League(
-                        name=potential_league,
-                        up_to_date_season="2017-2018",
-                        up_to_date_match_week=1,
-                    )
-                )
-
     try:
-        if session.dirty or session.new:
-            session.commit()
+        seed_leagues(session.connection())
+        session.commit()
     except Exception as e:
         session.rollback()
         raise Exception(f"Error seeding database: {str(e)}")
@@ -0,0 +1,159 @@
+from typing import Callable, NamedTuple, Sequence
+
+from sqlalchemy import Engine, insert, inspect, select
+from sqlalchemy.engine import Connection
+
+from .models import Base, League
+
+# The leagues every database starts with, and the season their data starts from.
+SEED_LEAGUES = {
+    "Premier League": "2017-2018",
+    "La Liga": "2017-2018",
+    "Serie A": "2017-2018",
+    "Fußball-Bundesliga": "2017-2018",
+    "Ligue 1": "2017-2018",
+    "EFL Championship": "2018-2019",
+}
+
+
+class Migration(NamedTuple):
+    """
+    A change to the schema of existing databases.
+
+    Attributes:
+        version (int): The schema version the migration brings the database to.
+        description (str): What the migration changes.
+        apply (Callable[[Connection], None]): Applies the change. It must be idempotent (e.g. create an index
+            only if it does not exist), since a database created by create_all() may already have it.
+    """
+
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def add_column(connection: Connection, table: str, column_ddl: str):
+    """
+    Add a column to a table unless it already has it.
+
+    Args:
+        connection (Connection): The database connection.
+        table (str): The table name.
+        column_ddl (str): The column definition, e.g. "attendance INTEGER".
+    """
+    name = column_ddl.split()[0]
+    columns = {column["name"] for column in inspect(connection).get_columns(table)}
+    if name not in columns:
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column_ddl}")
+
+
+def create_indexes(*names: str) -> Callable[[Connection], None]:
+    """
+    Create indexes declared on the models, if they do not exist.
+
+    Args:
+        *names (str): The index names.
+
+    Returns:
+        Callable[[Connection], None]: The migration function.
+    """
+
+    def apply(connection: Connection):
+        indexes = {
+            index.name: index
+            for table in Base.metadata.sorted_tables
+            for index in table.indexes
+        }
+        for name in names:
+            indexes[name].create(connection, checkfirst=True)
+
+    return apply
+
+
+def seed_leagues(connection: Connection):
+    """
+    Add the SEED_LEAGUES missing from the database.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    existing = set(connection.execute(select(League.name)).scalars())
+    missing = [
+        {"name": name, "up_to_date_season": season, "up_to_date_match_week": 1}
+        for name, season in SEED_LEAGUES.items()
+        if name not in existing
+    ]
+    if missing:
+        connection.execute(insert(League), missing)
+
+
+# Applied in order to databases with a lower PRAGMA user_version. Append new migrations, never edit
+# released ones. New tables and columns need a migration as well: init_db() only runs create_all() on
+# databases behind SCHEMA_VERSION.
+MIGRATIONS = (
+    Migration(
+        1,
+        "Indexes for the MatchStatistics queries: team histories by date, statistics by team and "
+        "games by league season",
+        create_indexes(
+            "idx_game_home_team_date",
+            "idx_game_away_team_date",
+            "idx_game_league_season_week",
+            "idx_game_stats_team",
+        ),
+    ),
+    # Once applied, starting on the database no longer queries the leagues.
+    Migration(2, "Seed the supported leagues", seed_leagues),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(connection: Connection) -> int:
+    """
+    Get the schema version of a database, kept in its PRAGMA user_version.
+
+    Args:
+        connection (Connection): The database connection.
+
+    Returns:
+        int: The version of the last migration applied, 0 if none was.
+    """
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrate(engine: Engine, migrations: Sequence[Migration] = MIGRATIONS) -> int:
+    """
+    Apply the migrations newer than the schema version of a database, in order.
+
+    Each migration runs in its own transaction together with the update of the schema version, so an
+    interrupted upgrade resumes from the first migration not applied, with nothing of it kept. pysqlite only
+    opens a transaction before INSERT, UPDATE and DELETE statements, and would commit DDL and PRAGMA
+    statements on their own, so the transactions are begun explicitly with the driver in autocommit mode.
+
+    Args:
+        engine (Engine): The database engine.
+        migrations (Sequence[Migration], optional): The migrations, by increasing version. Defaults to MIGRATIONS.
+
+    Returns:
+        int: The number of migrations applied.
+    """
+    applied = 0
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT")
+        current = schema_version(connection)
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            connection.exec_driver_sql("BEGIN")
+            try:
+                migration.apply(connection)
+                connection.exec_driver_sql(
+                    f"PRAGMA user_version = {migration.version:d}"
+                )
+            except BaseException:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+            connection.exec_driver_sql("COMMIT")
+            applied += 1
+    return applied
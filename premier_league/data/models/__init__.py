@@ -1,5 +1,8 @@
 from .base import Base
 from .game import Game
+from .game_features import GameFeatures
+from .game_parse import GameParse
 from .game_stats import GameStats
 from .league import League
+from .standings_snapshot import StandingsSnapshot
 from .team import Team
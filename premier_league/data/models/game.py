@@ -2,6 +2,7 @@ from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from premier_league.data.models.base import Base
+from premier_league.data.serializers import ModelSerializer
 
 
 class Game(Base):
@@ -30,13 +31,14 @@ class Game(Base):
     __table_args__ = (
         Index("idx_game_season_week", "season", "match_week"),
         Index("idx_game_teams", "home_team_id", "away_team_id"),
+        # Team histories ordered by date, for both sides.
+        Index("idx_game_home_team_date", "home_team_id", "date"),
+        Index("idx_game_away_team_date", "away_team_id", "date"),
+        Index("idx_game_league_season_week", "league_id", "season", "match_week"),
     )
 
     def to_dict(self, include_relationships=False):
-        result = {c.name: getattr(self, c.name) for c in self.__table__.columns}
-
-        if result["date"]:
-            result["date"] = result["date"].isoformat()
+        result = _SERIALIZER.instance_to_dict(self)
 
         if include_relationships:
             if self.home_team:
@@ -58,3 +60,6 @@ class Game(Base):
                 result["league"] = {"id": self.league.id, "name": self.league.name}
 
         return result
+
+
+_SERIALIZER = ModelSerializer(Game)
@@ -0,0 +1,69 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    delete,
+    event,
+    or_,
+    select,
+)
+
+from premier_league.data.models.base import Base
+from premier_league.data.models.game import Game
+from premier_league.data.models.game_stats import GameStats
+
+
+class GameFeatures(Base):
+    __tablename__ = "game_features"
+    game_id = Column(String, ForeignKey("game.id"), primary_key=True)
+    lag = Column(Integer, primary_key=True)
+    weight_type = Column(String, primary_key=True)
+    params = Column(Float, primary_key=True)
+    # Identifies the feature columns the vectors were computed with.
+    schema = Column(String, nullable=False)
+    # float64 vectors, or NULL if a team had fewer than lag previous games in the season.
+    home_features = Column(LargeBinary)
+    away_features = Column(LargeBinary)
+    computed_at = Column(DateTime, nullable=False)
+
+
+def invalidate_team_features(connection, team_id: str, season: str, date):
+    """
+    Drop the stored features of every game of a team in a season from a date onwards.
+
+    The features of a game only depend on the previous games of both teams in the same season, so these are
+    the features that may depend on statistics of the team changed at that date.
+
+    Args:
+        connection: The database connection.
+        team_id (str): The id of the team.
+        season (str): The season of the changed game.
+        date (datetime): The date of the changed game.
+    """
+    affected_games = select(Game.id).where(
+        Game.season == season,
+        Game.date >= date,
+        or_(Game.home_team_id == team_id, Game.away_team_id == team_id),
+    )
+    connection.execute(
+        delete(GameFeatures).where(GameFeatures.game_id.in_(affected_games))
+    )
+
+
+@event.listens_for(GameStats, "after_insert")
+@event.listens_for(GameStats, "after_update")
+@event.listens_for(GameStats, "after_delete")
+def invalidate_game_features(mapper, connection, target: GameStats):
+    """
+    Drop the stored features that may depend on changed game statistics.
+    """
+    game = connection.execute(
+        select(Game.season, Game.date).where(Game.id == target.game_id)
+    ).first()
+    if game is None:
+        return
+    invalidate_team_features(connection, target.team_id, game.season, game.date)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from premier_league.data.models.base import Base
+
+
+class GameParse(Base):
+    __tablename__ = "game_parse"
+    game_id = Column(String, ForeignKey("game.id"), primary_key=True)
+    parser_version = Column(Integer, nullable=False, index=True)
+    parsed_at = Column(DateTime, nullable=False)
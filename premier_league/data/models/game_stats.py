@@ -2,6 +2,7 @@ from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from premier_league.data.models.base import Base
+from premier_league.data.serializers import ModelSerializer
 
 
 class GameStats(Base):
@@ -123,9 +124,13 @@ class GameStats(Base):
     offside_MF = Column(Integer)
     offside_DF = Column(Integer)
 
-    __table_args__ = (Index("idx_game_team_stats", "game_id", "team_id", unique=True),)
+    __table_args__ = (
+        Index("idx_game_team_stats", "game_id", "team_id", unique=True),
+        Index("idx_game_stats_team", "team_id", "game_id"),
+    )
 
     def to_dict(self):
-        result = {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return _SERIALIZER.instance_to_dict(self)
 
-        return result
+
+_SERIALIZER = ModelSerializer(GameStats)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from premier_league.data.models.base import Base
+
+
+class StandingsSnapshot(Base):
+    """
+    The league table row of a team after a match week, counting every game of the season up to that week.
+    """
+
+    __tablename__ = "standings_snapshot"
+    league_id = Column(Integer, ForeignKey("league.id"), primary_key=True)
+    season = Column(String, primary_key=True)
+    match_week = Column(Integer, primary_key=True)
+    team_id = Column(String, ForeignKey("team.id"), primary_key=True)
+    position = Column(Integer, nullable=False)
+    played = Column(Integer, nullable=False)
+    won = Column(Integer, nullable=False)
+    drawn = Column(Integer, nullable=False)
+    lost = Column(Integer, nullable=False)
+    goals_for = Column(Integer, nullable=False)
+    goals_against = Column(Integer, nullable=False)
+    points = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("idx_standings_team", "team_id", "league_id", "season", "match_week"),
+    )
@@ -0,0 +1,107 @@
+from operator import attrgetter
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import DateTime, Float, Integer
+
+_DTYPES = ((DateTime, "M8[us]"), (Float, "f8"), (Integer, "i8"))
+
+
+class ModelSerializer:
+    """
+    Serialize the rows of a model's table to dicts or NumPy records.
+
+    The columns, their getters and conversions are resolved once, so serializing a row is a zip over a
+    tuple, whether it comes from a Core select of the columns, an ORM instance or an eager-loaded result.
+
+    Attributes:
+        names (Tuple[str, ...]): The serialized column names, in order.
+        columns (List[Column]): The table columns, for select(*serializer.columns).
+    """
+
+    def __init__(self, model, columns: Optional[Sequence[str]] = None):
+        table = model.__table__
+        names = (
+            [column.name for column in table.columns] if columns is None else columns
+        )
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown columns of {table.name}: {', '.join(unknown)}")
+
+        self.names = tuple(names)
+        self.columns = [table.c[name] for name in self.names]
+        getter = attrgetter(*self.names)
+        self._getter = getter if len(self.names) > 1 else lambda obj: (getter(obj),)
+        self._dates = [
+            name
+            for name, column in zip(self.names, self.columns)
+            if isinstance(column.type, DateTime)
+        ]
+        self._dtypes = [
+            next(
+                (dtype for kind, dtype in _DTYPES if isinstance(column.type, kind)), "O"
+            )
+            for column in self.columns
+        ]
+
+    def to_dict(self, row: Sequence) -> dict:
+        """
+        Serialize a row of the columns, with dates as ISO 8601 strings.
+
+        Args:
+            row (Sequence): The values of the columns, e.g. a Row of select(*serializer.columns).
+
+        Returns:
+            dict: The values by column name.
+        """
+        result = dict(zip(self.names, row))
+        for name in self._dates:
+            if result[name]:
+                result[name] = result[name].isoformat()
+        return result
+
+    def to_dicts(self, rows: Iterable[Sequence]) -> List[dict]:
+        """
+        Serialize rows of the columns, with dates as ISO 8601 strings.
+
+        Args:
+            rows (Iterable[Sequence]): The rows, e.g. the result of session.execute(select(*serializer.columns)).
+
+        Returns:
+            List[dict]: The values of every row by column name.
+        """
+        return [self.to_dict(row) for row in rows]
+
+    def instance_to_dict(self, obj) -> dict:
+        """
+        Serialize a model instance.
+
+        Args:
+            obj: The model instance.
+
+        Returns:
+            dict: The values of the columns by name, with dates as ISO 8601 strings.
+        """
+        return self.to_dict(self._getter(obj))
+
+    def to_records(self, rows: Iterable[Sequence]) -> np.recarray:
+        """
+        Convert rows of the columns to a NumPy record array.
+
+        Float columns are float64 (NaN for NULL), integer columns int64 (float64 if they hold NULL),
+        dates datetime64 and other columns objects.
+
+        Args:
+            rows (Iterable[Sequence]): The rows.
+
+        Returns:
+            np.recarray: One record per row, with a field per column.
+        """
+        rows = [tuple(row) for row in rows]
+        values = list(zip(*rows)) if rows else [()] * len(self.names)
+        arrays = []
+        for column, dtype in zip(values, self._dtypes):
+            if dtype == "i8" and None in column:
+                dtype = "f8"
+            arrays.append(np.array(column, dtype=dtype))
+        return np.rec.fromarrays(arrays, names=list(self.names))
@@ -0,0 +1,104 @@
+import gzip
+import os
+import pathlib
+import shutil
+import sqlite3
+from importlib.resources import files
+from typing import Optional
+
+# Bundled databases, by order of preference: a compressed or plain SQLite snapshot, copied in one
+# streaming pass, or the SQL dump, which has to be executed statement by statement.
+SNAPSHOT_RESOURCES = ("data/premier_league.db.gz", "data/premier_league.db")
+SQL_DUMP_RESOURCE = "data/premier_league.sql"
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _temporary_path(db_path: str) -> str:
+    return f"{db_path}.{os.getpid()}.tmp"
+
+
+def install_snapshot(snapshot, db_path: str):
+    """
+    Copy a SQLite snapshot to a database file, decompressing it on the fly if it is gzipped.
+
+    The snapshot is written next to the database and renamed into place, so an interrupted copy never
+    leaves a partial database behind.
+
+    Args:
+        snapshot: The path, or importlib.resources Traversable, of the snapshot (.db or .db.gz).
+        db_path (str): The path of the database file to create.
+    """
+    if isinstance(snapshot, (str, os.PathLike)):
+        snapshot = pathlib.Path(snapshot)
+    temporary_path = _temporary_path(db_path)
+    try:
+        with snapshot.open("rb") as source:
+            if snapshot.name.endswith(".gz"):
+                source = gzip.GzipFile(fileobj=source)
+            with open(temporary_path, "wb") as target:
+                shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+        os.replace(temporary_path, db_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def install_database(db_path: str, package=None) -> Optional[str]:
+    """
+    Create a database file from the database bundled with the package.
+
+    Args:
+        db_path (str): The path of the database file to create.
+        package (Traversable, optional): The package root holding the resources. Defaults to premier_league.
+
+    Returns:
+        Optional[str]: The resource the database was created from, or None if the package bundles none.
+    """
+    package = package or files("premier_league")
+    for name in SNAPSHOT_RESOURCES:
+        resource = package.joinpath(name)
+        if resource.is_file():
+            install_snapshot(resource, db_path)
+            return name
+
+    resource = package.joinpath(SQL_DUMP_RESOURCE)
+    if not resource.is_file():
+        return None
+    temporary_path = _temporary_path(db_path)
+    try:
+        connection = sqlite3.connect(temporary_path)
+        with resource.open("r") as sql_file:
+            connection.executescript(sql_file.read())
+        connection.close()
+        os.replace(temporary_path, db_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return SQL_DUMP_RESOURCE
+
+
+def build_snapshot(db_path: str, snapshot_path: str):
+    """
+    Build the snapshot bundled with the package from a database.
+
+    The database is vacuumed into a compact copy, gzipped if snapshot_path ends with ".gz".
+
+    Args:
+        db_path (str): The path of the source database, initialized with init_db() so the schema is current.
+        snapshot_path (str): The path of the snapshot, e.g. "premier_league/data/premier_league.db.gz".
+    """
+    temporary_path = _temporary_path(snapshot_path)
+    try:
+        connection = sqlite3.connect(db_path)
+        connection.execute("VACUUM INTO ?", (temporary_path,))
+        connection.close()
+        if snapshot_path.endswith(".gz"):
+            with open(temporary_path, "rb") as source, gzip.open(
+                snapshot_path, "wb"
+            ) as target:
+                shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+        else:
+            os.replace(temporary_path, snapshot_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
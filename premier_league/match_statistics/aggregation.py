@@ -0,0 +1,178 @@
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+# Primary position markers of each group, checked in order. Players matching none of them (and the
+# totals row of the table, which has no position) fall in the "Total" group.
+POSITION_GROUPS = (
+    ("FW", ("FW", "LW", "RW", "AM")),
+    ("MF", ("CM", "DM", "RM", "LM")),
+    ("DF", ("CB", "LB", "RB")),
+    ("GK", ("GK",)),
+)
+
+
+class StatSpec(NamedTuple):
+    """
+    How one GameStats column is computed from the player tables of a team.
+
+    Attributes:
+        table (str): The source table: "summary", "passing", "defence", "possession", "miscellaneous"
+            or "goal_keeper".
+        column (str): The column of the table, as labelled by read_stat_table().
+        aggregation (str): "sum" or "mean".
+        group (str, optional): The position group ("FW", "MF", "DF" or "Total") to aggregate.
+            Defaults to None, which aggregates every row of the table.
+    """
+
+    table: str
+    column: str
+    aggregation: str = "sum"
+    group: Optional[str] = None
+
+
+def _per_position(
+    name: str, table: str, column: str, aggregation: str = "sum"
+) -> Dict[str, StatSpec]:
+    return {
+        f"{name}_{group}": StatSpec(table, column, aggregation, group)
+        for group in ("FW", "MF", "DF")
+    }
+
+
+def _total(table: str, column: str) -> StatSpec:
+    return StatSpec(table, column, "sum", "Total")
+
+
+# The GameStats columns computed from the player tables, except possession_rate which comes from the
+# team statistics table. New statistics only need an entry here and a GameStats column.
+GAME_STATS_SPEC: Dict[str, StatSpec] = {
+    "xG": _total("summary", "xG"),
+    "xAG": _total("summary", "xAG"),
+    **_per_position("shots_total", "summary", "Sh"),
+    **_per_position("shots_on_target", "summary", "SoT"),
+    **_per_position("shot_creating_chances", "summary", "SCA"),
+    **_per_position("goal_creating_actions", "summary", "GCA"),
+    **_per_position("passes_completed", "passing", "Cmp"),
+    "xA": _total("passing", "xA"),
+    **_per_position("pass_completion_percentage", "passing", "Cmp%", "mean"),
+    "key_passes": _total("passing", "KP"),
+    "passes_into_final_third": _total("passing", "1/3"),
+    "passes_into_penalty_area": _total("passing", "PPA"),
+    "crosses_into_penalty_area": _total("passing", "CrsPA"),
+    "progressive_passes": _total("passing", "PrgP"),
+    **_per_position("tackles_won", "defence", "TklW"),
+    **_per_position("dribblers_challenged_won", "defence", "Tkl.1"),
+    **_per_position("blocks", "defence", "Blocks"),
+    **_per_position("interceptions", "defence", "Int"),
+    **_per_position("clearances", "defence", "Clr"),
+    "errors_leading_to_goal": _total("defence", "Err"),
+    **_per_position("touches", "possession", "Touches"),
+    **_per_position("touches_att_pen_area", "possession", "Att Pen"),
+    **_per_position("take_ons", "possession", "Att"),
+    **_per_position("successful_take_ons", "possession", "Succ"),
+    **_per_position("carries", "possession", "Carries"),
+    **_per_position("total_carrying_distance", "possession", "TotDist"),
+    **_per_position("dispossessed", "possession", "Dis"),
+    **_per_position("miss_controlled", "possession", "Mis"),
+    "carries_into_penalty_area": _total("possession", "CPA"),
+    **_per_position("fouls_committed", "miscellaneous", "Fls"),
+    **_per_position("fouls_drawn", "miscellaneous", "Fld"),
+    **_per_position("offside", "miscellaneous", "Off"),
+    "pens_won": _total("miscellaneous", "PKwon"),
+    "pens_conceded": _total("miscellaneous", "PKcon"),
+    **_per_position("aerials_won", "miscellaneous", "Won"),
+    **_per_position("aerials_lost", "miscellaneous", "Lost"),
+    "yellow_card": _total("miscellaneous", "CrdY"),
+    "red_card": _total("miscellaneous", "CrdR"),
+    "save_percentage": StatSpec("goal_keeper", "Save%", "mean"),
+    "saves": StatSpec("goal_keeper", "Saves"),
+    "PSxG": StatSpec("goal_keeper", "PSxG"),
+    "passes_completed_GK": StatSpec("goal_keeper", "Att (GK)"),
+    "passes_40_yard_completed_GK": StatSpec("goal_keeper", "Cmp"),
+    "crosses_stopped": StatSpec("goal_keeper", "Stp"),
+}
+
+
+@lru_cache(maxsize=None)
+def _position_group(position: str) -> str:
+    primary = position.split(",")[0]
+    for group, markers in POSITION_GROUPS:
+        if any(marker in primary for marker in markers):
+            return group
+    return "Total"
+
+
+def position_groups(positions: pd.Series) -> np.ndarray:
+    """
+    Classify players by the group of their primary (first listed) position.
+
+    Positions take few distinct values, so each one is classified once and then looked up.
+
+    Args:
+        positions (pd.Series): The "Pos" column of a player table, e.g. "LW,FW".
+
+    Returns:
+        np.ndarray: The position group of every row: "FW", "MF", "DF", "GK" or "Total".
+    """
+    return np.array(
+        [_position_group(str(position)) for position in positions.to_numpy()]
+    )
+
+
+def aggregate_team_stats(
+    tables: Dict[str, pd.DataFrame],
+    spec: Dict[str, StatSpec] = GAME_STATS_SPEC,
+) -> dict:
+    """
+    Compute the statistics of a team from its player tables, with one grouped aggregation per table.
+
+    The columns of a table used by the spec are reduced together, as one matrix per position group, with
+    the same summation as pandas' Series.sum() and Series.mean(), which skip missing values.
+
+    Args:
+        tables (Dict[str, pd.DataFrame]): The player tables of the team, by table name.
+        spec (Dict[str, StatSpec], optional): The statistics to compute. Defaults to GAME_STATS_SPEC.
+
+    Returns:
+        dict: The value of every statistic of the spec, by name. Sums are Python ints or floats,
+            means are NumPy floats (NaN without any value).
+
+    Raises:
+        KeyError: If a table lacks a column of the spec, or has no player of a position group of the spec.
+    """
+    by_table: Dict[str, Dict[str, StatSpec]] = {}
+    for name, stat in spec.items():
+        by_table.setdefault(stat.table, {})[name] = stat
+
+    data = {}
+    for table_name, stats in by_table.items():
+        table = tables[table_name]
+        columns = list(dict.fromkeys(stat.column for stat in stats.values()))
+        integer = [pd.api.types.is_integer_dtype(table[column]) for column in columns]
+        # One row per column, so every reduction runs over contiguous memory like a Series reduction.
+        matrix = table[columns].to_numpy(dtype=np.float64).T
+        missing = np.isnan(matrix)
+        matrix = np.where(missing, 0.0, matrix)
+
+        groups = {stat.group for stat in stats.values()}
+        positions = position_groups(table["Pos"]) if groups - {None} else None
+        sums, counts = {}, {}
+        for group in groups:
+            rows = slice(None) if group is None else np.flatnonzero(positions == group)
+            if group is not None and not len(rows):
+                raise KeyError(f"No {group} player in the {table_name} table")
+            sums[group] = np.ascontiguousarray(matrix[:, rows]).sum(axis=1)
+            counts[group] = (~missing[:, rows]).sum(axis=1)
+
+        for name, stat in stats.items():
+            index = columns.index(stat.column)
+            total = sums[stat.group][index]
+            if stat.aggregation == "sum":
+                data[name] = int(total) if integer[index] else float(total)
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    data[name] = total / counts[stat.group][index]
+    return data
@@ -0,0 +1,199 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.methods import require_dependency
+
+OUTPUT_FORMATS = ("csv", "parquet", "arrow", "feather")
+PARTITION_COLUMNS = ("league", "season")
+INT16_COLUMNS = ("match_week", "home_goals", "away_goals", "home_points", "away_points")
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+    ".feather": "feather",
+}
+
+
+def infer_output_format(output_path, output_format: Optional[str] = None) -> str:
+    """
+    Get the format of a dataset file, from its extension unless it is given explicitly.
+
+    Args:
+        output_path (str): The file path (or directory for partitioned datasets).
+        output_format (str, optional): The explicit format. One of OUTPUT_FORMATS.
+
+    Returns:
+        str: The output format. Defaults to "csv" for unknown extensions.
+    """
+    if output_format is None:
+        extension = os.path.splitext(str(output_path))[1].lower()
+        output_format = _EXTENSIONS.get(extension, "csv")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Invalid output_format {output_format}. Must be one of {', '.join(OUTPUT_FORMATS)}"
+        )
+    return output_format
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Narrow the dtypes of a dataset for columnar storage: float32 statistics and int16 counts.
+
+    Args:
+        df (pd.DataFrame): The dataset.
+
+    Returns:
+        pd.DataFrame: The dataset with float64 columns as float32 and the INT16_COLUMNS as (nullable) int16.
+    """
+    dtypes = {column: "Int16" for column in INT16_COLUMNS if column in df.columns}
+    dtypes.update(
+        {
+            column: np.float32
+            for column in df.select_dtypes(include=[np.floating]).columns
+            if column not in dtypes
+        }
+    )
+    return df.astype(dtypes)
+
+
+class DatasetWriter:
+    """
+    Write a dataset chunk by chunk, as CSV, Parquet, Arrow IPC or Feather.
+
+    Columnar outputs require premier_league[columnar]. Every chunk is cast to the schema of the first one, so
+    chunks missing values in some column still produce a single consistent file.
+
+    Attributes:
+        output_path (str): The file path, or the root directory of a partitioned dataset.
+        output_format (str): One of OUTPUT_FORMATS.
+        partition_by (List[str], optional): Columns to partition a columnar dataset by (e.g. ["league", "season"]),
+            written as hive style directories (league=.../season=.../).
+    """
+
+    def __init__(
+        self,
+        output_path,
+        output_format: str = "csv",
+        partition_by: Optional[List[str]] = None,
+    ):
+        if output_format != "csv":
+            require_dependency("pyarrow", "columnar")
+        self.output_path = str(output_path)
+        self.output_format = output_format
+        self.partition_by = list(partition_by) if partition_by else None
+        self._chunks = 0
+        self._schema = None
+        self._writer = None
+        self._sink = None
+        self._partitions = set()
+
+    def write(self, df: pd.DataFrame):
+        """
+        Append a chunk to the output.
+
+        Args:
+            df (pd.DataFrame): The chunk, with the same columns as every other chunk.
+        """
+        if self.output_format == "csv":
+            df.to_csv(
+                self.output_path,
+                index=False,
+                mode="a" if self._chunks else "w",
+                header=not self._chunks,
+            )
+        else:
+            self._write_table(self._to_table(df))
+        self._chunks += 1
+
+    def _to_table(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=False)
+        if self._schema is None:
+            self._schema = table.schema
+        return table.cast(self._schema)
+
+    def _write_table(self, table):
+        import pyarrow as pa
+
+        if self.partition_by:
+            self._write_partitions(table)
+        elif self._writer is None and self.output_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.output_path, table.schema)
+        elif self._writer is None:
+            # Feather (version 2) files are Arrow IPC files.
+            self._sink = pa.OSFile(self.output_path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, table.schema)
+
+        if self._writer is not None:
+            self._writer.write_table(table)
+
+    def _write_partitions(self, table):
+        import pyarrow.dataset as ds
+
+        # Partitions are cleared when first written to, so files of earlier exports do not
+        # mix with this one, and then appended to by the next chunks.
+        keys = pd.MultiIndex.from_arrays(
+            [table.column(column).to_pandas() for column in self.partition_by]
+        )
+        new = ~keys.isin(list(self._partitions))
+        self._partitions.update(keys)
+
+        extension = "parquet" if self.output_format == "parquet" else "arrow"
+        for mask, behavior in ((new, "delete_matching"), (~new, "overwrite_or_ignore")):
+            if not mask.any():
+                continue
+            ds.write_dataset(
+                table.filter(mask),
+                self.output_path,
+                format="parquet" if self.output_format == "parquet" else "ipc",
+                partitioning=self.partition_by,
+                partitioning_flavor="hive",
+                basename_template=f"part-{self._chunks}-{{i}}.{extension}",
+                existing_data_behavior=behavior,
+            )
+
+    def close(self):
+        """
+        Finish the output files.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def write_columnar(
+    df: pd.DataFrame,
+    output_path,
+    output_format: str,
+    partition_by: Optional[List[str]] = None,
+):
+    """
+    Write a dataset as Parquet, Arrow IPC or Feather. Requires premier_league[columnar] to be installed.
+
+    Args:
+        df (pd.DataFrame): The dataset.
+        output_path (str): The file path, or the root directory of a partitioned dataset.
+        output_format (str): "parquet", "arrow" or "feather".
+        partition_by (List[str], optional): Columns to partition the dataset by (e.g. ["league", "season"]),
+            written as hive style directories (league=.../season=.../). Defaults to None.
+    """
+    with DatasetWriter(output_path, output_format, partition_by) as writer:
+        writer.write(df)
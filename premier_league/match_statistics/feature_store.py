@@ -0,0 +1,213 @@
+import hashlib
+from datetime import datetime
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..data.models import Game, GameFeatures, GameStats
+from .features import FEATURE_COLUMNS, lagged_team_features, load_game_stats, load_games
+
+# Identifies the feature columns, so vectors stored before a GameStats column was added are recomputed.
+_columns = ",".join(FEATURE_COLUMNS).encode("utf-8")
+FEATURE_SCHEMA = hashlib.sha1(_columns).hexdigest()[:12]
+
+
+class FeatureStore:
+    """
+    A persistent store of the lagged features of every game, kept in the game_features table.
+
+    Features are stored per (game, lag, weight type, params) as float64 vectors for both teams. They are computed
+    once, from the seasons of the teams of the games that have no stored features yet. Whenever the statistics
+    of a game change, the stored features depending on them are dropped (see GameFeatures), so they are
+    recomputed on the next update.
+
+    Attributes:
+        session (Session): The database session.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @staticmethod
+    def _key(
+        lag: int,
+        weight_type: Optional[Literal["exp", "lin"]] = None,
+        params: Optional[float] = None,
+    ) -> dict:
+        # Primary key columns cannot be NULL, and params only matter for exponential weights.
+        return {
+            "lag": lag,
+            "weight_type": weight_type or "",
+            "params": float(params) if weight_type == "exp" else 0.0,
+        }
+
+    def _filter(self, query, key: dict):
+        return query.where(
+            GameFeatures.lag == key["lag"],
+            GameFeatures.weight_type == key["weight_type"],
+            GameFeatures.params == key["params"],
+            GameFeatures.schema == FEATURE_SCHEMA,
+        )
+
+    def update(
+        self,
+        lag: int,
+        weight_type: Optional[Literal["exp", "lin"]] = None,
+        params: Optional[float] = None,
+        games: Optional[pd.DataFrame] = None,
+    ) -> int:
+        """
+        Compute and store the features of the games that have none stored yet.
+
+        Args:
+            lag (int): The number of previous games to average.
+            weight_type (str, optional): "lin" for linear weights, "exp" for exponential weights. Defaults to uniform weights.
+            params (float, optional): The base of the exponential weights.
+            games (pd.DataFrame, optional): The games, as returned by load_games(). Loaded if not given.
+
+        Returns:
+            int: The number of games whose features were computed.
+        """
+        key = self._key(lag, weight_type, params)
+        if games is None:
+            games = load_games(self.session)
+
+        stored = set(
+            self.session.execute(self._filter(select(GameFeatures.game_id), key))
+            .scalars()
+            .all()
+        )
+        missing = games[~games["game_id"].isin(stored)]
+        if missing.empty:
+            return 0
+
+        # The features of a team in a game only depend on its previous games of the season, so only the
+        # seasons of the teams of the missing games are recomputed. The other team of a game in those
+        # seasons gets features from a partial history, but they are only kept for missing games, whose
+        # teams are all recomputed.
+        windows = pd.MultiIndex.from_arrays(
+            [
+                pd.concat([missing["home_team_id"], missing["away_team_id"]]),
+                pd.concat([missing["season"], missing["season"]]),
+            ]
+        ).unique()
+        in_window = pd.MultiIndex.from_arrays(
+            [games["home_team_id"], games["season"]]
+        ).isin(windows) | pd.MultiIndex.from_arrays(
+            [games["away_team_id"], games["season"]]
+        ).isin(
+            windows
+        )
+        game_stats = load_game_stats(
+            self.session,
+            [
+                Game.season.in_(windows.get_level_values(1).unique().tolist()),
+                GameStats.team_id.in_(windows.get_level_values(0).unique().tolist()),
+            ],
+        )
+        features = lagged_team_features(
+            games[in_window], game_stats, lag, weight_type, params
+        )
+        vectors = {
+            (game_id, team_id): vector.tobytes()
+            for game_id, team_id, vector in zip(
+                features["game_id"],
+                features["team_id"],
+                features[FEATURE_COLUMNS].to_numpy(dtype=np.float64),
+            )
+        }
+
+        # Rows computed with other feature columns are replaced by the new ones.
+        self.session.execute(
+            delete(GameFeatures).where(
+                GameFeatures.lag == key["lag"],
+                GameFeatures.weight_type == key["weight_type"],
+                GameFeatures.params == key["params"],
+                GameFeatures.schema != FEATURE_SCHEMA,
+            )
+        )
+        computed_at = datetime.now()
+        self.session.execute(
+            insert(GameFeatures),
+            [
+                {
+                    "game_id": game_id,
+                    **key,
+                    "schema": FEATURE_SCHEMA,
+                    "home_features": vectors.get((game_id, home_team_id)),
+                    "away_features": vectors.get((game_id, away_team_id)),
+                    "computed_at": computed_at,
+                }
+                for game_id, home_team_id, away_team_id in zip(
+                    missing["game_id"], missing["home_team_id"], missing["away_team_id"]
+                )
+            ],
+        )
+        self.session.commit()
+        return len(missing)
+
+    def load(
+        self,
+        lag: int,
+        weight_type: Optional[Literal["exp", "lin"]] = None,
+        params: Optional[float] = None,
+        games: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        Update the store and load the stored features of every game.
+
+        Args:
+            lag (int): The number of previous games to average.
+            weight_type (str, optional): "lin" for linear weights, "exp" for exponential weights. Defaults to uniform weights.
+            params (float, optional): The base of the exponential weights.
+            games (pd.DataFrame, optional): The games, as returned by load_games(). Loaded if not given.
+
+        Returns:
+            pd.DataFrame: One row per team and game with game_id, team_id and the FEATURE_COLUMNS columns,
+                in the format of lagged_team_features().
+        """
+        if games is None:
+            games = load_games(self.session)
+        self.update(lag, weight_type, params, games=games)
+
+        rows = self.session.execute(
+            self._filter(
+                select(
+                    GameFeatures.game_id,
+                    GameFeatures.home_features,
+                    GameFeatures.away_features,
+                ),
+                self._key(lag, weight_type, params),
+            )
+        ).all()
+        stored = pd.DataFrame(
+            rows, columns=["game_id", "home_features", "away_features"]
+        ).merge(games[["game_id", "home_team_id", "away_team_id"]], on="game_id")
+
+        # The vectors of a side are decoded at once, from the concatenation of their bytes.
+        sides = []
+        for side in ("home", "away"):
+            vectors = stored[f"{side}_features"]
+            present = vectors.notna().to_numpy()
+            side_features = pd.DataFrame(
+                np.frombuffer(b"".join(vectors[present]), dtype=np.float64).reshape(
+                    -1, len(FEATURE_COLUMNS)
+                ),
+                columns=FEATURE_COLUMNS,
+            )
+            side_features.insert(
+                0, "team_id", stored[f"{side}_team_id"].to_numpy()[present]
+            )
+            side_features.insert(0, "game_id", stored["game_id"].to_numpy()[present])
+            sides.append(side_features)
+        return pd.concat(sides, ignore_index=True)
+
+    def clear(self):
+        """
+        Drop every stored feature.
+        """
+        self.session.execute(delete(GameFeatures))
+        self.session.commit()
@@ -0,0 +1,346 @@
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from ..data.models import Game, GameStats, League, Team
+
+GAME_COLUMNS = [
+    "game_id",
+    "date",
+    "season",
+    "match_week",
+    "home_team_id",
+    "away_team_id",
+    "home_team",
+    "away_team",
+    "home_goals",
+    "away_goals",
+    "home_points",
+    "away_points",
+    "league",
+]
+
+# Statistics averaged over the lagged games, in the column order of the game_stats table.
+# save_percentage is averaged separately, over the games where it is set.
+STAT_COLUMNS = [
+    column.name
+    for column in GameStats.__table__.columns
+    if column.name not in ("id", "game_id", "team_id", "save_percentage")
+]
+FEATURE_COLUMNS = STAT_COLUMNS + ["save_percentage"]
+
+# The number of games fetched from the database and written to the output at once by stream_dataset().
+STREAM_BATCH_SIZE = 1000
+
+
+def lag_weights(
+    lag: int,
+    weight_type: Optional[Literal["exp", "lin"]] = None,
+    params: Optional[float] = None,
+) -> List[float]:
+    """
+    Get the weights of the lagged games, most recent game first.
+
+    Args:
+        lag (int): The number of lagged games.
+        weight_type (str, optional): "lin" for linear weights, "exp" for exponential weights. Defaults to uniform weights.
+        params (float, optional): The base of the exponential weights.
+
+    Returns:
+        List[float]: The weight of each lagged game, starting with the most recent one.
+    """
+    if weight_type == "lin":
+        return [ind for ind in range(lag, 0, -1)]
+    elif weight_type == "exp":
+        return [params ** (k) for k in range(1, lag + 1)]
+    return [1] * lag
+
+
+def _games_query():
+    home_team = aliased(Team)
+    away_team = aliased(Team)
+    return (
+        select(
+            Game.id,
+            Game.date,
+            Game.season,
+            Game.match_week,
+            Game.home_team_id,
+            Game.away_team_id,
+            home_team.name,
+            away_team.name,
+            Game.home_goals,
+            Game.away_goals,
+            Game.home_team_points,
+            Game.away_team_points,
+            League.name,
+        )
+        .join(home_team, Game.home_team_id == home_team.id)
+        .join(away_team, Game.away_team_id == away_team.id)
+        .join(League, Game.league_id == League.id)
+    )
+
+
+def load_games(session: Session) -> pd.DataFrame:
+    """
+    Load every game, with the names of both teams, in a single query.
+
+    Args:
+        session (Session): The database session.
+
+    Returns:
+        pd.DataFrame: One row per game with the GAME_COLUMNS columns.
+    """
+    games = pd.DataFrame(session.execute(_games_query()).all(), columns=GAME_COLUMNS)
+    games["date"] = pd.to_datetime(games["date"])
+    return games
+
+
+def load_game_stats(session: Session, criteria: Sequence = ()) -> pd.DataFrame:
+    """
+    Load the statistics of every team in every game in a single query.
+
+    Args:
+        session (Session): The database session.
+        criteria (Sequence, optional): The where clauses, on the statistics or their game. Defaults to every
+            statistics row.
+
+    Returns:
+        pd.DataFrame: One row per team and game with game_id, team_id and the FEATURE_COLUMNS columns.
+    """
+    columns = ["game_id", "team_id"] + FEATURE_COLUMNS
+    stmt = select(*(getattr(GameStats, column) for column in columns))
+    if criteria:
+        stmt = stmt.join(Game, GameStats.game_id == Game.id).where(*criteria)
+    return pd.DataFrame(session.execute(stmt).all(), columns=columns)
+
+
+def lagged_team_features(
+    games: pd.DataFrame,
+    game_stats: pd.DataFrame,
+    lag: int,
+    weight_type: Optional[Literal["exp", "lin"]] = None,
+    params: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Compute the weighted mean statistics of each team over its previous games of the same season.
+
+    Every team and game is a row of one matrix sorted by team, season and date, so the k-th previous game of a
+    row is the row k positions above it. Rows with fewer than lag previous games in the season are dropped, and
+    the weighted means of all the others are computed at once, with one vectorized operation per lagged game.
+
+    Args:
+        games (pd.DataFrame): The games, as returned by load_games().
+        game_stats (pd.DataFrame): The statistics, as returned by load_game_stats().
+        lag (int): The number of previous games to average.
+        weight_type (str, optional): "lin" for linear weights, "exp" for exponential weights. Defaults to uniform weights.
+        params (float, optional): The base of the exponential weights.
+
+    Returns:
+        pd.DataFrame: One row per team and game with game_id, team_id and the FEATURE_COLUMNS columns.
+    """
+    team_games = pd.concat(
+        [
+            games[["game_id", "date", "season", f"{side}_team_id"]].rename(
+                columns={f"{side}_team_id": "team_id"}
+            )
+            for side in ("home", "away")
+        ],
+        ignore_index=True,
+    )
+    team_games = team_games.merge(game_stats, on=["game_id", "team_id"], how="left")
+    team_games = team_games.sort_values(
+        ["team_id", "season", "date"], kind="stable"
+    ).reset_index(drop=True)
+
+    previous_games = team_games.groupby(["team_id", "season"]).cumcount().to_numpy()
+    rows = np.flatnonzero(previous_games >= lag)
+
+    values = team_games[STAT_COLUMNS].to_numpy(dtype=float)
+    save_percentage = team_games["save_percentage"].to_numpy(dtype=float)
+    saved = ~np.isnan(save_percentage) & (save_percentage != 0)
+    save_percentage = np.where(saved, save_percentage, 0.0)
+
+    weights = lag_weights(lag, weight_type, params)
+    weighted_stats = np.zeros((len(rows), len(STAT_COLUMNS)))
+    weighted_saves = np.zeros(len(rows))
+    save_weights = np.zeros(len(rows))
+    for k, weight in enumerate(weights, start=1):
+        weighted_stats = weighted_stats + values[rows - k] * weight
+        weighted_saves = weighted_saves + np.where(
+            saved[rows - k], save_percentage[rows - k] * weight, 0.0
+        )
+        save_weights = save_weights + np.where(saved[rows - k], weight, 0.0)
+
+    features = pd.DataFrame(weighted_stats / sum(weights), columns=STAT_COLUMNS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        features["save_percentage"] = np.where(
+            save_weights > 0, weighted_saves / save_weights, 0
+        )
+    features.insert(0, "team_id", team_games["team_id"].to_numpy()[rows])
+    features.insert(0, "game_id", team_games["game_id"].to_numpy()[rows])
+    return features
+
+
+def build_dataset(
+    games: pd.DataFrame,
+    features: pd.DataFrame,
+    rows_count: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Join the lagged features of both teams onto their games.
+
+    Games where either team has fewer than lag previous games in the season are dropped.
+
+    Args:
+        games (pd.DataFrame): The games, as returned by load_games().
+        features (pd.DataFrame): The lagged features, as returned by lagged_team_features().
+        rows_count (int, optional): Only keep the rows_count most recent games (before dropping games). Defaults to None.
+
+    Returns:
+        pd.DataFrame: One row per game with the GAME_COLUMNS columns followed by the home_ and away_ features.
+    """
+    if rows_count is not None:
+        games = games.sort_values("date", ascending=False, kind="stable").head(
+            rows_count
+        )
+
+    dataset = games
+    for side in ("home", "away"):
+        side_features = features.rename(
+            columns={column: f"{side}_{column}" for column in FEATURE_COLUMNS}
+        ).rename(columns={"team_id": f"{side}_team_id"})
+        dataset = dataset.merge(
+            side_features, on=["game_id", f"{side}_team_id"], how="inner"
+        )
+    return dataset
+
+
+def stream_dataset(
+    session: Session,
+    lag: int,
+    weight_type: Optional[Literal["exp", "lin"]] = None,
+    params: Optional[float] = None,
+    rows_count: Optional[int] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Build the dataset of build_dataset() in chunks, with memory bounded by the batch size and the number of teams.
+
+    Games are read in date order with their statistics, batch_size rows at a time, and every team keeps only the
+    statistics of its last lag games of the season. The features are computed with the same operations as
+    lagged_team_features(), so the values are identical.
+
+    Args:
+        session (Session): The database session.
+        lag (int): The number of previous games to average.
+        weight_type (str, optional): "lin" for linear weights, "exp" for exponential weights. Defaults to uniform weights.
+        params (float, optional): The base of the exponential weights.
+        rows_count (int, optional): Only keep the rows_count most recent games (before dropping games). Defaults to None.
+        batch_size (int, optional): The number of games per query batch and per chunk. Defaults to STREAM_BATCH_SIZE.
+
+    Yields:
+        pd.DataFrame: Chunks of the dataset in date order, in the format of build_dataset(). A single empty chunk
+            is yielded if no game has enough previous games.
+    """
+    home_stats = aliased(GameStats)
+    away_stats = aliased(GameStats)
+    stmt = (
+        _games_query()
+        .add_columns(
+            *(getattr(home_stats, column) for column in FEATURE_COLUMNS),
+            *(getattr(away_stats, column) for column in FEATURE_COLUMNS),
+        )
+        .outerjoin(
+            home_stats,
+            (home_stats.game_id == Game.id) & (home_stats.team_id == Game.home_team_id),
+        )
+        .outerjoin(
+            away_stats,
+            (away_stats.game_id == Game.id) & (away_stats.team_id == Game.away_team_id),
+        )
+        .order_by(Game.date, Game.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    selected = None
+    if rows_count is not None:
+        selected = set(
+            session.execute(
+                select(Game.id).order_by(Game.date.desc()).limit(rows_count)
+            ).scalars()
+        )
+
+    columns = (
+        GAME_COLUMNS
+        + [f"home_{column}" for column in FEATURE_COLUMNS]
+        + [f"away_{column}" for column in FEATURE_COLUMNS]
+    )
+    weights = lag_weights(lag, weight_type, params)
+    total_weight = sum(weights)
+    stat_count = len(STAT_COLUMNS)
+    # The season and the (stats, save percentage) of the last lag games of every team, most recent last.
+    history: Dict[str, Tuple[str, Deque[Tuple[np.ndarray, float]]]] = {}
+
+    def team_features(team_id, season) -> Optional[np.ndarray]:
+        season_history = history.get(team_id)
+        if season_history is None or season_history[0] != season:
+            season_history = history[team_id] = (season, deque(maxlen=lag))
+        previous_games = season_history[1]
+        if len(previous_games) < lag:
+            return None
+
+        weighted_stats = np.zeros(stat_count)
+        weighted_saves = 0.0
+        save_weights = 0.0
+        for weight, (stats, save_percentage) in zip(weights, reversed(previous_games)):
+            weighted_stats = weighted_stats + stats * weight
+            if save_percentage:
+                weighted_saves = weighted_saves + save_percentage * weight
+                save_weights = save_weights + weight
+        save_percentage = weighted_saves / save_weights if save_weights > 0 else 0.0
+        return np.append(weighted_stats / total_weight, save_percentage)
+
+    def remember(team_id, values):
+        values = np.array(values, dtype=float)
+        save_percentage = values[stat_count]
+        history[team_id][1].append(
+            (values[:stat_count], 0.0 if np.isnan(save_percentage) else save_percentage)
+        )
+
+    def chunk(rows) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=columns)
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    rows = []
+    yielded = False
+    game_column_count = len(GAME_COLUMNS)
+    feature_count = len(FEATURE_COLUMNS)
+    for row in session.execute(stmt):
+        game = row[:game_column_count]
+        home_values = row[game_column_count : game_column_count + feature_count]
+        away_values = row[game_column_count + feature_count :]
+        season, home_team_id, away_team_id = game[2], game[4], game[5]
+
+        home_features = team_features(home_team_id, season)
+        away_features = team_features(away_team_id, season)
+        remember(home_team_id, home_values)
+        remember(away_team_id, away_values)
+
+        if home_features is None or away_features is None:
+            continue
+        if selected is not None and game[0] not in selected:
+            continue
+        rows.append((*game, *home_features, *away_features))
+        if len(rows) >= batch_size:
+            yield chunk(rows)
+            yielded = True
+            rows = []
+
+    if rows or not yielded:
+        yield chunk(rows)
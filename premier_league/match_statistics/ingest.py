@@ -0,0 +1,265 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..data.models import Game, GameFeatures, GameParse, GameStats, League, Team
+from ..data.models.game_features import invalidate_team_features
+from ..ranking.snapshots import refresh_standings
+
+# The number of parsed matches written to the database per transaction.
+DEFAULT_BATCH_SIZE = 200
+# The number of ids bound in one IN clause, well below the SQLite limit on bound parameters.
+IN_CHUNK_SIZE = 500
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def existing_game_ids(
+    session: Session, game_ids: Iterable[str], chunk_size: int = IN_CHUNK_SIZE
+) -> Set[str]:
+    """
+    Find which games are already stored, with one query per chunk_size ids.
+
+    Args:
+        session (Session): The database session.
+        game_ids (Iterable[str]): The candidate game ids.
+        chunk_size (int, optional): The number of ids per query. Defaults to IN_CHUNK_SIZE.
+
+    Returns:
+        Set[str]: The candidate ids found in the game table.
+    """
+    existing = set()
+    for chunk in _chunks(list(dict.fromkeys(game_ids)), chunk_size):
+        existing.update(
+            session.execute(select(Game.id).where(Game.id.in_(chunk))).scalars()
+        )
+    return existing
+
+
+class MatchIngestor:
+    """
+    Buffer parsed matches and write them to the database in batches, with one transaction per batch.
+
+    Leagues and teams are looked up in maps loaded once, and the games, statistics and parser versions
+    of a whole batch are written with bulk statements. Adding a match that is already stored is a no-op,
+    or overwrites the stored game and statistics when replace is set, so ingestion can be rerun safely.
+    The standings snapshots of the written seasons are refreshed in the same transaction.
+
+    Attributes:
+        session (Session): The database session.
+        batch_size (int): The number of matches buffered before they are written.
+        replace (bool): Whether to overwrite games that already exist.
+        parser_version (int): The parser version the games are tagged with.
+        stored (int): The number of matches written so far.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        parser_version: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        replace: bool = False,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.session = session
+        self.parser_version = parser_version
+        self.batch_size = batch_size
+        self.replace = replace
+        self.stored = 0
+        self._matches: Dict[str, dict] = {}
+        self._load_lookups()
+
+    def _load_lookups(self):
+        self._league_ids = dict(
+            self.session.execute(select(League.name, League.id)).all()
+        )
+        self._team_ids = set(self.session.execute(select(Team.id)).scalars())
+
+    def add(self, match_data: Optional[dict], **kwargs):
+        """
+        Buffer a parsed match, writing the buffer once it holds batch_size matches.
+
+        Can be used as the process_func of scrape_and_process_all().
+
+        Args:
+            match_data (Optional[dict]): The match data returned by MatchStatistics._parse_match_page().
+                Pages that could not be parsed (None) are skipped.
+            **kwargs: Additional keyword arguments (unused).
+        """
+        if match_data is None:
+            return
+        self._matches[match_data["game"]["id"]] = match_data
+        if len(self._matches) >= self.batch_size:
+            self.flush()
+
+    def add_all(self, matches: Iterable[Optional[dict]]) -> int:
+        """
+        Buffer and write every parsed match.
+
+        Args:
+            matches (Iterable[Optional[dict]]): The parsed matches.
+
+        Returns:
+            int: The number of matches written.
+        """
+        stored = self.stored
+        for match_data in matches:
+            self.add(match_data)
+        self.flush()
+        return self.stored - stored
+
+    def flush(self) -> int:
+        """
+        Write the buffered matches in a single transaction.
+
+        Returns:
+            int: The number of matches written.
+
+        Raises:
+            Exception: If an error occurs while adding match data to the database. The batch is rolled back.
+        """
+        if not self._matches:
+            return 0
+        matches, self._matches = self._matches, {}
+
+        try:
+            existing = {
+                row.id: row
+                for chunk in _chunks(list(matches), IN_CHUNK_SIZE)
+                for row in self.session.execute(
+                    select(
+                        Game.id,
+                        Game.home_team_id,
+                        Game.away_team_id,
+                        Game.season,
+                        Game.date,
+                        Game.league_id,
+                        Game.match_week,
+                    ).where(Game.id.in_(chunk))
+                )
+            }
+            if not self.replace:
+                matches = {
+                    game_id: match_data
+                    for game_id, match_data in matches.items()
+                    if game_id not in existing
+                }
+            if not matches:
+                self.session.commit()
+                return 0
+
+            self._write(matches, existing)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            # Leagues and teams inserted by the failed batch were rolled back as well.
+            self._load_lookups()
+            raise Exception(f"Error adding match data: {str(e)}")
+
+        self.stored += len(matches)
+        return len(matches)
+
+    def _write(self, matches: Dict[str, dict], existing: dict):
+        new_teams = {}
+        new_games, updated_games, game_stats = [], [], []
+        for game_id, match_data in matches.items():
+            league_id = self._league_id(match_data["league"])
+            for side in ("home_team", "away_team"):
+                team = match_data[side]
+                if team["id"] not in self._team_ids:
+                    new_teams[team["id"]] = {**team, "league_id": league_id}
+
+            game = {**match_data["game"], "league_id": league_id}
+            (updated_games if game_id in existing else new_games).append(game)
+            for side in ("home", "away"):
+                game_stats.append(
+                    {
+                        "game_id": game_id,
+                        "team_id": game[f"{side}_team_id"],
+                        **match_data[f"{side}_stats"],
+                    }
+                )
+
+        if new_teams:
+            self.session.execute(insert(Team), list(new_teams.values()))
+            self._team_ids.update(new_teams)
+        if new_games:
+            self.session.execute(insert(Game), new_games)
+        if updated_games:
+            self.session.execute(update(Game), updated_games)
+            for chunk in _chunks([game["id"] for game in updated_games], IN_CHUNK_SIZE):
+                self.session.execute(
+                    delete(GameStats).where(GameStats.game_id.in_(chunk))
+                )
+        self.session.execute(insert(GameStats), game_stats)
+
+        game_ids = list(matches)
+        for chunk in _chunks(game_ids, IN_CHUNK_SIZE):
+            self.session.execute(delete(GameParse).where(GameParse.game_id.in_(chunk)))
+        parsed_at = datetime.now()
+        self.session.execute(
+            insert(GameParse),
+            [
+                {
+                    "game_id": game_id,
+                    "parser_version": self.parser_version,
+                    "parsed_at": parsed_at,
+                }
+                for game_id in game_ids
+            ],
+        )
+
+        replaced = [existing[game["id"]]._asdict() for game in updated_games]
+        self._invalidate_features(
+            [match_data["game"] for match_data in matches.values()] + replaced
+        )
+        self._refresh_standings(new_games + updated_games + replaced)
+
+    def _league_id(self, league: dict) -> int:
+        league_id = self._league_ids.get(league["name"])
+        if league_id is None:
+            league_id = self.session.execute(
+                insert(League).values(
+                    name=league["name"],
+                    up_to_date_season="2018-2019",
+                    up_to_date_match_week=league["match_week"],
+                )
+            ).inserted_primary_key[0]
+            self._league_ids[league["name"]] = league_id
+        return league_id
+
+    def _invalidate_features(self, games: List[dict]):
+        # Bulk statements skip the GameStats mapper events, so the stored features depending on the
+        # written games are dropped here, once per team and season from its earliest written game.
+        if self.session.execute(select(GameFeatures.game_id).limit(1)).first() is None:
+            return
+        earliest = {}
+        for game in games:
+            for team_id in (game["home_team_id"], game["away_team_id"]):
+                key = (team_id, game["season"])
+                if key not in earliest or game["date"] < earliest[key]:
+                    earliest[key] = game["date"]
+
+        connection = self.session.connection()
+        for (team_id, season), date in earliest.items():
+            invalidate_team_features(connection, team_id, season, date)
+
+    def _refresh_standings(self, games: List[dict]):
+        # The stored tables of every written season, old values of replaced games included, are
+        # recomputed from the earliest written match week.
+        earliest = {}
+        for game in games:
+            if game["league_id"] is None or game.get("match_week") is None:
+                continue
+            key = (game["league_id"], game["season"])
+            if key not in earliest or game["match_week"] < earliest[key]:
+                earliest[key] = game["match_week"]
+
+        for (league_id, season), match_week in earliest.items():
+            refresh_standings(self.session, league_id, season, match_week)
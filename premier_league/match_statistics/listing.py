@@ -0,0 +1,356 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from ..data.models import Game, GameStats, League, Team
+from ..data.serializers import ModelSerializer
+
+GAME_SERIALIZER = ModelSerializer(Game)
+GAME_STATS_SERIALIZER = ModelSerializer(GameStats)
+DEFAULT_PAGE_SIZE = 500
+
+
+class Page(NamedTuple):
+    """
+    A page of a keyset-paginated listing.
+
+    Attributes:
+        rows (Union[List[dict], np.recarray]): The rows of the page, as dicts or as a NumPy record array.
+        cursor (Optional[str]): The token of the next page, None after the last page.
+    """
+
+    rows: Union[List[dict], np.recarray]
+    cursor: Optional[str]
+
+
+def load_game_dicts(
+    session: Session,
+    criteria: Sequence = (),
+    order_by: Sequence = (Game.date,),
+    limit: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+    include_relationships: bool = True,
+) -> List[dict]:
+    """
+    List games as dicts, like Game.to_dict(), with a single query.
+
+    The games are selected together with their teams, league and statistics, and the rows are grouped
+    back into games in one pass, without loading ORM objects.
+
+    Args:
+        session (Session): The database session.
+        criteria (Sequence, optional): The where clauses of the games. Defaults to every game.
+        order_by (Sequence, optional): The order of the games. Defaults to their date.
+        limit (int, optional): The maximum number of games. Defaults to None.
+        columns (Sequence[str], optional): The game columns to include. Defaults to all columns.
+        include_relationships (bool, optional): Whether to include the teams, statistics and league of
+            every game, as Game.to_dict(include_relationships=True) does. Defaults to True.
+
+    Returns:
+        List[dict]: The games, in order.
+    """
+    serializer = GAME_SERIALIZER if columns is None else ModelSerializer(Game, columns)
+    game_filter = list(criteria)
+    if limit is not None:
+        # The limit applies to games, not to the rows of their joined statistics.
+        game_filter = [
+            Game.id.in_(
+                select(Game.id).where(*criteria).order_by(*order_by).limit(limit)
+            )
+        ]
+
+    if not include_relationships:
+        statement = select(*serializer.columns).where(*game_filter).order_by(*order_by)
+        return serializer.to_dicts(session.execute(statement))
+
+    home_team, away_team = aliased(Team), aliased(Team)
+    statement = (
+        select(
+            Game.id,
+            home_team.id,
+            home_team.name,
+            away_team.id,
+            away_team.name,
+            League.id,
+            League.name,
+            *serializer.columns,
+            *GAME_STATS_SERIALIZER.columns,
+        )
+        .select_from(Game)
+        .outerjoin(home_team, Game.home_team_id == home_team.id)
+        .outerjoin(away_team, Game.away_team_id == away_team.id)
+        .outerjoin(League, Game.league_id == League.id)
+        .outerjoin(GameStats, GameStats.game_id == Game.id)
+        .where(*game_filter)
+        # Statistics in the order of the (game_id, team_id) index, as Game.game_stats loads them.
+        .order_by(*order_by, Game.id, GameStats.team_id)
+    )
+
+    games = {}
+    stats_start = 7 + len(serializer.columns)
+    stats_id = stats_start + GAME_STATS_SERIALIZER.names.index("id")
+    for row in session.execute(statement):
+        game = games.get(row[0])
+        if game is None:
+            game = games[row[0]] = (serializer.to_dict(row[7:stats_start]), row, [])
+        # Games without statistics come as a single row with NULL statistics.
+        if row[stats_id] is not None:
+            game[2].append(GAME_STATS_SERIALIZER.to_dict(row[stats_start:]))
+
+    results = []
+    for result, row, game_stats in games.values():
+        if row[1] is not None:
+            result["home_team"] = {"id": row[1], "name": row[2]}
+        if row[3] is not None:
+            result["away_team"] = {"id": row[3], "name": row[4]}
+        if game_stats:
+            result["game_stats"] = game_stats
+        if row[5] is not None:
+            result["league"] = {"id": row[5], "name": row[6]}
+        results.append(result)
+    return results
+
+
+def load_game_stats_dicts(
+    session: Session,
+    criteria: Sequence = (),
+    order_by: Sequence = (Game.date,),
+    limit: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> List[dict]:
+    """
+    List game statistics as dicts, like GameStats.to_dict(), with a single query.
+
+    Args:
+        session (Session): The database session.
+        criteria (Sequence, optional): The where clauses, on the statistics or their game.
+        order_by (Sequence, optional): The order of the statistics. Defaults to the date of their game.
+        limit (int, optional): The maximum number of statistics. Defaults to None.
+        columns (Sequence[str], optional): The columns to include. Defaults to all columns.
+
+    Returns:
+        List[dict]: The statistics, in order.
+    """
+    serializer = (
+        GAME_STATS_SERIALIZER
+        if columns is None
+        else ModelSerializer(GameStats, columns)
+    )
+    statement = (
+        select(*serializer.columns)
+        .join(Game, GameStats.game_id == Game.id)
+        .where(*criteria)
+        .order_by(*order_by)
+        .limit(limit)
+    )
+    return serializer.to_dicts(session.execute(statement))
+
+
+def encode_cursor(date: datetime, key: Union[str, int]) -> str:
+    """
+    Encode the position after a row as an opaque, URL-safe cursor token.
+
+    Args:
+        date (datetime): The date of the row.
+        key (Union[str, int]): The id of the row.
+
+    Returns:
+        str: The cursor token.
+    """
+    payload = json.dumps([date.isoformat(), key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Union[str, int]]:
+    """
+    Decode a cursor token of encode_cursor().
+
+    Args:
+        cursor (str): The cursor token.
+
+    Returns:
+        Tuple[datetime, Union[str, int]]: The date and id of the row the cursor points after.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, key = json.loads(payload)
+        if not isinstance(key, (str, int)):
+            raise ValueError(key)
+        return datetime.fromisoformat(date), key
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _keyset(date_column, key_column, cursor: Optional[str], descending: bool):
+    order_by = (
+        [date_column.desc(), key_column.desc()]
+        if descending
+        else [date_column, key_column]
+    )
+    # Rows without a date have no position in the (date, id) order.
+    criteria = [date_column.is_not(None)]
+    if cursor is not None:
+        date, key = decode_cursor(cursor)
+        if descending:
+            after = or_(date_column < date, and_(date_column == date, key_column < key))
+        else:
+            after = or_(date_column > date, and_(date_column == date, key_column > key))
+        criteria.append(after)
+    return criteria, order_by
+
+
+def _paginate(fetch, cursor: Optional[str], page_size: int) -> Iterator[Page]:
+    # Checked here rather than in the generator, so bad arguments fail on the call, not on the first page.
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if cursor is not None:
+        decode_cursor(cursor)
+
+    def pages(cursor: Optional[str]) -> Iterator[Page]:
+        first = True
+        while True:
+            rows, last = fetch(cursor)
+            if not len(rows) and not first:
+                return
+            first = False
+            # A short page is the last one; a full one may be followed by an empty page.
+            cursor = encode_cursor(*last) if len(rows) == page_size else None
+            yield Page(rows, cursor)
+            if cursor is None:
+                return
+
+    return pages(cursor)
+
+
+def game_pages(
+    session: Session,
+    criteria: Sequence = (),
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    include_relationships: bool = True,
+    records: bool = False,
+) -> Iterator[Page]:
+    """
+    Page through games in (date, id) order, one bounded query per page.
+
+    Every page starts after the (date, id) of the last game of the previous one instead of at an offset,
+    so it costs the same at any depth of the listing and games inserted meanwhile neither repeat nor
+    shift the pages. Games without a date are not listed.
+
+    Args:
+        session (Session): The database session.
+        criteria (Sequence, optional): The where clauses of the games. Defaults to every game.
+        page_size (int, optional): The maximum number of games per page. Defaults to DEFAULT_PAGE_SIZE.
+        cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+        descending (bool, optional): Whether to list the latest games first. Defaults to False.
+        columns (Sequence[str], optional): The game columns to include. Defaults to all columns.
+        include_relationships (bool, optional): Whether to include the teams, statistics and league of
+            every game, as load_game_dicts() does. Defaults to True.
+        records (bool, optional): Whether to return the rows of every page as a NumPy record array
+            instead of dicts. Requires include_relationships=False. Defaults to False.
+
+    Yields:
+        Page: The games of every page and the cursor of the next one.
+    """
+    if records and include_relationships:
+        raise ValueError("records require include_relationships=False")
+    names = GAME_SERIALIZER.names if columns is None else tuple(columns)
+    serializer = ModelSerializer(Game, names)
+
+    def fetch(after: Optional[str]):
+        keyset, order_by = _keyset(Game.date, Game.id, after, descending)
+        if include_relationships:
+            # The cursor needs the date and id of the last game, whether they are projected or not.
+            extra = [name for name in ("date", "id") if name not in names]
+            rows = load_game_dicts(
+                session,
+                [*criteria, *keyset],
+                order_by=order_by,
+                limit=page_size,
+                columns=[*names, *extra],
+            )
+            last = (
+                (datetime.fromisoformat(rows[-1]["date"]), rows[-1]["id"])
+                if rows
+                else None
+            )
+            for row in rows:
+                for name in extra:
+                    del row[name]
+            return rows, last
+
+        statement = (
+            select(Game.date, Game.id, *serializer.columns)
+            .where(*criteria, *keyset)
+            .order_by(*order_by)
+            .limit(page_size)
+        )
+        rows = session.execute(statement).all()
+        last = tuple(rows[-1][:2]) if rows else None
+        values = [row[2:] for row in rows]
+        if records:
+            return serializer.to_records(values), last
+        return serializer.to_dicts(values), last
+
+    return _paginate(fetch, cursor, page_size)
+
+
+def game_stats_pages(
+    session: Session,
+    criteria: Sequence = (),
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    columns: Optional[Sequence[str]] = None,
+    records: bool = False,
+) -> Iterator[Page]:
+    """
+    Page through game statistics in the (date, id) order of their game date and their own id.
+
+    Pages are bounded queries resuming after the last statistics of the previous page, as in game_pages().
+
+    Args:
+        session (Session): The database session.
+        criteria (Sequence, optional): The where clauses, on the statistics or their game.
+        page_size (int, optional): The maximum number of statistics per page. Defaults to DEFAULT_PAGE_SIZE.
+        cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+        descending (bool, optional): Whether to list the statistics of the latest games first.
+            Defaults to False.
+        columns (Sequence[str], optional): The columns to include. Defaults to all columns.
+        records (bool, optional): Whether to return the rows of every page as a NumPy record array
+            instead of dicts. Defaults to False.
+
+    Yields:
+        Page: The statistics of every page and the cursor of the next one.
+    """
+    serializer = (
+        GAME_STATS_SERIALIZER
+        if columns is None
+        else ModelSerializer(GameStats, columns)
+    )
+
+    def fetch(after: Optional[str]):
+        keyset, order_by = _keyset(Game.date, GameStats.id, after, descending)
+        statement = (
+            select(Game.date, GameStats.id, *serializer.columns)
+            .join(Game, GameStats.game_id == Game.id)
+            .where(*criteria, *keyset)
+            .order_by(*order_by)
+            .limit(page_size)
+        )
+        rows = session.execute(statement).all()
+        last = tuple(rows[-1][:2]) if rows else None
+        values = [row[2:] for row in rows]
+        if records:
+            return serializer.to_records(values), last
+        return serializer.to_dicts(values), last
+
+    return _paginate(fetch, cursor, page_size)
@@ -1,6 +1,7 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Literal, Optional, Type, Union
+from typing import Dict, Iterator, List, Literal, Optional, Type, Union
 from xml.etree.ElementTree import ElementTree
 
 import pandas as pd
@@ -8,13 +9,44 @@ from lxml import etree
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import aliased, joinedload
 from sqlalchemy.sql import exists
+from tqdm import tqdm
 
 from premier_league.base import BaseDataSetScrapper
 
 from ..data.initialize import init_db
-from ..data.models import Game, GameStats, League, Team
+from ..data.models import Game, GameParse, GameStats, League, Team
+from ..utils.page_store import PageStore
 from ..utils.url import PredictorURL
 from ..utils.xpath import MATCHES
+from .aggregation import aggregate_team_stats
+from .export import (
+    PARTITION_COLUMNS,
+    DatasetWriter,
+    infer_output_format,
+    write_columnar,
+)
+from .feature_store import FeatureStore
+from .features import (
+    build_dataset,
+    lagged_team_features,
+    load_game_stats,
+    load_games,
+    stream_dataset,
+)
+from .ingest import DEFAULT_BATCH_SIZE, MatchIngestor, existing_game_ids
+from .listing import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    game_pages,
+    game_stats_pages,
+    load_game_dicts,
+    load_game_stats_dicts,
+)
+from .tables import read_possession, read_stat_table
+
+# Bump whenever a change to the parsing of match pages changes the stored data,
+# so that reprocess_archive() rebuilds the games parsed by the older version.
+PARSER_VERSION = 1
 
 
 class MatchStatistics(BaseDataSetScrapper):
@@ -133,9 +165,15 @@ class MatchStatistics(BaseDataSetScrapper):
         lag: int = 10,
         weights: Literal["lin", "exp"] = None,
         params: float = None,
+        method: Literal["vectorized", "streaming", "legacy"] = "vectorized",
+        use_feature_store: bool = False,
+        output_format: Literal["csv", "parquet", "arrow", "feather"] = None,
+        columns: Optional[List[str]] = None,
+        partition_by: Optional[List[str]] = None,
     ):
         """
         Create a CSV file containing game statistics for machine learning training. Currently max of 17520 Data Rows.
+        The dataset can also be written as Parquet, Arrow IPC or Feather, which requires premier_league[columnar].
 
         Each row in the CSV file represents one game, including both home and away team statistics.
         The data is sorted by date to maintain chronological order.
@@ -146,6 +184,20 @@ class MatchStatistics(BaseDataSetScrapper):
             lag (int): The number of days to lag the data. 10 indicates, the current row will use the stats for the team's past 10 game average (Where all earlier games are dropped).
             weights (str, optional): Wheather to give importance to more recent games, No Weight will be added if lag = 1. Lin: Linear Weights, Exp: Exponential Weights
             params (float, optional): The Parameter to base a Exponential Weighting strategy on. Only mandatory for exponential Weights.
+            method (str, optional): "vectorized" loads every game once and computes the lagged features of all teams
+                with grouped array operations. "streaming" reads the games in date order, in batches, keeping only
+                the last lag games of every team, and writes the dataset as it goes, so memory does not grow with
+                the number of games. "legacy" queries the previous games of both teams for every game.
+                All produce the same dataset. Defaults to "vectorized".
+            use_feature_store (bool, optional): Whether to read the features from the feature store, computing and
+                storing them only for games without stored features. Only used by the vectorized method.
+                Defaults to False.
+            output_format (str, optional): "csv", "parquet", "arrow" (Arrow IPC) or "feather". Defaults to the format
+                matching the extension of output_path, or "csv". Columnar formats keep the dtypes, with float32
+                statistics and int16 counts, and include the league column.
+            columns (List[str], optional): Only write these columns. Defaults to all columns.
+            partition_by (List[str], optional): Write a columnar dataset partitioned by these columns, out of
+                "league" and "season", into the output_path directory. Defaults to None.
         Returns:
             None
         """
@@ -161,11 +213,57 @@ class MatchStatistics(BaseDataSetScrapper):
             raise ValueError(
                 "Exponential parameter must be specified for exponential Weights."
             )
+        elif method not in ["vectorized", "streaming", "legacy"]:
+            raise ValueError("method must be either vectorized, streaming or legacy")
+
+        output_format = infer_output_format(output_path, output_format)
+        if partition_by:
+            if output_format == "csv":
+                raise ValueError(
+                    "partition_by is only supported for parquet, arrow and feather outputs"
+                )
+            invalid = set(partition_by) - set(PARTITION_COLUMNS)
+            if invalid:
+                raise ValueError(
+                    f"Invalid partition columns {', '.join(sorted(invalid))}. Must be in {', '.join(PARTITION_COLUMNS)}"
+                )
+
+        if method == "streaming":
+            with DatasetWriter(output_path, output_format, partition_by) as writer:
+                for chunk in stream_dataset(
+                    self.session, lag, weights, params, rows_count
+                ):
+                    writer.write(
+                        self._arrange_columns(
+                            chunk, output_format, columns, partition_by
+                        )
+                    )
+            return
+
+        if method == "vectorized":
+            games = load_games(self.session)
+            if use_feature_store:
+                features = FeatureStore(self.session).load(
+                    lag, weights, params, games=games
+                )
+            else:
+                features = lagged_team_features(
+                    games, load_game_stats(self.session), lag, weights, params
+                )
+            self._save_dataset(
+                build_dataset(games, features, rows_count),
+                output_path,
+                output_format,
+                columns,
+                partition_by,
+            )
+            return
 
         query = self.session.query(Game).options(
             joinedload(Game.game_stats),
             joinedload(Game.home_team),
             joinedload(Game.away_team),
+            joinedload(Game.league),
         )
         if rows_count is not None:
             query = query.order_by(Game.date.desc()).limit(rows_count)
@@ -188,6 +286,7 @@ class MatchStatistics(BaseDataSetScrapper):
                 "away_goals": game.away_goals,
                 "home_points": game.home_team_points,
                 "away_points": game.away_team_points,
+                "league": game.league.name,
             }
 
             # Construct Lag
@@ -208,17 +307,71 @@ class MatchStatistics(BaseDataSetScrapper):
             game_data.append({**game_dict, **home_stat, **away_stat})
 
         # Convert to DataFrame and save to CSV
-        df = pd.DataFrame(game_data)
+        self._save_dataset(
+            pd.DataFrame(game_data), output_path, output_format, columns, partition_by
+        )
+
+    @staticmethod
+    def _save_dataset(
+        df: pd.DataFrame,
+        output_path: str,
+        output_format: str = "csv",
+        columns: Optional[List[str]] = None,
+        partition_by: Optional[List[str]] = None,
+    ):
+        """
+        Sort the dataset chronologically, move the target columns to the end and save it.
 
+        Args:
+            df (pd.DataFrame): The dataset.
+            output_path (str): The file path where the dataset will be saved.
+            output_format (str, optional): One of "csv", "parquet", "arrow" or "feather". Defaults to "csv".
+            columns (List[str], optional): Only write these columns. Defaults to all columns.
+            partition_by (List[str], optional): The columns to partition a columnar dataset by. Defaults to None.
+        """
         # Sort by date to maintain chronological order
         df = df.sort_values("date")
+        df = MatchStatistics._arrange_columns(df, output_format, columns, partition_by)
 
+        if output_format == "csv":
+            df.to_csv(output_path, index=False)
+        else:
+            write_columnar(df, output_path, output_format, partition_by)
+
+    @staticmethod
+    def _arrange_columns(
+        df: pd.DataFrame,
+        output_format: str = "csv",
+        columns: Optional[List[str]] = None,
+        partition_by: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Move the target columns to the end and keep the columns to save.
+
+        Args:
+            df (pd.DataFrame): The dataset, or a chunk of it.
+            output_format (str, optional): One of "csv", "parquet", "arrow" or "feather". Defaults to "csv".
+            columns (List[str], optional): Only keep these columns. Defaults to all columns.
+            partition_by (List[str], optional): The columns to partition a columnar dataset by. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The dataset with the columns to save.
+        """
         # Move Target Columns to the end
         target_columns = ["home_goals", "away_goals"]
         df = df[df.columns.drop(target_columns).tolist() + target_columns]
 
-        # Save to CSV
-        df.to_csv(output_path, index=False)
+        if columns:
+            unknown = [column for column in columns if column not in df.columns]
+            if unknown:
+                raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+            # Partition columns are stored in the directory names, so they are always kept.
+            keep = set(columns) | set(partition_by or [])
+            df = df[[column for column in df.columns if column in keep]]
+        elif output_format == "csv" and "league" in df.columns:
+            # The league column was added for partitioning, the CSV layout stays as it was.
+            df = df.drop(columns="league")
+        return df
 
     def match_statistic(self, season, team) -> List[Type[Game]]:
         """
@@ -275,24 +428,19 @@ class MatchStatistics(BaseDataSetScrapper):
         Returns:
             List[Game]: A list of Game objects that match the query.
         """
-        team = self.session.query(Team).filter(Team.name == team_name).first()
+        return load_game_dicts(self.session, self._team_games_criteria(team_name))
 
-        if not team:
-            raise ValueError(f"No team found with name: {team_name}")
-
-        games = (
-            self.session.query(Game)
-            .join(Team, or_(Game.home_team_id == Team.id, Game.away_team_id == Team.id))
-            .filter(Team.name == team_name)
-            .options(
-                joinedload(Game.home_team),
-                joinedload(Game.away_team),
-                joinedload(Game.game_stats),
-            )
+    def _team_games_criteria(self, team_name: str) -> list:
+        team_ids = (
+            self.session.execute(select(Team.id).where(Team.name == team_name))
+            .scalars()
             .all()
         )
 
-        return [game.to_dict(include_relationships=True) for game in games]
+        if not team_ids:
+            raise ValueError(f"No team found with name: {team_name}")
+
+        return [or_(Game.home_team_id.in_(team_ids), Game.away_team_id.in_(team_ids))]
 
     def get_total_game_count(self):
         """
@@ -318,21 +466,24 @@ class MatchStatistics(BaseDataSetScrapper):
         Returns:
             List[Game]: A list of Game objects that match the query.
         """
-        if not re.match(r"^\d{4}-\d{4}$", season):
-            raise ValueError(
-                "Invalid format for target_season. Please use 'YYYY-YYYY' (e.g., '2024-2025') with a regular hyphen."
-            )
-        games = (
-            self.session.query(Game)
-            .filter_by(season=season, match_week=match_week)
-            .all()
-        )
+        games = load_game_dicts(self.session, self._season_criteria(season, match_week))
 
         if not games:
             raise ValueError(
                 f"No games found for season: {season} and match week: {match_week}"
             )
-        return [game.to_dict(include_relationships=True) for game in games]
+        return games
+
+    @staticmethod
+    def _season_criteria(season: str, match_week: Optional[int]) -> list:
+        if not re.match(r"^\d{4}-\d{4}$", season):
+            raise ValueError(
+                "Invalid format for target_season. Please use 'YYYY-YYYY' (e.g., '2024-2025') with a regular hyphen."
+            )
+        criteria = [Game.season == season]
+        if match_week is not None:
+            criteria.append(Game.match_week == match_week)
+        return criteria
 
     def get_games_before_date(
         self, date: datetime, limit: int = 10, team: Optional[str] = None
@@ -348,18 +499,26 @@ class MatchStatistics(BaseDataSetScrapper):
         Returns:
             List[Game]: A list of Game objects before the given date, ordered by date descending.
         """
-        query = self.session.query(Game).filter(Game.date < date)
+        return load_game_dicts(
+            self.session,
+            self._games_before_date_criteria(date, team),
+            order_by=[Game.date.desc()],
+            limit=limit,
+        )
+
+    def _games_before_date_criteria(
+        self, date: datetime, team: Optional[str] = None
+    ) -> list:
+        criteria = [Game.date < date]
 
         if team:
             team_id = self.session.query(Team.id).filter_by(name=team).scalar()
             if not team_id:
                 raise ValueError(f"No team found with name: {team}")
-            query = query.filter(
+            criteria.append(
                 (Game.home_team_id == team_id) | (Game.away_team_id == team_id)
             )
-        games = query.order_by(Game.date.desc()).limit(limit).all()
-
-        return [game.to_dict(include_relationships=True) for game in games]
+        return criteria
 
     def get_game_stats_before_date(
         self, date: datetime, limit: int = 10, team: Optional[str] = None
@@ -375,22 +534,177 @@ class MatchStatistics(BaseDataSetScrapper):
             List[dict]: List of game statistics dictionaries with relationships included.
             Returns empty list if no results found.
         """
+        return load_game_stats_dicts(
+            self.session,
+            self._game_stats_before_date_criteria(date, team),
+            order_by=[Game.date.desc()],
+            limit=limit,
+        )
+
+    @staticmethod
+    def _game_stats_before_date_criteria(
+        date: datetime, team: Optional[str] = None
+    ) -> list:
         if not isinstance(date, datetime):
             raise ValueError("Date must be a datetime object")
 
-        query = self.session.query(GameStats).join(Game).filter(Game.date < date)
+        criteria = [Game.date < date]
 
         if team:
             team_alias = aliased(Team)
-            query = query.filter(
+            criteria.append(
                 exists().where(
                     (team_alias.id == GameStats.team_id) & (team_alias.name == team)
                 )
             )
+        return criteria
+
+    def iter_team_games(
+        self,
+        team_name: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        include_relationships: bool = True,
+        records: bool = False,
+    ) -> Iterator[Page]:
+        """
+        Page through the games of a team, oldest first, like get_team_games() without loading them all.
+
+        Every page is a single query resuming after the (date, id) of the last game of the previous page.
+        Its cursor can be handed back, e.g. by an API client, to continue the listing later.
+
+        Args:
+            team_name (str): The name of the team to filter games.
+            page_size (int, optional): The maximum number of games per page. Defaults to DEFAULT_PAGE_SIZE.
+            cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+            columns (List[str], optional): The game columns to include. Defaults to all columns.
+            include_relationships (bool, optional): Whether to include the teams, statistics and league of
+                every game. Defaults to True.
+            records (bool, optional): Whether to return every page as a NumPy record array. Requires
+                include_relationships=False. Defaults to False.
+
+        Returns:
+            Iterator[Page]: The pages of games, with the cursor of the next page.
+        """
+        return game_pages(
+            self.session,
+            self._team_games_criteria(team_name),
+            page_size=page_size,
+            cursor=cursor,
+            columns=columns,
+            include_relationships=include_relationships,
+            records=records,
+        )
+
+    def iter_games_by_season(
+        self,
+        season: str,
+        match_week: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        include_relationships: bool = True,
+        records: bool = False,
+    ) -> Iterator[Page]:
+        """
+        Page through the games of a season, or of one of its match weeks, oldest first.
+
+        Args:
+            season (str): The season to query (e.g., "2021-2022").
+            match_week (int, optional): The match week to filter games. Defaults to the whole season.
+            page_size (int, optional): The maximum number of games per page. Defaults to DEFAULT_PAGE_SIZE.
+            cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+            columns (List[str], optional): The game columns to include. Defaults to all columns.
+            include_relationships (bool, optional): Whether to include the teams, statistics and league of
+                every game. Defaults to True.
+            records (bool, optional): Whether to return every page as a NumPy record array. Requires
+                include_relationships=False. Defaults to False.
+
+        Returns:
+            Iterator[Page]: The pages of games, with the cursor of the next page.
+        """
+        return game_pages(
+            self.session,
+            self._season_criteria(season, match_week),
+            page_size=page_size,
+            cursor=cursor,
+            columns=columns,
+            include_relationships=include_relationships,
+            records=records,
+        )
 
-        stats = query.order_by(Game.date.desc()).limit(limit).all()
+    def iter_games_before_date(
+        self,
+        date: datetime,
+        team: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        include_relationships: bool = True,
+        records: bool = False,
+    ) -> Iterator[Page]:
+        """
+        Page through the games before a date, latest first, like get_games_before_date() without a limit.
 
-        return [stat.to_dict() for stat in stats] if stats else []
+        Args:
+            date (datetime): The reference date.
+            team (str, optional): The name of the team to filter games. Defaults to None.
+            page_size (int, optional): The maximum number of games per page. Defaults to DEFAULT_PAGE_SIZE.
+            cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+            columns (List[str], optional): The game columns to include. Defaults to all columns.
+            include_relationships (bool, optional): Whether to include the teams, statistics and league of
+                every game. Defaults to True.
+            records (bool, optional): Whether to return every page as a NumPy record array. Requires
+                include_relationships=False. Defaults to False.
+
+        Returns:
+            Iterator[Page]: The pages of games, with the cursor of the next page.
+        """
+        return game_pages(
+            self.session,
+            self._games_before_date_criteria(date, team),
+            page_size=page_size,
+            cursor=cursor,
+            descending=True,
+            columns=columns,
+            include_relationships=include_relationships,
+            records=records,
+        )
+
+    def iter_game_stats_before_date(
+        self,
+        date: datetime,
+        team: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        records: bool = False,
+    ) -> Iterator[Page]:
+        """
+        Page through the game statistics before a date, latest games first, like get_game_stats_before_date()
+        without a limit.
+
+        Args:
+            date (datetime): The reference date.
+            team (str, optional): The name of the team to filter statistics. Defaults to None.
+            page_size (int, optional): The maximum number of statistics per page. Defaults to DEFAULT_PAGE_SIZE.
+            cursor (str, optional): The cursor of a previous page to resume after. Defaults to the start.
+            columns (List[str], optional): The columns to include. Defaults to all columns.
+            records (bool, optional): Whether to return every page as a NumPy record array. Defaults to False.
+
+        Returns:
+            Iterator[Page]: The pages of statistics, with the cursor of the next page.
+        """
+        return game_stats_pages(
+            self.session,
+            self._game_stats_before_date_criteria(date, team),
+            page_size=page_size,
+            cursor=cursor,
+            descending=True,
+            columns=columns,
+            records=records,
+        )
 
     def get_future_match(self, league: str, team=None) -> Union[Dict, str]:
         """
@@ -411,7 +725,7 @@ class MatchStatistics(BaseDataSetScrapper):
         if not team:
 
             def process_func(result, **kwargs):
-                url = result.xpath(MATCHES.NEXT_MATCH_ROW)
+                url = MATCHES.NEXT_MATCH_ROW(result)
                 if len(url) == 0:
                     return "Current Season is finished! No more matches to play. For exiting games, please check the database. If they are not there. Run update_data_set(). Note: to extract match information from past games, please use get_games_before_date"
                 match = re.search(r"/teams/([a-f0-9]+)/([a-f0-9]+)/", url[0])
@@ -441,7 +755,7 @@ class MatchStatistics(BaseDataSetScrapper):
                 )
 
             def process_func(result, **kwargs):
-                urls = result.xpath(MATCHES.NEXT_MATCH_ROW)
+                urls = MATCHES.NEXT_MATCH_ROW(result)
                 if len(urls) == 0:
                     return (
                         "Current Season is finished! No more matches to play. For exiting games, "
@@ -481,7 +795,12 @@ class MatchStatistics(BaseDataSetScrapper):
         )[0]
         return result
 
-    def update_data_set(self):
+    def update_data_set(
+        self,
+        max_concurrency: int = 1,
+        parse_workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
         """
         Update the dataset by scraping new game data and updating league information.
         This Method will Take a Considerable amount of time to run due to rate limit restrictions.
@@ -493,6 +812,14 @@ class MatchStatistics(BaseDataSetScrapper):
             - Processes and adds new match details to the database.
             - Updates each league's up-to-date season and match week information.
 
+        Args:
+            max_concurrency (int, optional): The maximum number of requests in flight. Requests stay within
+                the rate limit of fbref regardless of this value. Defaults to 1 (sequential fetching).
+            parse_workers (int, optional): The number of threads parsing match pages while the next pages are
+                being fetched. Set to 0 to fetch and parse one page after the other. Defaults to 1.
+            batch_size (int, optional): The number of matches written to the database per transaction.
+                Defaults to DEFAULT_BATCH_SIZE.
+
         Returns:
             None
         """
@@ -517,26 +844,41 @@ class MatchStatistics(BaseDataSetScrapper):
                 self.urls.append(url)
 
         self.pages = self.scrape_and_process_all(
-            self.urls, rate_limit=4, desc="Fetching Season Schedule"
+            self.urls,
+            rate_limit=4,
+            desc="Fetching Season Schedule",
+            max_concurrency=max_concurrency,
         )
         relevant_urls = self._process_up_to_date_url()
-        filtered_urls = []
+        candidates = {}
         for url in relevant_urls:
-            game_id = re.search(r"/matches/([a-f0-9]+)/", url).group(1)
-            game = self.session.query(Game).filter_by(id=game_id).first()
-            if not game:
-                filtered_urls.append(url)
+            match = re.search(r"/matches/([a-f0-9]+)/", url)
+            if match:
+                candidates.setdefault(match.group(1), url)
+        stored = existing_game_ids(self.session, candidates)
+        filtered_urls = [
+            url for game_id, url in candidates.items() if game_id not in stored
+        ]
 
         if not filtered_urls:
             print("All Data is up to Date!")
             return
 
-        self.scrape_and_process_all(
-            filtered_urls,
-            rate_limit=4,
-            desc="Fetching Match Details",
-            process_func=self._process_data,
-        )
+        ingestor = MatchIngestor(self.session, PARSER_VERSION, batch_size=batch_size)
+        try:
+            self.scrape_and_process_all(
+                filtered_urls,
+                rate_limit=4,
+                desc="Fetching Match Details",
+                parse_func=self._parse_match_page,
+                process_func=ingestor.add,
+                max_concurrency=max_concurrency,
+                persist=True,
+                parse_workers=parse_workers,
+            )
+        finally:
+            # Keep the matches fetched before an interruption.
+            ingestor.flush()
         latest_seasons = (
             self.session.query(League.name, func.max(Game.season).label("max_season"))
             .join(Game)
@@ -580,7 +922,7 @@ class MatchStatistics(BaseDataSetScrapper):
         Returns:
             List[str]: A list of fully qualified URLs for match reports that need processing.
         """
-        title_map = self.process_xpath("//h1//text()", show_progress=False)
+        title_map = self.process_xpath(MATCHES.PAGE_TITLE, show_progress=False)
         leagues_dict = {league[0]: (league[1], league[2]) for league in self.leagues}
         all_urls = []
         for index, page in enumerate(self.pages):
@@ -588,7 +930,7 @@ class MatchStatistics(BaseDataSetScrapper):
             pattern = r"(\d{4}-\d{4})\s+(.*?)\s+Scores"
             match = re.search(pattern, title)
 
-            relevant_xpath = MATCHES.match_report_url()
+            match_week = 1
             if match:
                 season = match.group(1)
                 league = match.group(2)
@@ -600,12 +942,13 @@ class MatchStatistics(BaseDataSetScrapper):
                     league = "EFL Championship"
 
                 if season == leagues_dict[league][0]:
-                    relevant_xpath = MATCHES.match_report_url(
-                        match_week=leagues_dict[league][1]
-                    )
+                    match_week = leagues_dict[league][1]
 
             all_urls.extend(
-                [f"https://fbref.com{url}" for url in page.xpath(relevant_xpath)]
+                [
+                    f"https://fbref.com{url}"
+                    for url in MATCHES.MATCH_REPORT_URL(page, match_week=match_week)
+                ]
             )
         return all_urls
 
@@ -628,48 +971,9 @@ class MatchStatistics(BaseDataSetScrapper):
             return result, url
         return None
 
-    @staticmethod
-    def _return_by_position_data(table) -> tuple:
-        """
-        Process a DataFrame of player positions and group the data by primary position.
-
-        Splits the 'Pos' column to extract the primary position and assigns players to
-        specific position groups: forwards (ST), midfielders (MF), defenders (DF), and an aggregate group.
-
-        Args:
-            table (pd.DataFrame): A DataFrame containing player statistics with a 'Pos' column.
-
-        Returns:
-            tuple: A tuple containing DataFrames for forwards (FW), midfielders (MF), defenders (DF),
-                   and an aggregate DataFrame.
-        """
-        table["Primary_Position"] = table["Pos"].str.split(",").str[0]
-        table["Position_Group"] = table["Primary_Position"].apply(
-            lambda x: (
-                "ST"
-                if any(pos in str(x) for pos in ["FW", "LW", "RW", "AM"])
-                else (
-                    "MF"
-                    if any(pos in str(x) for pos in ["CM", "DM", "RM", "LM"])
-                    else (
-                        "DF"
-                        if any(pos in str(x) for pos in ["CB", "LB", "RB"])
-                        else "GK"
-                        if "GK" in str(x)
-                        else "Total"
-                    )
-                )
-            )
-        )
-        grouped_players = table.groupby("Position_Group")
-        FW = grouped_players.get_group("ST")
-        MF = grouped_players.get_group("MF")
-        DF = grouped_players.get_group("DF")
-        aggregate = grouped_players.get_group("Total")
-        return FW, MF, DF, aggregate
-
+    @classmethod
     def _fetch_corresponding_data_from_table(
-        self,
+        cls,
         summary_table: pd.DataFrame,
         passing_table: pd.DataFrame,
         defence_table: pd.DataFrame,
@@ -682,7 +986,8 @@ class MatchStatistics(BaseDataSetScrapper):
         Extract and aggregate game statistics from multiple DataFrame tables.
 
         Processes tables containing summary, passing, defensive, possession, miscellaneous,
-        and goalkeeper statistics. Aggregates relevant metrics and returns a dictionary of computed values.
+        and goalkeeper statistics. Aggregates the metrics of GAME_STATS_SPEC by position group
+        and returns a dictionary of computed values.
 
         Args:
             summary_table (pd.DataFrame): DataFrame containing summary statistics.
@@ -696,191 +1001,36 @@ class MatchStatistics(BaseDataSetScrapper):
         Returns:
             dict: A dictionary containing aggregated game statistics.
         """
-        data = {}
-
-        (
-            ST_summary,
-            MF_summary,
-            DF_summary,
-            aggregate_summary,
-        ) = self._return_by_position_data(summary_table)
-        data.update(
-            {
-                "xG": aggregate_summary["xG"].sum().item(),
-                "xAG": aggregate_summary["xAG"].sum().item(),
-                "shots_total_FW": ST_summary["Sh"].sum().item(),
-                "shots_total_MF": MF_summary["Sh"].sum().item(),
-                "shots_total_DF": DF_summary["Sh"].sum().item(),
-                "shots_on_target_FW": ST_summary["SoT"].sum().item(),
-                "shots_on_target_MF": MF_summary["SoT"].sum().item(),
-                "shots_on_target_DF": DF_summary["SoT"].sum().item(),
-                "shot_creating_chances_FW": ST_summary["SCA"].sum().item(),
-                "shot_creating_chances_MF": MF_summary["SCA"].sum().item(),
-                "shot_creating_chances_DF": DF_summary["SCA"].sum().item(),
-                "goal_creating_actions_FW": ST_summary["GCA"].sum().item(),
-                "goal_creating_actions_MF": MF_summary["GCA"].sum().item(),
-                "goal_creating_actions_DF": DF_summary["GCA"].sum().item(),
-            }
-        )
-
-        (
-            ST_passing,
-            MF_passing,
-            DF_passing,
-            aggregate_passing,
-        ) = self._return_by_position_data(passing_table)
-        data.update(
-            {
-                "passes_completed_FW": ST_passing["Cmp"].sum().item(),
-                "passes_completed_MF": MF_passing["Cmp"].sum().item(),
-                "passes_completed_DF": DF_passing["Cmp"].sum().item(),
-                "xA": aggregate_passing["xA"].sum().item(),
-                "pass_completion_percentage_FW": ST_passing["Cmp%"].mean(),
-                "pass_completion_percentage_MF": MF_passing["Cmp%"].mean(),
-                "pass_completion_percentage_DF": DF_passing["Cmp%"].mean(),
-                "key_passes": aggregate_passing["KP"].sum().item(),
-                "passes_into_final_third": aggregate_passing["1/3"].sum().item(),
-                "passes_into_penalty_area": aggregate_passing["PPA"].sum().item(),
-                "crosses_into_penalty_area": aggregate_passing["CrsPA"].sum().item(),
-                "progressive_passes": aggregate_passing["PrgP"].sum().item(),
-            }
-        )
-
-        (
-            ST_defence,
-            MF_defence,
-            DF_defence,
-            aggregate_defence,
-        ) = self._return_by_position_data(defence_table)
-        data.update(
-            {
-                "tackles_won_FW": ST_defence["TklW"].sum().item(),
-                "tackles_won_MF": MF_defence["TklW"].sum().item(),
-                "tackles_won_DF": DF_defence["TklW"].sum().item(),
-                "dribblers_challenged_won_FW": ST_defence["Tkl.1"].sum().item(),
-                "dribblers_challenged_won_MF": MF_defence["Tkl.1"].sum().item(),
-                "dribblers_challenged_won_DF": DF_defence["Tkl.1"].sum().item(),
-                "blocks_FW": ST_defence["Blocks"].sum().item(),
-                "blocks_MF": MF_defence["Blocks"].sum().item(),
-                "blocks_DF": DF_defence["Blocks"].sum().item(),
-                "interceptions_FW": ST_defence["Int"].sum().item(),
-                "interceptions_MF": MF_defence["Int"].sum().item(),
-                "interceptions_DF": DF_defence["Int"].sum().item(),
-                "clearances_FW": ST_defence["Clr"].sum().item(),
-                "clearances_MF": MF_defence["Clr"].sum().item(),
-                "clearances_DF": DF_defence["Clr"].sum().item(),
-                "errors_leading_to_goal": aggregate_defence["Err"].sum().item(),
-            }
-        )
-
-        (
-            ST_possession,
-            MF_possession,
-            DF_possession,
-            aggregate_possession,
-        ) = self._return_by_position_data(possession_table)
-        data.update(
-            {
-                "possession_rate": possession,
-                "touches_FW": ST_possession["Touches"].sum().item(),
-                "touches_MF": MF_possession["Touches"].sum().item(),
-                "touches_DF": DF_possession["Touches"].sum().item(),
-                "touches_att_pen_area_FW": ST_possession["Att Pen"].sum().item(),
-                "touches_att_pen_area_MF": MF_possession["Att Pen"].sum().item(),
-                "touches_att_pen_area_DF": DF_possession["Att Pen"].sum().item(),
-                "take_ons_FW": ST_possession["Att"].sum().item(),
-                "take_ons_MF": MF_possession["Att"].sum().item(),
-                "take_ons_DF": DF_possession["Att"].sum().item(),
-                "successful_take_ons_FW": ST_possession["Succ"].sum().item(),
-                "successful_take_ons_MF": MF_possession["Succ"].sum().item(),
-                "successful_take_ons_DF": DF_possession["Succ"].sum().item(),
-                "carries_FW": ST_possession["Carries"].sum().item(),
-                "carries_MF": MF_possession["Carries"].sum().item(),
-                "carries_DF": DF_possession["Carries"].sum().item(),
-                "total_carrying_distance_FW": ST_possession["TotDist"].sum().item(),
-                "total_carrying_distance_MF": MF_possession["TotDist"].sum().item(),
-                "total_carrying_distance_DF": DF_possession["TotDist"].sum().item(),
-                "dispossessed_FW": ST_possession["Dis"].sum().item(),
-                "dispossessed_MF": MF_possession["Dis"].sum().item(),
-                "dispossessed_DF": DF_possession["Dis"].sum().item(),
-                "miss_controlled_FW": ST_possession["Mis"].sum().item(),
-                "miss_controlled_MF": MF_possession["Mis"].sum().item(),
-                "miss_controlled_DF": DF_possession["Mis"].sum().item(),
-                "carries_into_penalty_area": aggregate_possession["CPA"].sum().item(),
-            }
-        )
-
-        (
-            ST_miscellaneous,
-            MF_miscellaneous,
-            DF_miscellaneous,
-            aggregate_miscellaneous,
-        ) = self._return_by_position_data(miscellaneous_table)
-        data.update(
-            {
-                "fouls_committed_FW": ST_miscellaneous["Fls"].sum().item(),
-                "fouls_committed_MF": MF_miscellaneous["Fls"].sum().item(),
-                "fouls_committed_DF": DF_miscellaneous["Fls"].sum().item(),
-                "fouls_drawn_FW": ST_miscellaneous["Fld"].sum().item(),
-                "fouls_drawn_MF": MF_miscellaneous["Fld"].sum().item(),
-                "fouls_drawn_DF": DF_miscellaneous["Fld"].sum().item(),
-                "offside_FW": ST_miscellaneous["Off"].sum().item(),
-                "offside_MF": MF_miscellaneous["Off"].sum().item(),
-                "offside_DF": DF_miscellaneous["Off"].sum().item(),
-                "pens_won": aggregate_miscellaneous["PKwon"].sum().item(),
-                "pens_conceded": aggregate_miscellaneous["PKcon"].sum().item(),
-                "aerials_won_FW": ST_miscellaneous["Won"].sum().item(),
-                "aerials_won_MF": MF_miscellaneous["Won"].sum().item(),
-                "aerials_won_DF": DF_miscellaneous["Won"].sum().item(),
-                "aerials_lost_FW": ST_miscellaneous["Lost"].sum().item(),
-                "aerials_lost_MF": MF_miscellaneous["Lost"].sum().item(),
-                "aerials_lost_DF": DF_miscellaneous["Lost"].sum().item(),
-                "yellow_card": aggregate_miscellaneous["CrdY"].sum().item(),
-                "red_card": aggregate_miscellaneous["CrdR"].sum().item(),
-            }
-        )
-        data.update(
+        data = aggregate_team_stats(
             {
-                "save_percentage": goal_keeper_table["Save%"].mean(),
-                "saves": goal_keeper_table["Saves"].sum().item(),
-                "PSxG": goal_keeper_table["PSxG"].sum().item(),
-                "passes_completed_GK": goal_keeper_table["Att (GK)"].sum().item(),
-                "passes_40_yard_completed_GK": goal_keeper_table["Cmp"].sum().item(),
-                "crosses_stopped": goal_keeper_table["Stp"].sum().item(),
+                "summary": summary_table,
+                "passing": passing_table,
+                "defence": defence_table,
+                "possession": possession_table,
+                "miscellaneous": miscellaneous_table,
+                "goal_keeper": goal_keeper_table,
             }
         )
-
+        data["possession_rate"] = possession
         return data
 
-    def _process_data(self, page, **kwargs):
+    @classmethod
+    def _parse_match_page(cls, page, url: str) -> Optional[dict]:
         """
-        Process a scraped match page to extract and store game and statistics data.
-
-        Extracts game information such as teams, scores, match date/time, and detailed statistics from various tables.
-        If the game data does not exist in the database, it creates new records for the league, teams, game,
-        and the associated game statistics.
+        Parse a match page into plain game and statistics data, without touching the database.
 
         Args:
-            page: The scraped HTML page (as an lxml element) containing match data.
-            **kwargs: Additional keyword arguments, including:
-                      - url (str): The URL of the page being processed.
+            page: The HTML page (as an lxml element) containing match data.
+            url (str): The URL of the page.
 
         Returns:
-            None
-
-        Raises:
-            Exception: If an error occurs while adding match data to the database.
+            Optional[dict]: The game, teams and statistics of both teams, or None if the page could not be parsed.
         """
         try:
-            url = kwargs.get("url")
             game_id = re.search(r"/matches/([a-f0-9]+)/", url).group(1)
 
-            game = self.session.query(Game).filter_by(id=game_id).first()
-            if game:
-                return
-
             try:
-                league_name, match_week_unrefined = page.xpath(MATCHES.GAME_HEADER)[0:2]
+                league_name, match_week_unrefined = MATCHES.GAME_HEADER(page)[0:2]
                 match_week = int(
                     re.search(r"Matchweek (\d+)", match_week_unrefined).group(1)
                 )
@@ -888,162 +1038,171 @@ class MatchStatistics(BaseDataSetScrapper):
                 league_name = "Major League Soccer"
                 match_week = 0
 
-            home_stats, away_stats = page.xpath(MATCHES.GAME_STATS)[0:2]
-            home_team_name = home_stats.xpath(MATCHES.A_TAG)[0]
+            home_stats, away_stats, match_info = MATCHES.GAME_STATS(page)[0:3]
+            home_team_name = MATCHES.A_TAG(home_stats)[0]
             home_team_id = re.search(
-                r"/squads/([^/]+)/", home_stats.xpath(".//a//@href")[0]
+                r"/squads/([^/]+)/", MATCHES.A_HREF(home_stats)[0]
             ).group(1)
-            away_team_name = away_stats.xpath(MATCHES.A_TAG)[0]
+            away_team_name = MATCHES.A_TAG(away_stats)[0]
             away_team_id = re.search(
-                r"/squads/([^/]+)/", away_stats.xpath(".//a//@href")[0]
+                r"/squads/([^/]+)/", MATCHES.A_HREF(away_stats)[0]
             ).group(1)
-            home_team_record = home_stats.xpath("./div")[2].text
+            home_team_record = MATCHES.CHILD_DIVS(home_stats)[2].text
             home_team_points = sum(
                 x * y
                 for x, y in zip(
                     (3, 1, 0), (int(n) for n in home_team_record.split("-"))
                 )
             )
-            away_team_record = away_stats.xpath("./div")[2].text
+            away_team_record = MATCHES.CHILD_DIVS(away_stats)[2].text
             away_team_points = sum(
                 x * y
                 for x, y in zip(
                     (3, 1, 0), (int(n) for n in away_team_record.split("-"))
                 )
             )
-            match_info = page.xpath(MATCHES.GAME_STATS)[2]
-            match_date = match_info.xpath("./div")[0].xpath(MATCHES.GAME_VENUE_DATE)[0]
+            venue = MATCHES.CHILD_DIVS(match_info)[0]
+            match_date = MATCHES.GAME_VENUE_DATE(venue)[0]
             current_year = int(match_date.split("-")[0])
             current_season = (
                 f"{current_year - 1}-{current_year}"
                 if int(match_date.split("-")[1]) < 8
                 else f"{current_year}-{current_year + 1}"
             )
-            match_venue_time = match_info.xpath("./div")[0].xpath(
-                MATCHES.GAME_VENUE_TIME
-            )[0]
+            match_venue_time = MATCHES.GAME_VENUE_TIME(venue)[0]
             match_time = datetime.strptime(
                 f"{match_date} {match_venue_time}", "%Y-%m-%d %H:%M"
             )
-            home_goals = int(home_stats.xpath(MATCHES.GAME_GOALS)[0])
-            away_goals = int(away_stats.xpath(MATCHES.GAME_GOALS)[0])
-
-            tables = page.xpath("//table")
-            home_possession = int(
-                pd.read_html(etree.tostring(tables[2]), header=1)[0]
-                .iloc[0]
-                .iat[0]
-                .replace("%", "")
+            home_goals = int(MATCHES.GAME_GOALS(home_stats)[0])
+            away_goals = int(MATCHES.GAME_GOALS(away_stats)[0])
+
+            tables = MATCHES.GAME_TABLE(page)
+            home_possession, away_possession = read_possession(tables[2])
+
+            team_data_one = cls._fetch_corresponding_data_from_table(
+                summary_table=read_stat_table(tables[3]),
+                passing_table=read_stat_table(tables[4]),
+                defence_table=read_stat_table(tables[6]),
+                possession_table=read_stat_table(tables[7]),
+                miscellaneous_table=read_stat_table(tables[8]),
+                goal_keeper_table=read_stat_table(tables[9]),
+                possession=home_possession,
             )
-            away_possession = int(
-                pd.read_html(etree.tostring(tables[2]), header=1)[0]
-                .iloc[0]
-                .iat[1]
-                .replace("%", "")
-            )
-            summary_table = pd.read_html(etree.tostring(tables[3]), header=1)[0]
-            passing_table = pd.read_html(etree.tostring(tables[4]), header=1)[0]
-            defence_table = pd.read_html(etree.tostring(tables[6]), header=1)[0]
-            possession_table = pd.read_html(etree.tostring(tables[7]), header=1)[0]
-            miscellaneous_table = pd.read_html(etree.tostring(tables[8]), header=1)[0]
-            goal_keeper_table = pd.read_html(etree.tostring(tables[9]), header=1)[0]
-
-            team_data_one = self._fetch_corresponding_data_from_table(
-                summary_table,
-                passing_table,
-                defence_table,
-                possession_table,
-                miscellaneous_table,
-                goal_keeper_table,
-                home_possession,
-            )
-
-            summary_table = pd.read_html(etree.tostring(tables[10]), header=1)[0]
-            passing_table = pd.read_html(etree.tostring(tables[11]), header=1)[0]
-            defence_table = pd.read_html(etree.tostring(tables[13]), header=1)[0]
-            possession_table = pd.read_html(etree.tostring(tables[14]), header=1)[0]
-            miscellaneous_table = pd.read_html(etree.tostring(tables[15]), header=1)[0]
-            goal_keeper_table = pd.read_html(etree.tostring(tables[16]), header=1)[0]
-
-            team_data_two = self._fetch_corresponding_data_from_table(
-                summary_table,
-                passing_table,
-                defence_table,
-                possession_table,
-                miscellaneous_table,
-                goal_keeper_table,
-                away_possession,
+            team_data_two = cls._fetch_corresponding_data_from_table(
+                summary_table=read_stat_table(tables[10]),
+                passing_table=read_stat_table(tables[11]),
+                defence_table=read_stat_table(tables[13]),
+                possession_table=read_stat_table(tables[14]),
+                miscellaneous_table=read_stat_table(tables[15]),
+                goal_keeper_table=read_stat_table(tables[16]),
+                possession=away_possession,
             )
         except Exception as e:
             print(f"Error processing match data: {str(e)}")
             print("Error URL: ", url)
-            return
+            return None
 
-        try:
-            league = self.session.query(League).filter_by(name=league_name).first()
-            if not league:
-                league = League(
-                    name=league_name,
-                    up_to_date_season="2018-2019",
-                    up_to_date_match_week=match_week,
-                )
-                self.session.add(league)
-                self.session.flush()
+        return {
+            "league": {"name": league_name, "match_week": match_week},
+            "home_team": {"id": home_team_id, "name": home_team_name},
+            "away_team": {"id": away_team_id, "name": away_team_name},
+            "game": {
+                "id": game_id,
+                "home_team_id": home_team_id,
+                "away_team_id": away_team_id,
+                "home_team_points": home_team_points,
+                "away_team_points": away_team_points,
+                "home_goals": home_goals,
+                "away_goals": away_goals,
+                "date": match_time,
+                "match_week": match_week,
+                "season": current_season,
+            },
+            "home_stats": team_data_one,
+            "away_stats": team_data_two,
+        }
+
+    def reprocess_archive(
+        self,
+        max_workers: Optional[int] = None,
+        force=False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Rebuild games from the match pages kept in the page store, without any network access.
 
-            home_team = (
-                self.session.query(Team)
-                .filter_by(
-                    id=home_team_id,
-                )
-                .first()
-            )
-            if not home_team:
-                home_team = Team(
-                    id=home_team_id, name=home_team_name, league_id=league.id
-                )
-                self.session.add(home_team)
+        Only archived games that are missing from the database, or that were parsed by an older
+        PARSER_VERSION, are rebuilt (unless force is set). Pages are parsed in a process pool and
+        the results are written to the database from the calling process, batch_size games per transaction.
 
-            away_team = (
-                self.session.query(Team)
-                .filter_by(
-                    id=away_team_id,
-                )
-                .first()
-            )
-            if not away_team:
-                away_team = Team(
-                    id=away_team_id, name=away_team_name, league_id=league.id
+        Args:
+            max_workers (int, optional): The number of parser processes. Defaults to the number of CPUs.
+                With 1, pages are parsed in the calling process.
+            force (bool, optional): Whether to rebuild every archived game regardless of its parser version.
+                Defaults to False.
+            batch_size (int, optional): The number of games written to the database per transaction.
+                Defaults to DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: The number of games rebuilt.
+        """
+        archived = {}
+        for url in self.page_store.urls():
+            match = re.search(r"/matches/([a-f0-9]+)/", url)
+            if match:
+                archived[match.group(1)] = url
+
+        if not force:
+            up_to_date = {
+                game_id
+                for (game_id,) in self.session.query(GameParse.game_id).filter(
+                    GameParse.parser_version >= PARSER_VERSION
                 )
-                self.session.add(away_team)
-
-            self.session.flush()
-
-            game = Game(
-                id=game_id,
-                home_team_id=home_team.id,
-                away_team_id=away_team.id,
-                league_id=league.id,
-                home_team_points=home_team_points,
-                away_team_points=away_team_points,
-                home_goals=home_goals,
-                away_goals=away_goals,
-                date=match_time,
-                match_week=match_week,
-                season=current_season,
-            )
-            self.session.add(game)
-            self.session.flush()
+            }
+            archived = {
+                game_id: url
+                for game_id, url in archived.items()
+                if game_id not in up_to_date
+            }
 
-            home_statistics = GameStats(
-                game_id=game.id, team_id=home_team.id, **team_data_one
-            )
-            away_statistics = GameStats(
-                game_id=game.id, team_id=away_team.id, **team_data_two
-            )
-            self.session.add(home_statistics)
-            self.session.add(away_statistics)
+        if not archived:
+            print("All archived games are up to date!")
+            return 0
 
-            self.session.commit()
-        except Exception as e:
-            self.session.rollback()
-            raise Exception(f"Error adding match data: {str(e)}")
+        urls = list(archived.values())
+        ingestor = MatchIngestor(
+            self.session, PARSER_VERSION, batch_size=batch_size, replace=True
+        )
+        with tqdm(total=len(urls), desc="Reprocessing Archive") as pbar:
+            if max_workers == 1:
+                # Parsed with the page store of the instance, leaving the worker globals unset.
+                results = (_parse_archived_page(url, self.page_store) for url in urls)
+                return ingestor.add_all(self._track_progress(results, pbar))
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_archive_worker,
+                initargs=(self.page_store.root,),
+            ) as executor:
+                results = executor.map(_parse_archived_page, urls, chunksize=4)
+                return ingestor.add_all(self._track_progress(results, pbar))
+
+    @staticmethod
+    def _track_progress(results, pbar):
+        for result in results:
+            pbar.update(1)
+            yield result
+
+
+_archive_store: Optional[PageStore] = None
+
+
+def _init_archive_worker(root):
+    global _archive_store
+    _archive_store = PageStore(root)
+
+
+def _parse_archived_page(url: str, store: Optional[PageStore] = None) -> Optional[dict]:
+    html = (store or _archive_store).get(url)
+    if html is None:
+        return None
+    return MatchStatistics._parse_match_page(etree.HTML(html), url)
@@ -0,0 +1,110 @@
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.xpath import MATCHES
+
+_INTEGER = re.compile(r"[+-]?\d+")
+
+
+def _text(cell) -> str:
+    return "".join(cell.itertext()).strip()
+
+
+def _column_labels(header_cells) -> List[str]:
+    # Duplicated labels are numbered like pandas does, e.g. the second "Tkl" becomes "Tkl.1".
+    labels, seen = [], {}
+    for cell in header_cells:
+        label = _text(cell)
+        count = seen.get(label, 0)
+        seen[label] = count + 1
+        labels.append(f"{label}.{count}" if count else label)
+    return labels
+
+
+def _typed_column(texts: List[Optional[str]]) -> np.ndarray:
+    """
+    Convert the cell texts of a column to an int64 or float64 array if every cell is numeric or empty,
+    or to an object array of strings (with NaN for empty cells) otherwise.
+    """
+    values = [text.replace(",", "") if text else None for text in texts]
+    present = [value for value in values if value is not None]
+    if present and all(_INTEGER.fullmatch(value) for value in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=np.int64)
+        return np.array(
+            [np.nan if value is None else value for value in values], dtype=np.float64
+        )
+    try:
+        return np.array(
+            [np.nan if value is None else float(value) for value in values],
+            dtype=np.float64,
+        )
+    except ValueError:
+        return np.array(
+            [np.nan if text is None else text for text in texts], dtype=object
+        )
+
+
+def read_stat_table(table) -> pd.DataFrame:
+    """
+    Read an fbref player statistics table from its parsed lxml element.
+
+    Columns are labelled by the last header row, and the cells of every row are looked up by the data-stat
+    of their header (or by position for headers without one). The footer row holding the team totals comes
+    last. The result matches pd.read_html(etree.tostring(table), header=1)[0] without serialising the table
+    back to HTML and parsing it again.
+
+    Args:
+        table: The lxml table element.
+
+    Returns:
+        pd.DataFrame: One row per player, then the totals, with int64 or float64 columns for numeric statistics.
+
+    Raises:
+        ValueError: If the table has no header row.
+    """
+    header_cells = MATCHES.TABLE_HEADER_CELLS(table)
+    if not header_cells:
+        raise ValueError("Statistics table has no header row")
+    labels = _column_labels(header_cells)
+    stats = [cell.get("data-stat") for cell in header_cells]
+
+    texts = [[] for _ in labels]
+    for row in MATCHES.TABLE_BODY_ROWS(table) + MATCHES.TABLE_FOOT_ROWS(table):
+        cells = MATCHES.TABLE_ROW_CELLS(row)
+        by_stat = {cell.get("data-stat"): cell for cell in cells}
+        for index, stat in enumerate(stats):
+            if stat is not None:
+                cell = by_stat.get(stat)
+            else:
+                cell = cells[index] if index < len(cells) else None
+            text = _text(cell) if cell is not None else ""
+            texts[index].append(text or None)
+
+    return pd.DataFrame(
+        {label: _typed_column(column) for label, column in zip(labels, texts)},
+        columns=labels,
+    )
+
+
+def read_possession(table) -> Tuple[int, int]:
+    """
+    Read the possession of both teams from the team statistics table of a match page.
+
+    Args:
+        table: The lxml element of the team statistics table.
+
+    Returns:
+        Tuple[int, int]: The possession percentages of the home and away teams.
+
+    Raises:
+        ValueError: If the table has no possession row.
+    """
+    cells = MATCHES.TABLE_POSSESSION(table)
+    if len(cells) < 2:
+        raise ValueError("Team statistics table has no possession row")
+    home, away = (_text(cell).replace("%", "") for cell in cells[:2])
+    return int(home), int(away)
@@ -30,6 +30,7 @@ class PlayerSeasonLeaders(BaseScrapper):
         target_season: Optional[str] = None,
         league: Optional[str] = "Premier League",
         cache: Optional[bool] = True,
+        parser: Literal["lxml", "html.parser"] = "lxml",
     ):
         """
         Initialize the PlayerSeasonLeaders object.
@@ -38,6 +39,8 @@ class PlayerSeasonLeaders(BaseScrapper):
             stat_type (Literal['G', 'A']): The type of statistic to scrape ('G' for goals, 'A' for assists).
             target_season (str, optional): The specific season to scrape data for. Defaults to None.
             league (str, optional): The league to scrape data for. Defaults to "Premier League".
+            parser (str, optional): The parser for the web page. Use "html.parser" for malformed pages.
+                Defaults to "lxml".
         """
         self.league = league
         self.stat_type = stat_type
@@ -48,6 +51,7 @@ class PlayerSeasonLeaders(BaseScrapper):
             target_season=target_season,
             season_limit=self.season_limit,
             cache=cache,
+            parser=parser,
         )
         self.page = self.request_url_page()
         self._season_top_players_list = self._init_top_stats_table()
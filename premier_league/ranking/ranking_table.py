@@ -1,7 +1,14 @@
 import os
 import re
 import traceback
-from typing import Optional, Union
+import unicodedata
+from datetime import date as Date
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Literal, Optional, Union
+
+from lxml import etree
+from sqlalchemy.orm import Session
 
 from premier_league.base import BaseScrapper
 
@@ -14,6 +21,31 @@ from ..utils.methods import (
 )
 from ..utils.url import RANKING_URL
 from ..utils.xpath import RANKING
+from .standings import standings_table
+
+# The names of the RANKING_URL leagues in the league table of the match database.
+STORED_LEAGUE_NAMES = {
+    "premier league": "Premier League",
+    "la liga": "La Liga",
+    "serie a": "Serie A",
+    "ligue 1": "Ligue 1",
+    "bundesliga": "Fußball-Bundesliga",
+}
+
+_TEAM_NAME_SUFFIXES = {"fc", "afc", "cf"}
+_TEAM_NAME_ALIASES = {"utd": "united"}
+
+
+def _team_name_tokens(name: str) -> list:
+    # "Brighton & Hove Albion F.C." -> ["brighton", "hove", "albion"], "Nott'ham Forest" -> ["nottham", "forest"]
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char)).lower()
+    name = re.sub(r"['.]", "", name)
+    return [
+        _TEAM_NAME_ALIASES.get(token, token)
+        for token in re.split(r"[^a-z0-9]+", name)
+        if token and token not in _TEAM_NAME_SUFFIXES
+    ]
 
 
 class RankingTable(BaseScrapper):
@@ -26,7 +58,7 @@ class RankingTable(BaseScrapper):
     Attributes:
         season (str): The current season.
         target_season (str): The specific season to scrape data for, if provided.
-        page: The scraped web page containing the ranking data.
+        page: The scraped web page containing the ranking data. None when the table comes from the database.
         ranking_list (list): The processed ranking data.
     """
 
@@ -35,6 +67,10 @@ class RankingTable(BaseScrapper):
         league: Optional[str] = "Premier League",
         target_season: Optional[str] = None,
         cache: Optional[bool] = True,
+        parser: Literal["lxml", "html.parser"] = "lxml",
+        session: Optional[Session] = None,
+        match_week: Optional[int] = None,
+        date: Optional[Union[datetime, Date]] = None,
     ):
         """
         Initialize the RankingTable instance.
@@ -43,17 +79,40 @@ class RankingTable(BaseScrapper):
             target_season (str, optional): The specific season to scrape data for.
                                            If not provided, the current season is used.
             league (str, optional): The league to scrape data for. Defaults to "Premier League".
+            parser (str, optional): The parser for the web page. Use "html.parser" for malformed pages.
+                                    Defaults to "lxml".
+            session (Session, optional): A match database session (e.g. MatchStatistics().session). The table
+                                    of a season with games in the database is computed from them instead of
+                                    being scraped. Defaults to None.
+            match_week (int, optional): Compute the table as of this match week. Requires session.
+            date (Union[datetime, date], optional): Compute the table as of this date. Requires session.
         """
+        if session is None and (match_week is not None or date is not None):
+            raise ValueError("match_week and date require a database session")
         self.league = league.title() if league else "Premier League"
         super().__init__(
             RANKING_URL.get(league=self.league.lower(), target_season=target_season),
             target_season=target_season,
             season_limit=self.find_season_limit(),
             cache=cache,
+            parser=parser,
         )
+        self.cache = cache
+
+        if session is not None:
+            start = int(self.season[:4])
+            self.ranking_list = standings_table(
+                session,
+                STORED_LEAGUE_NAMES[self.league.lower()],
+                f"{start}-{start + 1}",
+                match_week,
+                date,
+            )
+            if len(self.ranking_list) > 1 or match_week is not None or date is not None:
+                return
+
         self.page = self.request_url_page()
         self.ranking_list = self._init_ranking_table()
-        self.cache = cache
 
     def _init_ranking_table(self) -> list:
         """
@@ -222,18 +281,18 @@ class RankingTable(BaseScrapper):
         ]
         if self.target_season is not None:
             domestic_and_european_winners = self._find_european_competition_spot()
-            for index, team in enumerate(all_current_teams, start=1):
-                for tournament, winner in domestic_and_european_winners.items():
-                    if tournament == "EFL" and winner == team:
-                        m_conference = index
-                    elif tournament == "FA" and winner == team:
-                        m_europa.append(index)
-                    elif tournament == "CL" and winner == team:
-                        m_champions.append(index)
-                    elif tournament == "UEL" and winner == team:
-                        m_champions.append(index)
-                    elif tournament == "UECL" and winner == team:
-                        m_europa.append(index)
+            for tournament, winner in domestic_and_european_winners.items():
+                index = self._team_row(winner) if winner else None
+                if index is None:
+                    continue
+                if tournament == "EFL":
+                    m_conference = index
+                elif tournament in ("FA", "UECL"):
+                    m_europa.append(index)
+                elif tournament in ("CL", "UEL"):
+                    m_champions.append(index)
+            m_europa.sort()
+            m_champions.sort()
 
         cl_european_spots = all_current_teams[:4]
         uel_style = []
@@ -309,31 +368,41 @@ class RankingTable(BaseScrapper):
         """
         # FA Cup Winner for this Season (Potential Europa League Spot)
         fa_cup_page = self.additional_scrapper(
-            f"https://en.wikipedia.org/wiki/{self.season}_FA_Cup"
+            f"https://en.wikipedia.org/wiki/{self.season}_FA_Cup",
+            parser=self.parser,
+            expire_cache=self.cache_expiry,
         )
         fa_winner = self._find_tournament_winner(fa_cup_page, RANKING.CUP_WINNER)
 
         # EFL Cup Winner for this Season (Potential Europa Conference League Spot)
         efl_cup_page = self.additional_scrapper(
-            f"https://en.wikipedia.org/wiki/{self.season}_EFL_Cup"
+            f"https://en.wikipedia.org/wiki/{self.season}_EFL_Cup",
+            parser=self.parser,
+            expire_cache=self.cache_expiry,
         )
         efl_winner = self._find_tournament_winner(efl_cup_page, RANKING.CUP_WINNER)
 
         # Previous Champions League Winner (Potential Champions League Spot)
         cl_page = self.additional_scrapper(
-            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Champions_League"
+            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Champions_League",
+            parser=self.parser,
+            expire_cache=self.cache_expiry,
         )
         cl_winner = self._find_tournament_winner(cl_page, RANKING.UEFA_WINNER)
 
         # Europa League Winner (Potential Champions League Spot)
         europa_page = self.additional_scrapper(
-            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Europa_League"
+            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Europa_League",
+            parser=self.parser,
+            expire_cache=self.cache_expiry,
         )
         europa_winner = self._find_tournament_winner(europa_page, RANKING.UEFA_WINNER)
 
         # Europa Conference League Winner (Potential Europa League Spot)
         conference_page = self.additional_scrapper(
-            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Europa_Conference_League"
+            f"https://en.wikipedia.org/wiki/{self.season}_UEFA_Europa_Conference_League",
+            parser=self.parser,
+            expire_cache=self.cache_expiry,
         )
         conference_winner = self._find_tournament_winner(
             conference_page, RANKING.UEFA_WINNER
@@ -358,6 +427,10 @@ class RankingTable(BaseScrapper):
         """
         from reportlab.lib.colors import HexColor
 
+        if self.page is None:
+            # Tables computed from the database do not load the season page until here.
+            self.page = self.request_url_page()
+
         if int(self.season[:4]) == 1997:
             possible_european_spot = [
                 "UEFA Cup",
@@ -385,7 +458,7 @@ class RankingTable(BaseScrapper):
         for tournament in possible_european_spot:
             qualified_teams = []
             teams = self.get_list_by_xpath(
-                f'//tr[.//th/a[contains(text(), "{tournament}")]]/th/a/@title'
+                RANKING.EUROPEAN_QUALIFIED_TEAMS, tournament=tournament
             )
             for item in teams:
                 if "(" in item or ")" in item or "Fair Play" in item:
@@ -406,17 +479,58 @@ class RankingTable(BaseScrapper):
         ]
         for index, tournament in enumerate(qualified.keys()):
             for team in qualified[tournament]:
-                try:
-                    team_index = self.ranking_list.index(
-                        [i for i in self.ranking_list if team in i][0]
-                    )
-                except IndexError:
-                    pass
+                team_index = self._team_row(team)
+                if team_index is None:
+                    continue
                 style.append(
                     ("BACKGROUND", (0, team_index), (-1, team_index), colors[index])
                 )
         return style
 
+    def _team_row(self, team: str) -> Optional[int]:
+        """
+        Find the row of a team in the ranking list from its name on Wikipedia.
+
+        Scraped tables use the Wikipedia names, but tables computed from the database use the fbref names
+        (e.g. "Manchester Utd" or "Wolves"). Names are compared exactly first, then without accents, club
+        suffixes and punctuation, then with the closest of the teams whose name starts like it or is its
+        acronym.
+
+        Args:
+            team (str): The name of the team.
+
+        Returns:
+            Optional[int]: The index of the team's row in the ranking list, or None if no team matches.
+        """
+        rows = list(enumerate(self.ranking_list[1:], start=1))
+        for index, row in rows:
+            if team in row:
+                return index
+
+        tokens = _team_name_tokens(team)
+        if not tokens:
+            return None
+        candidates = []
+        for index, row in rows:
+            row_tokens = _team_name_tokens(row[1])
+            if not row_tokens:
+                continue
+            if row_tokens == tokens:
+                return index
+            acronyms = (
+                "".join(token[0] for token in row_tokens) == tokens[0],
+                "".join(token[0] for token in tokens) == row_tokens[0],
+            )
+            if row_tokens[0][:3] == tokens[0][:3] or any(acronyms):
+                candidates.append((index, " ".join(row_tokens)))
+        if not candidates:
+            return None
+        name = " ".join(tokens)
+        return max(
+            candidates,
+            key=lambda candidate: SequenceMatcher(None, candidate[1], name).ratio(),
+        )[0]
+
     @staticmethod
     def _is_team_in_european_competition(team_index, competition_indices, all_teams):
         """
@@ -433,13 +547,13 @@ class RankingTable(BaseScrapper):
         return [i for i in competition_indices if all_teams[team_index] == all_teams[i]]
 
     @staticmethod
-    def _find_tournament_winner(cup_page, xpath: str) -> str:
+    def _find_tournament_winner(cup_page, xpath: Union[str, etree.XPath]) -> str:
         """
         Find the winner of a specific tournament from a scraped page.
 
         Args:
             cup_page: The scraped page containing the tournament information.
-            xpath (str): The XPath to locate the winner information.
+            xpath (Union[str, etree.XPath]): The XPath to locate the winner information.
 
         Returns:
             str: The name of the tournament winner, or None if not found.
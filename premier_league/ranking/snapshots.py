@@ -0,0 +1,235 @@
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from ..data.models import Game, League, StandingsSnapshot, Team
+from .standings import rank_standings
+
+_RECORD_COLUMNS = ("played", "won", "drawn", "lost", "goals_for", "goals_against")
+
+
+def refresh_standings(
+    session: Session, league_id: int, season: str, from_week: Optional[int] = None
+) -> int:
+    """
+    Recompute the stored tables of a league season from a match week onwards.
+
+    The table after a week counts every game up to it, so a game changed at a week only affects the tables
+    from that week on. The games of the season are read once and accumulated week by week, and only the
+    tables from from_week onwards are replaced.
+
+    Args:
+        session (Session): The database session. The caller commits.
+        league_id (int): The id of the league.
+        season (str): The season (e.g., "2023-2024").
+        from_week (int, optional): The first match week to recompute. Defaults to the whole season.
+
+    Returns:
+        int: The number of snapshot rows written.
+    """
+    games = session.execute(
+        select(
+            Game.match_week,
+            Game.home_team_id,
+            Game.away_team_id,
+            Game.home_goals,
+            Game.away_goals,
+        )
+        .where(
+            Game.league_id == league_id,
+            Game.season == season,
+            Game.match_week.is_not(None),
+            Game.home_goals.is_not(None),
+            Game.away_goals.is_not(None),
+        )
+        .order_by(Game.match_week)
+    ).all()
+    team_ids = {game.home_team_id for game in games} | {
+        game.away_team_id for game in games
+    }
+    names = dict(
+        session.execute(select(Team.id, Team.name).where(Team.id.in_(team_ids))).all()
+    )
+
+    stale = [
+        StandingsSnapshot.league_id == league_id,
+        StandingsSnapshot.season == season,
+    ]
+    if from_week is not None:
+        stale.append(StandingsSnapshot.match_week >= from_week)
+    session.execute(delete(StandingsSnapshot).where(*stale))
+
+    records: Dict[str, dict] = {}
+
+    def record(team_id: str, scored: int, conceded: int):
+        row = records.get(team_id)
+        if row is None:
+            row = records[team_id] = dict.fromkeys(_RECORD_COLUMNS, 0)
+            row.update(team_id=team_id, team=names.get(team_id, team_id))
+        row["played"] += 1
+        row["won"] += scored > conceded
+        row["drawn"] += scored == conceded
+        row["lost"] += scored < conceded
+        row["goals_for"] += scored
+        row["goals_against"] += conceded
+
+    snapshots = []
+    for match_week, week_games in groupby(games, key=lambda game: game.match_week):
+        for game in week_games:
+            record(game.home_team_id, game.home_goals, game.away_goals)
+            record(game.away_team_id, game.away_goals, game.home_goals)
+        if from_week is not None and match_week < from_week:
+            continue
+        snapshots.extend(
+            {
+                "league_id": league_id,
+                "season": season,
+                "match_week": match_week,
+                "team_id": row["team_id"],
+                "position": row["position"],
+                "points": row["points"],
+                **{column: row[column] for column in _RECORD_COLUMNS},
+            }
+            for row in rank_standings(records.values())
+        )
+
+    if snapshots:
+        session.execute(insert(StandingsSnapshot), snapshots)
+    return len(snapshots)
+
+
+class StandingsStore:
+    """
+    The league tables after every match week, materialized in the standings_snapshot table.
+
+    MatchIngestor keeps the tables of the seasons it writes games to up to date, from the earliest changed
+    match week onwards, so a table after a week or the positions of a team along a season are read with a
+    single indexed lookup instead of aggregating the games.
+
+    Attributes:
+        session (Session): The database session.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _league_id(self, league: str) -> int:
+        league_id = self.session.execute(
+            select(League.id).where(League.name == league)
+        ).scalar()
+        if league_id is None:
+            raise ValueError(f"No league found with name: {league}")
+        return league_id
+
+    def refresh(self, league: str, season: str, from_week: Optional[int] = None) -> int:
+        """
+        Recompute and commit the tables of a league season from a match week onwards.
+
+        Args:
+            league (str): The league name (e.g., "Premier League").
+            season (str): The season (e.g., "2023-2024").
+            from_week (int, optional): The first match week to recompute. Defaults to the whole season.
+
+        Returns:
+            int: The number of snapshot rows written.
+        """
+        written = refresh_standings(
+            self.session, self._league_id(league), season, from_week
+        )
+        self.session.commit()
+        return written
+
+    def rebuild(self) -> int:
+        """
+        Recompute and commit the tables of every league season with stored games.
+
+        Returns:
+            int: The number of snapshot rows written.
+        """
+        seasons = self.session.execute(
+            select(Game.league_id, Game.season)
+            .where(Game.league_id.is_not(None), Game.season.is_not(None))
+            .distinct()
+        ).all()
+        written = sum(
+            refresh_standings(self.session, league_id, season)
+            for league_id, season in seasons
+        )
+        self.session.commit()
+        return written
+
+    def table(
+        self, league: str, season: str, match_week: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Get the stored table of a league season after a match week.
+
+        Args:
+            league (str): The league name (e.g., "Premier League").
+            season (str): The season (e.g., "2023-2024").
+            match_week (int, optional): The match week. Weeks without games give the table after the
+                latest week before them. Defaults to the latest stored week.
+
+        Returns:
+            List[dict]: One dict per team, in table order, with the same keys as team_standings().
+                Empty if no table is stored.
+        """
+        league_id = self._league_id(league)
+        latest = select(StandingsSnapshot.match_week).where(
+            StandingsSnapshot.league_id == league_id,
+            StandingsSnapshot.season == season,
+        )
+        if match_week is not None:
+            latest = latest.where(StandingsSnapshot.match_week <= match_week)
+        latest = latest.order_by(StandingsSnapshot.match_week.desc()).limit(1)
+
+        rows = self.session.execute(
+            select(StandingsSnapshot, Team.name)
+            .join(Team, Team.id == StandingsSnapshot.team_id)
+            .where(
+                StandingsSnapshot.league_id == league_id,
+                StandingsSnapshot.season == season,
+                StandingsSnapshot.match_week == latest.scalar_subquery(),
+            )
+            .order_by(StandingsSnapshot.position)
+        ).all()
+        return [
+            {
+                "position": snapshot.position,
+                "team_id": snapshot.team_id,
+                "team": name,
+                **{column: getattr(snapshot, column) for column in _RECORD_COLUMNS},
+                "goal_difference": snapshot.goals_for - snapshot.goals_against,
+                "points": snapshot.points,
+            }
+            for snapshot, name in rows
+        ]
+
+    def trajectory(self, league: str, season: str, team: str) -> List[Tuple[int, int]]:
+        """
+        Get the position of a team after every match week of a season.
+
+        Args:
+            league (str): The league name (e.g., "Premier League").
+            season (str): The season (e.g., "2023-2024").
+            team (str): The team name.
+
+        Returns:
+            List[Tuple[int, int]]: The (match week, position) pairs, in match week order.
+        """
+        league_id = self._league_id(league)
+        return [
+            tuple(row)
+            for row in self.session.execute(
+                select(StandingsSnapshot.match_week, StandingsSnapshot.position)
+                .join(Team, Team.id == StandingsSnapshot.team_id)
+                .where(
+                    Team.name == team,
+                    StandingsSnapshot.league_id == league_id,
+                    StandingsSnapshot.season == season,
+                )
+                .order_by(StandingsSnapshot.match_week)
+            )
+        ]
@@ -0,0 +1,201 @@
+from datetime import date as Date
+from datetime import datetime, time
+from typing import Iterable, List, Literal, Optional, Union
+
+from sqlalchemy import case, func, select, union_all
+from sqlalchemy.orm import Session
+
+from ..data.models import Game, League, Team
+
+STANDINGS_HEADER = ["Pos", "Team", "Pld", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+
+def _game_criteria(
+    league: str,
+    season: str,
+    match_week: Optional[int],
+    date: Optional[Union[datetime, Date]],
+) -> list:
+    criteria = [
+        Game.league_id.in_(select(League.id).where(League.name == league)),
+        Game.season == season,
+        # Fixtures without a score are not played yet.
+        Game.home_goals.is_not(None),
+        Game.away_goals.is_not(None),
+    ]
+    if match_week is not None:
+        criteria.append(Game.match_week <= match_week)
+    if date is not None:
+        if not isinstance(date, datetime):
+            date = datetime.combine(date, time.max)
+        criteria.append(Game.date <= date)
+    return criteria
+
+
+def team_standings(
+    session: Session,
+    league: str,
+    season: str,
+    match_week: Optional[int] = None,
+    date: Optional[Union[datetime, Date]] = None,
+    venue: Optional[Literal["home", "away"]] = None,
+) -> List[dict]:
+    """
+    Compute the league table of a season from the stored games, with a single grouped query.
+
+    Every game counts once for each team, from its side. Teams are ranked by points, then goal difference,
+    then goals scored, then name.
+
+    Args:
+        session (Session): The database session.
+        league (str): The league name (e.g., "Premier League").
+        season (str): The season (e.g., "2023-2024").
+        match_week (int, optional): Only count games up to this match week. Defaults to every game.
+        date (Union[datetime, date], optional): Only count games played on or before this date (the whole
+            day for a date). Defaults to every game.
+        venue (str, optional): "home" or "away" to only count the home or away games of every team.
+            Defaults to both.
+
+    Returns:
+        List[dict]: One dict per team, in table order, with the position, team_id, team, played, won, drawn,
+            lost, goals_for, goals_against, goal_difference and points. Empty without any played game.
+    """
+    if venue not in (None, "home", "away"):
+        raise ValueError("venue must be either home, away or None")
+
+    criteria = _game_criteria(league, season, match_week, date)
+    sides = []
+    if venue in (None, "home"):
+        sides.append(
+            select(
+                Game.home_team_id.label("team_id"),
+                Game.home_goals.label("goals_for"),
+                Game.away_goals.label("goals_against"),
+            ).where(*criteria)
+        )
+    if venue in (None, "away"):
+        sides.append(
+            select(
+                Game.away_team_id.label("team_id"),
+                Game.away_goals.label("goals_for"),
+                Game.home_goals.label("goals_against"),
+            ).where(*criteria)
+        )
+    results = union_all(*sides).subquery() if len(sides) > 1 else sides[0].subquery()
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    statement = (
+        select(
+            results.c.team_id,
+            Team.name,
+            func.count(),
+            count_if(results.c.goals_for > results.c.goals_against),
+            count_if(results.c.goals_for == results.c.goals_against),
+            count_if(results.c.goals_for < results.c.goals_against),
+            func.sum(results.c.goals_for),
+            func.sum(results.c.goals_against),
+        )
+        .join(Team, Team.id == results.c.team_id)
+        .group_by(results.c.team_id, Team.name)
+    )
+
+    return rank_standings(
+        {
+            "team_id": team_id,
+            "team": name,
+            "played": played,
+            "won": won,
+            "drawn": drawn,
+            "lost": lost,
+            "goals_for": scored,
+            "goals_against": conceded,
+        }
+        for team_id, name, played, won, drawn, lost, scored, conceded in session.execute(
+            statement
+        )
+    )
+
+
+def rank_standings(rows: Iterable[dict]) -> List[dict]:
+    """
+    Put the records of the teams in table order, by points, then goal difference, then goals scored, then name.
+
+    Args:
+        rows (Iterable[dict]): The team_id, team (name), played, won, drawn, lost, goals_for and
+            goals_against of every team.
+
+    Returns:
+        List[dict]: The rows in table order, with their position, goal_difference and points added.
+    """
+    standings = [
+        {
+            **row,
+            "goal_difference": row["goals_for"] - row["goals_against"],
+            "points": row["won"] * POINTS_FOR_WIN + row["drawn"] * POINTS_FOR_DRAW,
+        }
+        for row in rows
+    ]
+    standings.sort(
+        key=lambda row: (
+            -row["points"],
+            -row["goal_difference"],
+            -row["goals_for"],
+            row["team"],
+        )
+    )
+    return [{"position": position, **row} for position, row in enumerate(standings, 1)]
+
+
+def _format_goal_difference(goal_difference: int) -> str:
+    # Signed like the Wikipedia tables, with a minus sign for negative differences.
+    if goal_difference > 0:
+        return f"+{goal_difference}"
+    if goal_difference < 0:
+        return f"−{-goal_difference}"
+    return "0"
+
+
+def standings_table(
+    session: Session,
+    league: str,
+    season: str,
+    match_week: Optional[int] = None,
+    date: Optional[Union[datetime, Date]] = None,
+    venue: Optional[Literal["home", "away"]] = None,
+) -> List[List[str]]:
+    """
+    Compute the league table of a season from the stored games, in the shape of RankingTable.get_ranking_list().
+
+    Args:
+        session (Session): The database session.
+        league (str): The league name (e.g., "Premier League").
+        season (str): The season (e.g., "2023-2024").
+        match_week (int, optional): Only count games up to this match week. Defaults to every game.
+        date (Union[datetime, date], optional): Only count games played on or before this date.
+            Defaults to every game.
+        venue (str, optional): "home" or "away" to only count the home or away games of every team.
+            Defaults to both.
+
+    Returns:
+        List[List[str]]: The STANDINGS_HEADER, then one row of strings per team. Only the header without
+            any played game.
+    """
+    return [list(STANDINGS_HEADER)] + [
+        [
+            str(row["position"]),
+            row["team"],
+            str(row["played"]),
+            str(row["won"]),
+            str(row["drawn"]),
+            str(row["lost"]),
+            str(row["goals_for"]),
+            str(row["goals_against"]),
+            _format_goal_difference(row["goal_difference"]),
+            str(row["points"]),
+        ]
+        for row in team_standings(session, league, season, match_week, date, venue)
+    ]
@@ -45,6 +45,7 @@ class Transfers(BaseScrapper):
         target_season: Optional[str] = None,
         league: Optional[str] = "premier league",
         cache: Optional[bool] = True,
+        parser: Literal["lxml", "html.parser"] = "lxml",
     ):
         """
         Initialize the Transfers object.
@@ -52,6 +53,8 @@ class Transfers(BaseScrapper):
         Args:
             target_season (str, optional): The target season for transfer data. Defaults to None.
             league (str, optional): The league to scrape data for. Defaults to "Premier League".
+            parser (str, optional): The parser for the web page. Use "html.parser" for malformed pages.
+                Defaults to "lxml".
         """
         self.league = league.lower()
         super().__init__(
@@ -59,6 +62,7 @@ class Transfers(BaseScrapper):
             target_season=target_season,
             cache=cache,
             season_limit=self.find_season_limit(),
+            parser=parser,
         )
         self.page = self.request_url_page()
         self._season_top_players = self._init_transfers_table()
@@ -92,10 +96,10 @@ class Transfers(BaseScrapper):
         team_transfer_dict = {}
         for transfer in transfer_list:
             try:
-                target_team = transfer.xpath(PLAYERS.TRANSFER_HEADER)[0]
+                target_team = PLAYERS.TRANSFER_HEADER(transfer)[0]
                 player_transfers = [
                     clean_xml_text(e)
-                    for e in transfer.xpath(PLAYERS.TRANSFER_DATA)
+                    for e in PLAYERS.TRANSFER_DATA(transfer)
                     if clean_xml_text(e)
                 ]
                 team = target_team.split(" » ")[0].strip().title()
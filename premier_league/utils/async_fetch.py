@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+
+async def _fetch_all(
+    urls: List[str],
+    fetch: Callable[[str], Any],
+    on_result: Callable[[int, str, Any], None],
+    max_concurrency: int,
+):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        async def worker(index: int, url: str):
+            async with semaphore:
+                result = await loop.run_in_executor(executor, fetch, url)
+            # Runs on the event loop thread, so callbacks never execute concurrently.
+            on_result(index, url, result)
+
+        await asyncio.gather(*(worker(index, url) for index, url in enumerate(urls)))
+
+
+def fetch_all(
+    urls: List[str],
+    fetch: Callable[[str], Any],
+    on_result: Callable[[int, str, Any], None],
+    max_concurrency: int = 4,
+):
+    """
+    Fetch all URLs concurrently with asyncio.
+
+    The blocking `fetch` callable runs in a thread pool and is responsible for staying within the
+    request budget of each host (see `premier_league.utils.rate_limit`). `on_result` is invoked on
+    the event loop thread as soon as each page lands. Callbacks are therefore never run in parallel,
+    which keeps them safe to use with non thread-safe resources such as database sessions.
+
+    Args:
+        urls (list): The list of URLs to fetch.
+        fetch (Callable): A blocking function taking a URL and returning the fetched result.
+        on_result (Callable): Called with (index, url, result) for every completed fetch.
+        max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 4.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    coroutine = _fetch_all(urls, fetch, on_result, max_concurrency)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # Called from within a running event loop (e.g. a notebook), so run in a dedicated thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
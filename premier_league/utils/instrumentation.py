@@ -0,0 +1,261 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+@dataclass
+class StageStats:
+    """
+    The aggregated timings of one stage.
+
+    Attributes:
+        count (int): The number of times the stage ran.
+        total_time (float): The total time spent in the stage, in seconds.
+        min_time (float): The fastest run, in seconds.
+        max_time (float): The slowest run, in seconds.
+        bytes (int): The total number of bytes handled by the stage.
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    min_time: float = field(default=float("inf"))
+    max_time: float = 0.0
+    bytes: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        """The mean time of a run of the stage, in seconds."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def add(self, seconds: float, nbytes: int = 0):
+        self.count += 1
+        self.total_time += seconds
+        self.min_time = min(self.min_time, seconds)
+        self.max_time = max(self.max_time, seconds)
+        self.bytes += nbytes
+
+
+class Measurement:
+    """
+    A running measurement, whose byte count can be set once it is known.
+
+    Attributes:
+        nbytes (int): The number of bytes handled by the measured stage.
+        stage (str): The name of the stage. Can be changed before the measurement ends.
+    """
+
+    __slots__ = ("stage", "nbytes")
+
+    def __init__(self, stage: str, nbytes: int = 0):
+        self.stage = stage
+        self.nbytes = nbytes
+
+
+class ScrapeStats:
+    """
+    Thread-safe per-stage timings and byte counts of the scrapers.
+
+    Stages are named after what they measure, e.g. "request", "cache_hit", "parse.lxml",
+    "parse.bs4", "convert", "clean" or "xpath:<expression>".
+
+    Attributes:
+        callback (Callable, optional): Called with (stage, seconds, nbytes) after every measurement.
+    """
+
+    def __init__(self, callback: Optional[Callable[[str, float, int], None]] = None):
+        self.callback = callback
+        self._stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, nbytes: int = 0):
+        """
+        Record a run of a stage.
+
+        Args:
+            stage (str): The name of the stage.
+            seconds (float): The time the run took.
+            nbytes (int, optional): The number of bytes handled by the run. Defaults to 0.
+        """
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds, nbytes)
+        if self.callback:
+            self.callback(stage, seconds, nbytes)
+
+    @contextmanager
+    def measure(self, stage: str, nbytes: int = 0) -> Iterator[Measurement]:
+        """
+        Time the body of the with statement as a run of a stage.
+
+        Args:
+            stage (str): The name of the stage.
+            nbytes (int, optional): The number of bytes handled, if known upfront. Defaults to 0.
+
+        Yields:
+            Measurement: The running measurement, whose nbytes can be set inside the with statement.
+        """
+        measurement = Measurement(stage, nbytes)
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            self.record(
+                measurement.stage, time.perf_counter() - start, measurement.nbytes
+            )
+
+    @property
+    def stages(self) -> List[str]:
+        """The names of the recorded stages."""
+        with self._lock:
+            return list(self._stages)
+
+    def __getitem__(self, stage: str) -> StageStats:
+        with self._lock:
+            return self._stages[stage]
+
+    def __contains__(self, stage: str) -> bool:
+        with self._lock:
+            return stage in self._stages
+
+    def reset(self):
+        """
+        Forget every recorded measurement.
+        """
+        with self._lock:
+            self._stages = {}
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Get the recorded timings of every stage.
+
+        Returns:
+            Dict[str, dict]: The count, total_time, mean_time, min_time, max_time and bytes of each stage.
+        """
+        with self._lock:
+            return {
+                stage: {
+                    "count": stats.count,
+                    "total_time": stats.total_time,
+                    "mean_time": stats.mean_time,
+                    "min_time": stats.min_time,
+                    "max_time": stats.max_time,
+                    "bytes": stats.bytes,
+                }
+                for stage, stats in self._stages.items()
+            }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Get the recorded timings of every stage as a DataFrame, slowest stage first.
+
+        Returns:
+            pd.DataFrame: One row per stage, indexed by stage name.
+        """
+        df = pd.DataFrame.from_dict(
+            self.summary(),
+            orient="index",
+            columns=[
+                "count",
+                "total_time",
+                "mean_time",
+                "min_time",
+                "max_time",
+                "bytes",
+            ],
+        )
+        df.index.name = "stage"
+        return df.sort_values("total_time", ascending=False)
+
+    def __str__(self) -> str:
+        return self.to_dataframe().to_string()
+
+
+_active: List[ScrapeStats] = []
+_active_lock = threading.Lock()
+
+
+def current_stats() -> Optional[ScrapeStats]:
+    """
+    Get the collector of the innermost active collect_stats() block.
+
+    Returns:
+        Optional[ScrapeStats]: The active collector, or None if instrumentation is off.
+    """
+    return _active[-1] if _active else None
+
+
+@contextmanager
+def collect_stats(
+    stats: Optional[ScrapeStats] = None,
+    callback: Optional[Callable[[str, float, int], None]] = None,
+) -> Iterator[ScrapeStats]:
+    """
+    Turn on instrumentation of every scraper for the body of the with statement.
+
+    Collection is process-wide, so stages run by worker threads are recorded as well.
+
+    Args:
+        stats (ScrapeStats, optional): The collector to record into. Defaults to a new collector.
+        callback (Callable, optional): Called with (stage, seconds, nbytes) after every measurement
+            of a new collector.
+
+    Yields:
+        ScrapeStats: The collector.
+    """
+    if stats is None:
+        stats = ScrapeStats(callback=callback)
+    with _active_lock:
+        _active.append(stats)
+    try:
+        yield stats
+    finally:
+        with _active_lock:
+            _active.remove(stats)
+
+
+@contextmanager
+def measure(stage: str, nbytes: int = 0) -> Iterator[Measurement]:
+    """
+    Time the body of the with statement in the active collector, if any.
+
+    Args:
+        stage (str): The name of the stage.
+        nbytes (int, optional): The number of bytes handled, if known upfront. Defaults to 0.
+
+    Yields:
+        Measurement: The running measurement, whose nbytes can be set inside the with statement.
+    """
+    stats = current_stats()
+    if stats is None:
+        yield Measurement(stage, nbytes)
+        return
+    with stats.measure(stage, nbytes) as measurement:
+        yield measurement
+
+
+def logging_callback(
+    logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+) -> Callable[[str, float, int], None]:
+    """
+    Create a callback logging every measurement.
+
+    Args:
+        logger (logging.Logger, optional): The logger to use. Defaults to the logger of this module.
+        level (int, optional): The log level. Defaults to logging.DEBUG.
+
+    Returns:
+        Callable: A callback for ScrapeStats or collect_stats().
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def callback(stage: str, seconds: float, nbytes: int):
+        logger.log(level, "%s took %.2f ms (%d bytes)", stage, seconds * 1000, nbytes)
+
+    return callback
@@ -0,0 +1,219 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class PageStore:
+    """
+    A persistent, content-addressed store of raw HTML pages.
+
+    Pages are keyed by the SHA-256 hash of their URL and written compressed (zstd if the zstandard
+    package is installed, gzip otherwise) under a two-level directory fan-out. Every write goes to a
+    temporary file that is atomically renamed into place, so a crash never leaves a truncated page
+    behind. A small SQLite index keeps the fetch time, status and size of every stored page.
+
+    Attributes:
+        root (Path): The directory the pages are stored in.
+        compression (str): The compression used for new pages, either "zst" or "gz".
+    """
+
+    INDEX_NAME = "index.sqlite"
+
+    def __init__(self, root: Union[str, Path], compression: Optional[str] = None):
+        if compression is None:
+            compression = "zst" if zstandard is not None else "gz"
+        if compression not in ("zst", "gz"):
+            raise ValueError(
+                f"Invalid compression {compression}. Must be one of 'zst' or 'gz'"
+            )
+        if compression == "zst" and zstandard is None:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package. Install it with:\n"
+                "    pip install zstandard"
+            )
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(
+            self.root / self.INDEX_NAME, check_same_thread=False
+        )
+        with self._lock, self._index:
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "key TEXT PRIMARY KEY, url TEXT NOT NULL, path TEXT NOT NULL, "
+                "status INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "compressed_size INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Get the content address of a URL.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            str: The hex SHA-256 digest of the URL.
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, compression: str) -> Path:
+        return self.root / key[:2] / f"{key}.html.{compression}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zst":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, compression: str) -> bytes:
+        if compression == "zst":
+            if zstandard is None:
+                raise ImportError(
+                    "Reading zstd compressed pages requires the 'zstandard' package."
+                )
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def put(self, url: str, html: str, status: int = 200):
+        """
+        Store the HTML of a page, replacing any previous version.
+
+        Args:
+            url (str): The URL of the page.
+            html (str): The HTML content of the page.
+            status (int, optional): The HTTP status the page was fetched with. Defaults to 200.
+        """
+        key = self.key(url)
+        raw = html.encode("utf-8")
+        data = self._compress(raw)
+        path = self._path(key, self.compression)
+        path.parent.mkdir(exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock, self._index:
+            self._index.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    str(path.relative_to(self.root)),
+                    status,
+                    len(raw),
+                    len(data),
+                    time.time(),
+                ),
+            )
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Get the stored HTML of a page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Optional[str]: The HTML content of the page, or None if it is not stored.
+        """
+        key = self.key(url)
+        with self._lock:
+            row = self._index.execute(
+                "SELECT path FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        path = self.root / row[0]
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.delete(url)
+            return None
+        return self._decompress(data, path.suffix[1:]).decode("utf-8")
+
+    def info(self, url: str) -> Optional[dict]:
+        """
+        Get the index entry of a stored page.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Optional[dict]: The url, status, size, compressed_size and fetched_at of the page,
+                or None if it is not stored.
+        """
+        with self._lock:
+            row = self._index.execute(
+                "SELECT url, status, size, compressed_size, fetched_at FROM pages WHERE key = ?",
+                (self.key(url),),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(
+            zip(("url", "status", "size", "compressed_size", "fetched_at"), row)
+        )
+
+    def delete(self, url: str):
+        """
+        Remove a page from the store.
+
+        Args:
+            url (str): The URL of the page.
+        """
+        key = self.key(url)
+        with self._lock, self._index:
+            row = self._index.execute(
+                "SELECT path FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            self._index.execute("DELETE FROM pages WHERE key = ?", (key,))
+        if row is not None:
+            (self.root / row[0]).unlink(missing_ok=True)
+
+    def urls(self) -> List[str]:
+        """
+        Get the URLs of all stored pages.
+
+        Returns:
+            List[str]: The URLs of the stored pages, in the order they were last stored.
+        """
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT url FROM pages ORDER BY rowid"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __contains__(self, url: str) -> bool:
+        return self.info(url) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._index.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        """
+        Close the index database.
+        """
+        with self._lock:
+            self._index.close()
@@ -0,0 +1,143 @@
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+from premier_league.utils.async_fetch import fetch_all
+
+_DONE = object()
+
+
+def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+    # Blocks while the queue is full, which is what slows the upstream stage down,
+    # but gives up once the pipeline is being torn down.
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pipeline(
+    urls: List[str],
+    fetch: Callable[[str], Any],
+    parse: Callable[[Any, str], Any],
+    on_result: Callable[[str, Any], None],
+    max_concurrency: int = 1,
+    parse_workers: int = 1,
+    ordered: bool = True,
+    queue_size: Optional[int] = None,
+    reorder_window: Optional[int] = None,
+):
+    """
+    Fetch and parse URLs in overlapping stages.
+
+    A producer thread fetches the URLs with the asyncio fetch engine (see
+    `premier_league.utils.async_fetch`) and hands every fetched result to a bounded queue. A pool of
+    parse worker threads takes the results off the queue, runs `parse` on them and hands them to a
+    second bounded queue, so parsing happens while the next rate-limited requests are waiting.
+    `on_result` is invoked on the calling thread only, which keeps it safe to use with non thread-safe
+    resources such as database sessions.
+
+    Every stage waits for room in the queue of the next one, so a slow `on_result` (e.g. a database
+    write) slows the parse workers down, and they slow the fetch stage down. In ordered mode, results
+    that complete ahead of an earlier URL wait for it, and no URL is fetched more than reorder_window
+    URLs ahead of the oldest URL not yet handed to `on_result`. Memory is therefore bounded by the
+    queues and the reorder window, whatever the relative speed of the stages.
+
+    Args:
+        urls (list): The list of URLs to fetch.
+        fetch (Callable): A blocking function taking a URL and returning the fetched result.
+        parse (Callable): A function taking a fetched result and its URL and returning the parsed result.
+            It is run in the parse worker threads.
+        on_result (Callable): Called with (url, parsed result) for every URL on the calling thread.
+        max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 1.
+        parse_workers (int, optional): Number of parse worker threads. Defaults to 1.
+        ordered (bool, optional): Whether on_result is called in the order of the input URLs, rather than
+            as soon as each URL is parsed. Defaults to True.
+        queue_size (int, optional): Maximum number of results waiting in each of the fetched and parsed
+            queues. Defaults to twice the number of parse workers.
+        reorder_window (int, optional): In ordered mode, the maximum number of URLs fetched but not yet
+            handed to on_result. At least max_concurrency. Defaults to max_concurrency + parse_workers
+            + 2 * queue_size, which never holds back the fetch stage more than the queues already do.
+    """
+    if parse_workers < 1:
+        raise ValueError("parse_workers must be at least 1")
+
+    queue_size = queue_size or 2 * parse_workers
+    if reorder_window is None:
+        reorder_window = max_concurrency + parse_workers + 2 * queue_size
+    # A smaller window would keep requests of URLs after the awaited one from ever starting.
+    reorder_window = max(reorder_window, max_concurrency)
+
+    stop = threading.Event()
+    fetched = queue.Queue(maxsize=queue_size)
+    parsed = queue.Queue(maxsize=queue_size)
+    window = threading.Condition()
+    handed_over = 0
+
+    def fetch_index(index: int):
+        if ordered:
+            # Requests start in URL order, so the awaited URL is always fetched or in flight.
+            with window:
+                while not stop.is_set() and index >= handed_over + reorder_window:
+                    window.wait(0.1)
+        return None if stop.is_set() else fetch(urls[index])
+
+    def produce():
+        try:
+            fetch_all(
+                list(range(len(urls))),
+                fetch_index,
+                lambda _, index, result: _put(
+                    fetched, (index, urls[index], result), stop
+                ),
+                max_concurrency=max_concurrency,
+            )
+        except BaseException as e:
+            _put(parsed, (None, None, None, e), stop)
+        finally:
+            for _ in range(parse_workers):
+                _put(fetched, _DONE, stop)
+
+    def consume():
+        while not stop.is_set():
+            try:
+                item = fetched.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                return
+            index, url, result = item
+            try:
+                _put(parsed, (index, url, parse(result, url), None), stop)
+            except BaseException as e:
+                _put(parsed, (index, url, None, e), stop)
+
+    threads = [threading.Thread(target=produce, daemon=True)] + [
+        threading.Thread(target=consume, daemon=True) for _ in range(parse_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        pending = {}
+        for _ in range(len(urls)):
+            index, url, result, error = parsed.get()
+            if error is not None:
+                raise error
+            if not ordered:
+                on_result(url, result)
+                continue
+
+            pending[index] = (url, result)
+            while handed_over in pending:
+                on_result(*pending.pop(handed_over))
+                with window:
+                    handed_over += 1
+                    window.notify_all()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
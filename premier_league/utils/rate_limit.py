@@ -0,0 +1,282 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from requests import Response
+
+from premier_league.utils.instrumentation import measure
+
+RETRY_STATUS_CODES = (429, 503)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that adapts its refill rate to the responses of the host.
+
+    Tokens are reserved ahead of time, so concurrent callers are handed increasing delays rather
+    than racing for the next token. The rate is halved whenever the host throttles a request and
+    recovers additively on every successful response, up to the configured maximum.
+
+    Attributes:
+        max_rate (float): The maximum (configured) number of requests per second.
+        min_rate (float): The lowest rate the bucket will slow down to.
+        capacity (float): The maximum number of tokens, i.e. the allowed burst size.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1,
+        min_rate: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = capacity
+        self._rate = rate
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """The current number of requests per second allowed by the bucket."""
+        return self._rate
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Reserve a token.
+
+        Returns:
+            float: The number of seconds the caller has to wait before using the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self):
+        """
+        Block until a token is available.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            with measure("rate_limit.wait"):
+                time.sleep(delay)
+
+    def refund(self):
+        """
+        Return a token that was not used, e.g. when a response was served from the cache.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """
+        Slow the bucket down after the host throttled a request.
+
+        Args:
+            retry_after (float, optional): The number of seconds the host asked to wait before retrying.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate / 2)
+            self._tokens = min(self._tokens, 0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def reward(self):
+        """
+        Speed the bucket back up towards its maximum rate after a successful request.
+        """
+        with self._lock:
+            if self._rate < self.max_rate:
+                self._refill(time.monotonic())
+                self._rate = min(self.max_rate, self._rate + self.max_rate / 10)
+
+    def configure(self, rate: float, capacity: Optional[float] = None):
+        """
+        Change the maximum rate (and optionally the capacity) of the bucket.
+
+        Args:
+            rate (float): The maximum number of requests per second.
+            capacity (float, optional): The maximum number of tokens.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            throttled = self._rate < self.max_rate
+            self.max_rate = rate
+            self.min_rate = min(self.min_rate, rate)
+            self._rate = min(self._rate, rate) if throttled else rate
+            if capacity is not None:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, capacity)
+
+
+class RateLimiter:
+    """
+    A registry of per-host token buckets shared by every scraper in the process.
+
+    Attributes:
+        default_rate (float): The requests per second for hosts without an explicit configuration.
+        default_capacity (float): The burst size for hosts without an explicit configuration.
+    """
+
+    def __init__(self, default_rate: float = 10, default_capacity: float = 10):
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(
+        self, url: str, rate: Optional[float] = None, capacity: Optional[float] = None
+    ) -> TokenBucket:
+        """
+        Get the token bucket of the host of the given URL, creating it if necessary.
+
+        Args:
+            url (str): The URL (or bare host) to get the bucket for.
+            rate (float, optional): The maximum requests per second for the host. Defaults to default_rate.
+            capacity (float, optional): The burst size for the host. Defaults to default_capacity,
+                or 1 if an explicit rate is given.
+
+        Returns:
+            TokenBucket: The token bucket of the host.
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                if rate is None:
+                    rate = self.default_rate
+                    capacity = capacity or self.default_capacity
+                bucket = TokenBucket(rate, capacity or 1)
+                self._buckets[host] = bucket
+            elif rate is not None and rate != bucket.max_rate:
+                bucket.configure(rate, capacity)
+        return bucket
+
+    def configure(self, host: str, rate: float, capacity: Optional[float] = None):
+        """
+        Set the request budget of a host.
+
+        Args:
+            host (str): The host (e.g. "fbref.com") or a URL of the host.
+            rate (float): The maximum requests per second.
+            capacity (float, optional): The burst size. Defaults to 1.
+        """
+        self.bucket(host, rate=rate, capacity=capacity or 1)
+
+    def rate(self, url: str) -> float:
+        """
+        Get the current request rate of the host of the given URL.
+
+        Args:
+            url (str): The URL (or bare host).
+
+        Returns:
+            float: The current requests per second allowed for the host.
+        """
+        return self.bucket(url).rate
+
+
+rate_limiter = RateLimiter()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse the value of a Retry-After header.
+
+    Args:
+        value (str): The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def request_with_backoff(
+    send: Callable[[], Response],
+    bucket: TokenBucket,
+    max_retries: int = 5,
+    backoff_base: float = 2,
+    backoff_cap: float = 120,
+    lookup: Optional[Callable[[], Optional[Response]]] = None,
+) -> Response:
+    """
+    Send a request within the budget of a token bucket, retrying throttled requests.
+
+    Throttled responses (429 and 503) slow the bucket down and are retried after the delay requested
+    by the Retry-After header, or an exponential backoff with full jitter, whichever is longer.
+    Responses found by lookup are returned before any token is taken, so cached pages never wait on
+    the bucket, even while the host is throttling.
+
+    Args:
+        send (Callable): A function sending the request and returning the response.
+        bucket (TokenBucket): The token bucket of the requested host.
+        max_retries (int, optional): The maximum number of retries. Defaults to 5.
+        backoff_base (float, optional): The base delay of the exponential backoff in seconds. Defaults to 2.
+        backoff_cap (float, optional): The maximum backoff delay in seconds. Defaults to 120.
+        lookup (Callable, optional): A function returning the response from a cache without sending
+            any request, or None if it has no usable response. Defaults to None.
+
+    Returns:
+        Response: The last response received, which is still throttled if all retries were used.
+    """
+    if lookup is not None:
+        response = lookup()
+        if response is not None:
+            return response
+
+    attempt = 0
+    while True:
+        bucket.acquire()
+        response = send()
+
+        # Revalidated responses are served from the cache but still cost a (conditional) request.
+        if getattr(response, "from_cache", False) and not getattr(
+            response, "revalidated", False
+        ):
+            bucket.refund()
+            return response
+
+        if response.status_code not in RETRY_STATUS_CODES:
+            bucket.reward()
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        bucket.penalize(retry_after)
+        if attempt >= max_retries:
+            return response
+
+        backoff = random.uniform(0, min(backoff_cap, backoff_base * 2**attempt))
+        time.sleep(max(retry_after or 0, backoff))
+        attempt += 1
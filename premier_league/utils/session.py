@@ -0,0 +1,126 @@
+import threading
+from typing import Dict, Optional, Union
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+
+SCRAPED_HOSTS = (
+    "https://en.wikipedia.org",
+    "https://www.worldfootball.net",
+    "https://fbref.com",
+)
+
+
+class SessionProvider:
+    """
+    A process-wide, thread-safe provider of pooled HTTP sessions.
+
+    Every scraper shares the same sessions, so keep-alive connections (and their TLS handshakes) are
+    reused across scraper instances. Each scraped host gets its own connection pool adapter.
+
+    Attributes:
+        pool_connections (int): The number of host connection pools to cache per adapter.
+        pool_maxsize (int): The maximum number of connections kept alive per host.
+        cache_name (str): The name of the requests-cache database.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        cache_name: str = "prem_cache",
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.cache_name = cache_name
+        self._host_pool_sizes: Dict[str, int] = {
+            host: pool_maxsize for host in SCRAPED_HOSTS
+        }
+        self._sessions: Dict[bool, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        host_pool_sizes: Optional[Dict[str, int]] = None,
+        cache_name: Optional[str] = None,
+    ):
+        """
+        Change the pool configuration. Sessions created before are closed and rebuilt on next use.
+
+        Args:
+            pool_connections (int, optional): The number of host connection pools to cache per adapter.
+            pool_maxsize (int, optional): The default maximum number of connections kept alive per host.
+            host_pool_sizes (dict, optional): Maximum connections per host, keyed by URL prefix
+                (e.g. {"https://fbref.com": 4}).
+            cache_name (str, optional): The name of the requests-cache database.
+        """
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if host_pool_sizes:
+                self._host_pool_sizes.update(host_pool_sizes)
+            if cache_name is not None:
+                self.cache_name = cache_name
+            self._close_sessions()
+
+    def get(
+        self, cache: bool = True
+    ) -> Union[requests_cache.CachedSession, requests.Session]:
+        """
+        Get the shared session, creating it on first use.
+
+        Args:
+            cache (bool, optional): Whether to get the cached session. Defaults to True.
+
+        Returns:
+            Union[requests_cache.CachedSession, requests.Session]: The shared session.
+        """
+        session = self._sessions.get(cache)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(cache)
+            if session is None:
+                session = self._sessions[cache] = self._build_session(cache)
+        return session
+
+    def close(self):
+        """
+        Close all shared sessions and their pooled connections.
+        """
+        with self._lock:
+            self._close_sessions()
+
+    def _close_sessions(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+    def _build_session(
+        self, cache: bool
+    ) -> Union[requests_cache.CachedSession, requests.Session]:
+        session = (
+            requests_cache.CachedSession(self.cache_name)
+            if cache
+            else requests.Session()
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        for host, pool_maxsize in self._host_pool_sizes.items():
+            session.mount(
+                host,
+                HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize),
+            )
+        return session
+
+
+session_provider = SessionProvider()
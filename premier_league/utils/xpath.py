@@ -1,32 +1,103 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Union
+
+from lxml import etree
+
+from premier_league.utils.instrumentation import current_stats
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(expression: str) -> etree.XPath:
+    """
+    Compile an XPath expression once and reuse the compiled object on every later call.
+
+    Args:
+        expression (str): The XPath expression. Variables such as $match_week are bound at evaluation time.
+
+    Returns:
+        etree.XPath: The compiled XPath expression.
+    """
+    return etree.XPath(expression)
+
+
+def evaluate_xpath(node, xpath: Union[str, etree.XPath], **variables):
+    """
+    Evaluate an XPath expression against a node, compiling it first if it is a plain string.
+
+    Args:
+        node: The lxml element or tree to evaluate against.
+        xpath (Union[str, etree.XPath]): The XPath expression or compiled XPath object.
+        **variables: Values for the XPath variables of the expression.
+
+    Returns:
+        The result of the XPath evaluation.
+    """
+    if isinstance(xpath, str):
+        xpath = compile_xpath(xpath)
+    stats = current_stats()
+    if stats is None:
+        return xpath(node, **variables)
+    with stats.measure(f"xpath:{xpath.path}"):
+        return xpath(node, **variables)
 
 
 class RANKING:
-    CURRENT_RANKING: str = "//table[.//tr[1]/*[1][contains(normalize-space(), 'Pos')]]//tr//text()[normalize-space()]"
-    CUP_WINNER: str = "//table[contains(@class, 'infobox vcard')]//tbody//tr[.//th[contains(text(), 'Champions')]]//td//text()"
-    UEFA_WINNER: str = "//table[contains(@class, 'infobox vcalendar')]//tbody//tr[.//th[contains(text(), 'Champions')]]//td//text()"
-    TEAMS: str = "//table[.//tr[1]/*[1][contains(normalize-space(), 'Pos')]]//tr[position() > 1]/th[1]//text()[normalize-space()]"
+    CURRENT_RANKING: etree.XPath = compile_xpath(
+        "//table[.//tr[1]/*[1][contains(normalize-space(), 'Pos')]]//tr//text()[normalize-space()]"
+    )
+    CUP_WINNER: etree.XPath = compile_xpath(
+        "//table[contains(@class, 'infobox vcard')]//tbody//tr[.//th[contains(text(), 'Champions')]]//td//text()"
+    )
+    UEFA_WINNER: etree.XPath = compile_xpath(
+        "//table[contains(@class, 'infobox vcalendar')]//tbody//tr[.//th[contains(text(), 'Champions')]]//td//text()"
+    )
+    TEAMS: etree.XPath = compile_xpath(
+        "//table[.//tr[1]/*[1][contains(normalize-space(), 'Pos')]]//tr[position() > 1]/th[1]//text()[normalize-space()]"
+    )
+    # Variables: $tournament
+    EUROPEAN_QUALIFIED_TEAMS: etree.XPath = compile_xpath(
+        "//tr[.//th/a[contains(text(), $tournament)]]/th/a/@title"
+    )
 
 
 class PLAYERS:
-    PLAYER_STATS: str = "//div[@class='data']//table//tr//td//text()"
-    TRANSFER_TABLES: str = '//div[@class="box"]'
-    TRANSFER_HEADER: str = './/div[@class="head"]/h2/text()'
-    TRANSFER_DATA: str = './/div[@class="data"]//table//tr//text()'
+    PLAYER_STATS: etree.XPath = compile_xpath(
+        "//div[@class='data']//table//tr//td//text()"
+    )
+    TRANSFER_TABLES: etree.XPath = compile_xpath('//div[@class="box"]')
+    TRANSFER_HEADER: etree.XPath = compile_xpath('.//div[@class="head"]/h2/text()')
+    TRANSFER_DATA: etree.XPath = compile_xpath(
+        './/div[@class="data"]//table//tr//text()'
+    )
 
 
 class MATCHES:
-    @staticmethod
-    def match_report_url(match_week: Optional[int] = 1) -> str:
-        return f"//td[@data-stat='match_report'][not(../td[@data-stat='notes'][contains(text(), 'Match Cancelled') or contains(text(), 'Match awarded')])][../th[@data-stat='gameweek' and number(text()) >= number({match_week})]]/a[text()='Match Report']/@href"
-
-    NEXT_MATCH_ROW: str = (
-        f"//td[@data-stat='match_report']/a[text()='Head-to-Head']/@href"
-    )
-    A_TAG: str = "'.//a//text()'"
-    GAME_TABLE: str = "//table"
-    GAME_HEADER: str = '//div[contains(text(), "Matchweek")]//text()'
-    GAME_STATS: str = '//div[@class="scorebox"]/div'
-    GAME_VENUE_DATE: str = "./span//@data-venue-date"
-    GAME_VENUE_TIME: str = "./span//@data-venue-time"
-    GAME_GOALS: str = './/div[@class="score"]//text()'
+    # Variables: $match_week
+    MATCH_REPORT_URL: etree.XPath = compile_xpath(
+        "//td[@data-stat='match_report'][not(../td[@data-stat='notes'][contains(text(), 'Match Cancelled') or contains(text(), 'Match awarded')])][../th[@data-stat='gameweek' and number(text()) >= number($match_week)]]/a[text()='Match Report']/@href"
+    )
+    NEXT_MATCH_ROW: etree.XPath = compile_xpath(
+        "//td[@data-stat='match_report']/a[text()='Head-to-Head']/@href"
+    )
+    PAGE_TITLE: etree.XPath = compile_xpath("//h1//text()")
+    A_TAG: etree.XPath = compile_xpath(".//a//text()")
+    A_HREF: etree.XPath = compile_xpath(".//a//@href")
+    CHILD_DIVS: etree.XPath = compile_xpath("./div")
+    GAME_TABLE: etree.XPath = compile_xpath("//table")
+    GAME_HEADER: etree.XPath = compile_xpath(
+        '//div[contains(text(), "Matchweek")]//text()'
+    )
+    GAME_STATS: etree.XPath = compile_xpath('//div[@class="scorebox"]/div')
+    GAME_VENUE_DATE: etree.XPath = compile_xpath("./span//@data-venue-date")
+    GAME_VENUE_TIME: etree.XPath = compile_xpath("./span//@data-venue-time")
+    GAME_GOALS: etree.XPath = compile_xpath('.//div[@class="score"]//text()')
+    # Relative to a table
+    TABLE_HEADER_CELLS: etree.XPath = compile_xpath(
+        "(./thead/tr)[last()]/th | (./thead/tr)[last()]/td"
+    )
+    TABLE_BODY_ROWS: etree.XPath = compile_xpath("./tbody/tr")
+    TABLE_ROW_CELLS: etree.XPath = compile_xpath("./th | ./td")
+    TABLE_FOOT_ROWS: etree.XPath = compile_xpath("./tfoot/tr")
+    TABLE_POSSESSION: etree.XPath = compile_xpath(
+        "(.//tr[th[normalize-space()='Possession']]/following-sibling::tr[td])[1]/td"
+    )
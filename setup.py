@@ -15,6 +15,7 @@ extras = {
         "gunicorn==23.0.0",
     ],
     "lambda": ["boto3==1.37.18"],
+    "columnar": ["pyarrow==19.0.1"],
 }
 extras["all"] = list({pkg for deps in extras.values() for pkg in deps})
 
@@ -41,5 +42,7 @@ setup(
     ],
     extras_require=extras,
     include_package_data=True,
+    # The bundled match database: a (gzipped) SQLite snapshot, or the legacy SQL dump.
+    package_data={"premier_league": ["data/*.db.gz", "data/*.db", "data/*.sql"]},
     python_requires=">=3.9",
 )
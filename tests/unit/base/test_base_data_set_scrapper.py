@@ -0,0 +1,386 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from premier_league.base import BaseDataSetScrapper
+from premier_league.utils.page_store import PageStore
+from premier_league.utils.pipeline import run_pipeline
+from premier_league.utils.rate_limit import (
+    TokenBucket,
+    parse_retry_after,
+    request_with_backoff,
+)
+
+
+@pytest.fixture
+def scrapper(tmp_path):
+    """Fixture to create a BaseDataSetScrapper with its cache directory in a temporary path."""
+    return BaseDataSetScrapper(cache_dir=tmp_path / "cache")
+
+
+class TestScrapeAndProcessAll:
+    """Test suite for BaseDataSetScrapper.scrape_and_process_all."""
+
+    def test_sequential_fallback(self, scrapper):
+        """Test that the sequential loop is used when max_concurrency is 1."""
+        urls = ["https://example.com/1", "https://example.com/2"]
+        with patch.object(
+            scrapper, "fetch_page", side_effect=["page1", "page2"]
+        ) as mock_fetch:
+            results = scrapper.scrape_and_process_all(urls, rate_limit=0)
+
+        assert results == ["page1", "page2"]
+        assert mock_fetch.call_count == 2
+
+    def test_concurrent_results_keep_input_order(self, scrapper):
+        """Test that concurrently fetched pages are processed and returned in input order."""
+        urls = [f"https://example.com/{i}" for i in range(6)]
+
+        def request_page(url, rate_limit=None):
+            # Later URLs finish first to ensure ordering does not depend on completion order.
+            time.sleep(0.01 * (6 - int(url[-1])))
+            return url
+
+        processed = []
+
+        def process_func(result, url):
+            processed.append(url)
+            return result.upper()
+
+        with patch.object(scrapper, "request_page", side_effect=request_page):
+            results = scrapper.scrape_and_process_all(
+                urls,
+                rate_limit=0,
+                return_html=False,
+                process_func=process_func,
+                max_concurrency=6,
+            )
+
+        assert results == [url.upper() for url in urls]
+        assert sorted(processed) == sorted(urls)
+
+    def test_concurrent_fetch_respects_host_budget(self, scrapper):
+        """Test that the per-host requests-per-second budget spaces out request starts."""
+        urls = [f"https://budget.example.com/{i}" for i in range(4)]
+        start_times = []
+
+        def get(url, **kwargs):
+            start_times.append(time.monotonic())
+            return MagicMock(status_code=200, text=url, from_cache=False)
+
+        with patch("requests.Session.get", side_effect=get):
+            results = scrapper.scrape_and_process_all(
+                urls,
+                return_html=False,
+                max_concurrency=4,
+                requests_per_second=20,
+            )
+
+        start_times.sort()
+        assert sorted(results) == urls
+        assert start_times[-1] - start_times[0] >= 0.14
+
+    def test_concurrent_failed_pages_are_dropped(self, scrapper):
+        """Test that failed requests are not included in the results."""
+        urls = ["https://example.com/1", "https://example.com/2"]
+        with patch.object(
+            scrapper, "request_page", side_effect=[None, "<html></html>"]
+        ):
+            results = scrapper.scrape_and_process_all(
+                urls, rate_limit=0, return_html=False, max_concurrency=2
+            )
+
+        assert results == ["<html></html>"]
+
+
+class TestRequestPage:
+    """Test suite for BaseDataSetScrapper.request_page."""
+
+    def test_rate_limited_request_is_retried(self, scrapper):
+        """Test that a 429 response is retried after the Retry-After delay instead of exiting."""
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        throttled.from_cache = False
+        success = MagicMock(status_code=200, text="<html></html>", from_cache=False)
+
+        with patch(
+            "requests.Session.get", side_effect=[throttled, success]
+        ) as mock_get, patch("premier_league.utils.rate_limit.time.sleep"):
+            html = scrapper.request_page("https://retry.example.com/1")
+
+        assert html == "<html></html>"
+        assert mock_get.call_count == 2
+
+    def test_persistent_rate_limit_returns_none(self, scrapper):
+        """Test that a page is skipped once all retries are throttled."""
+        throttled = MagicMock(status_code=429, headers={}, from_cache=False)
+
+        with patch("requests.Session.get", return_value=throttled) as mock_get, patch(
+            "premier_league.utils.rate_limit.time.sleep"
+        ):
+            html = scrapper.request_page("https://throttled.example.com/1")
+
+        assert html is None
+        assert mock_get.call_count == 6
+
+
+class TestTokenBucket:
+    """Test suite for the TokenBucket rate limiter."""
+
+    def test_reservations_are_spaced_by_rate(self):
+        """Test that reservations beyond the capacity are delayed according to the rate."""
+        bucket = TokenBucket(rate=2, capacity=1)
+        delays = [bucket.reserve() for _ in range(3)]
+        assert delays[0] == 0
+        assert delays[1] == pytest.approx(0.5, abs=0.01)
+        assert delays[2] == pytest.approx(1.0, abs=0.01)
+
+    def test_penalize_and_reward_adapt_rate(self):
+        """Test that throttling halves the rate and successes recover it up to the maximum."""
+        bucket = TokenBucket(rate=4, capacity=1)
+        bucket.penalize()
+        assert bucket.rate == 2
+        for _ in range(20):
+            bucket.reward()
+        assert bucket.rate == 4
+
+    def test_retry_after_blocks_bucket(self):
+        """Test that a Retry-After delay blocks further reservations."""
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.penalize(retry_after=5)
+        assert bucket.reserve() == pytest.approx(5, abs=0.1)
+
+    def test_lookup_skips_penalized_bucket(self):
+        """Test that responses found by lookup are returned without waiting on the bucket."""
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.penalize(retry_after=5)
+        cached = MagicMock(status_code=200, from_cache=True)
+        send = MagicMock()
+
+        start = time.monotonic()
+        assert request_with_backoff(send, bucket, lookup=lambda: cached) is cached
+        assert time.monotonic() - start < 0.5
+        send.assert_not_called()
+
+    def test_parse_retry_after(self):
+        """Test parsing of both Retry-After header formats."""
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestPageStore:
+    """Test suite for the persistent page store."""
+
+    def test_round_trip_and_index(self, tmp_path):
+        """Test that pages are stored compressed and indexed with their status and size."""
+        store = PageStore(tmp_path, compression="gz")
+        html = "<html><body>Bukayo Saka – Arsenal</body></html>"
+        store.put("https://fbref.com/en/matches/abc/", html)
+
+        assert store.get("https://fbref.com/en/matches/abc/") == html
+        assert store.get("https://fbref.com/en/matches/def/") is None
+        info = store.info("https://fbref.com/en/matches/abc/")
+        assert info["status"] == 200
+        assert info["size"] == len(html.encode("utf-8"))
+        assert len(store) == 1
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_missing_file_is_treated_as_miss(self, tmp_path):
+        """Test that an index entry whose file was removed is dropped."""
+        store = PageStore(tmp_path, compression="gz")
+        store.put("https://example.com/", "<html></html>")
+        for path in tmp_path.rglob("*.html.gz"):
+            path.unlink()
+
+        assert store.get("https://example.com/") is None
+        assert "https://example.com/" not in store
+
+    def test_persisted_pages_skip_the_network(self, scrapper):
+        """Test that a second run with persist=True is served entirely from the page store."""
+        urls = ["https://example.com/1", "https://example.com/2"]
+        with patch.object(
+            scrapper, "request_page", side_effect=lambda url, rate_limit=None: url
+        ) as mock_request:
+            first = scrapper.scrape_and_process_all(
+                urls, rate_limit=0, return_html=False, persist=True
+            )
+            second = scrapper.scrape_and_process_all(
+                urls,
+                rate_limit=0,
+                return_html=False,
+                persist=True,
+                max_concurrency=2,
+            )
+
+        assert first == second == urls
+        assert mock_request.call_count == 2
+
+    def test_pages_are_not_persisted_by_default(self, scrapper):
+        """Test that pages are only stored when persist is requested."""
+        with patch.object(scrapper, "request_page", return_value="<html></html>"):
+            scrapper.scrape_and_process_all(["https://example.com/"], rate_limit=0)
+
+        assert len(scrapper.page_store) == 0
+
+
+class TestPipeline:
+    """Test suite for the pipelined fetch and parse stages."""
+
+    URLS = [f"https://example.com/{i}" for i in range(6)]
+
+    @staticmethod
+    def request_page(url, rate_limit=None):
+        return f"<html><body><p>{url[-1]}</p></body></html>"
+
+    def test_ordered_results_and_caller_thread_processing(self, scrapper):
+        """Test that parsed pages are processed on the calling thread in input order."""
+        caller = threading.get_ident()
+        parse_threads, process_threads = set(), set()
+
+        def parse_func(page, url=None):
+            parse_threads.add(threading.get_ident())
+            # Earlier pages take longer to parse, so completion order is reversed.
+            time.sleep(0.005 * (6 - int(url[-1])))
+            return page.xpath("//p/text()")[0]
+
+        def process_func(result, url=None):
+            process_threads.add(threading.get_ident())
+            return int(result)
+
+        with patch.object(scrapper, "request_page", side_effect=self.request_page):
+            results = scrapper.scrape_and_process_all(
+                self.URLS,
+                rate_limit=0,
+                parse_func=parse_func,
+                process_func=process_func,
+                parse_workers=3,
+            )
+
+        assert results == list(range(6))
+        assert caller not in parse_threads
+        assert process_threads == {caller}
+
+    def test_unordered_results(self, scrapper):
+        """Test that unordered mode returns every result."""
+        with patch.object(scrapper, "request_page", side_effect=self.request_page):
+            results = scrapper.scrape_and_process_all(
+                self.URLS,
+                rate_limit=0,
+                return_html=False,
+                parse_func=lambda html, url=None: url,
+                parse_workers=2,
+                ordered=False,
+            )
+
+        assert sorted(results) == self.URLS
+
+    def test_parse_errors_propagate(self, scrapper):
+        """Test that an exception raised by a parse worker is re-raised on the calling thread."""
+
+        def parse_func(page, url=None):
+            raise ValueError("bad page")
+
+        with patch.object(scrapper, "request_page", side_effect=self.request_page):
+            with pytest.raises(ValueError, match="bad page"):
+                scrapper.scrape_and_process_all(
+                    self.URLS, rate_limit=0, parse_func=parse_func, parse_workers=2
+                )
+
+    def test_backpressure_bounds_fetched_pages(self):
+        """Test that fetching waits for the parse workers when the queue is full."""
+        fetched, parsed = [], []
+
+        def parse(result, url):
+            time.sleep(0.02)
+            parsed.append(url)
+            # Fetched pages never run ahead of parsed ones by more than the queue,
+            # the workers and the page being handed over.
+            assert len(fetched) - len(parsed) <= 4
+            return url
+
+        def fetch(url):
+            fetched.append(url)
+            return url
+
+        results = []
+        run_pipeline(
+            self.URLS * 3,
+            fetch,
+            parse,
+            lambda url, result: results.append(result),
+            parse_workers=1,
+            queue_size=2,
+        )
+        assert results == self.URLS * 3
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_slow_results_bound_pages_in_flight(self, ordered):
+        """Test that a slow on_result holds back parsing and fetching instead of queueing pages."""
+        fetched, handled = [], []
+        in_flight = []
+
+        def fetch(url):
+            fetched.append(url)
+            return url
+
+        def on_result(url, result):
+            in_flight.append(len(fetched) - len(handled))
+            time.sleep(0.005)
+            handled.append(result)
+
+        urls = [f"https://example.com/{i}" for i in range(40)]
+        run_pipeline(
+            urls,
+            fetch,
+            lambda result, url: result,
+            on_result,
+            max_concurrency=2,
+            parse_workers=1,
+            ordered=ordered,
+            queue_size=1,
+        )
+        assert sorted(handled) == sorted(urls)
+        # The requests in flight, both queues, the parse worker, the page being handed to the fetched queue
+        # and the one being processed.
+        assert max(in_flight) <= 2 + 1 + 1 + 1 + 1 + 1
+
+    def test_reorder_window_bounds_pages_ahead(self):
+        """Test that pages after a slow one are not fetched beyond the reorder window."""
+        fetched = []
+        ahead = []
+
+        def fetch(url):
+            if url.endswith("/0"):
+                time.sleep(0.1)
+                ahead.append(len(fetched))
+            fetched.append(url)
+            return url
+
+        urls = [f"https://example.com/{i}" for i in range(20)]
+        results = []
+        run_pipeline(
+            urls,
+            fetch,
+            lambda result, url: result,
+            lambda url, result: results.append(result),
+            max_concurrency=3,
+            parse_workers=2,
+            reorder_window=5,
+        )
+        assert results == urls
+        # Only URLs 1 to 4 may be fetched while URL 0 is.
+        assert ahead == [4]
+
+    def test_sequential_path_applies_parse_func(self, scrapper):
+        """Test that parse_func is also applied when pipelining is disabled."""
+        with patch.object(scrapper, "request_page", side_effect=self.request_page):
+            results = scrapper.scrape_and_process_all(
+                self.URLS[:2],
+                rate_limit=0,
+                parse_func=lambda page, url=None: page.xpath("//p/text()")[0],
+            )
+
+        assert results == ["0", "1"]
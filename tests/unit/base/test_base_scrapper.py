@@ -0,0 +1,233 @@
+import http.server
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests_cache
+
+from premier_league.base import BaseScrapper, current_season_start
+from premier_league.utils.instrumentation import (
+    ScrapeStats,
+    collect_stats,
+    current_stats,
+)
+from premier_league.utils.rate_limit import rate_limiter
+from premier_league.utils.session import SessionProvider
+
+HTML = "<html><body><table><tr><td>Málaga</td></tr></table></body></html>"
+
+
+def make_response(content: bytes, content_type: str = "text/html"):
+    response = MagicMock()
+    response.content = content
+    response.headers = {"Content-Type": content_type}
+    response.encoding = (
+        content_type.split("charset=")[-1] if "=" in content_type else None
+    )
+    return response
+
+
+class TestParsing:
+    """Test suite for the parse paths of BaseScrapper."""
+
+    def test_parse_to_xml_uses_declared_charset(self):
+        """Test that the charset of the response headers is used to decode the page."""
+        response = make_response(HTML.encode("utf-8"), "text/html; charset=utf-8")
+        page = BaseScrapper.parse_to_xml(response)
+        assert page.xpath("//td/text()") == ["Málaga"]
+
+    def test_parse_to_xml_uses_page_charset(self):
+        """Test that the meta charset of the page is used when the headers do not declare one."""
+        html = HTML.replace("<html>", '<html><head><meta charset="utf-8"></head>')
+        page = BaseScrapper.parse_to_xml(make_response(html.encode("utf-8")))
+        assert page.xpath("//td/text()") == ["Málaga"]
+
+    @pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+    def test_request_url_page_parsers_agree(self, parser):
+        """Test that both parse paths produce the same tree content."""
+        scrapper = BaseScrapper(url="https://example.com/", parser=parser)
+        html = HTML.replace("<html>", '<html><head><meta charset="utf-8"></head>')
+        response = make_response(html.encode("utf-8"))
+        with patch.object(scrapper, "make_request", return_value=response):
+            page = scrapper.request_url_page()
+        assert page.xpath("//td/text()") == ["Málaga"]
+
+    def test_invalid_parser(self):
+        """Test that an unknown parser is rejected."""
+        with pytest.raises(ValueError, match="Invalid parser"):
+            BaseScrapper(url="https://example.com/", parser="html5lib")
+
+
+class TestSessionProvider:
+    """Test suite for the shared session provider."""
+
+    def test_scrappers_share_sessions(self):
+        """Test that every scrapper reuses the same pooled session."""
+        first = BaseScrapper(url="https://example.com/", cache=False)
+        second = BaseScrapper(url="https://example.com/", cache=False)
+        additional = BaseScrapper(
+            url="https://example.com/", requires_season=False, cache=False
+        )
+        assert first.session is second.session is additional.session
+
+    def test_host_adapters_use_configured_pool_size(self):
+        """Test that the scraped hosts get their own adapters with the configured pool size."""
+        provider = SessionProvider(pool_maxsize=3)
+        provider.configure(host_pool_sizes={"https://fbref.com": 1})
+        session = provider.get(cache=False)
+
+        assert session.get_adapter("https://fbref.com/en/")._pool_maxsize == 1
+        assert session.get_adapter("https://en.wikipedia.org/wiki/")._pool_maxsize == 3
+        assert session.get_adapter("https://example.com/")._pool_maxsize == 3
+        provider.close()
+
+
+class TestInstrumentation:
+    """Test suite for the per-stage instrumentation of the scrappers."""
+
+    def test_stages_are_recorded(self):
+        """Test that request, parse, XPath and cleaning stages are timed within collect_stats."""
+        body = HTML.encode("utf-8")
+        response = make_response(body, "text/html; charset=utf-8")
+        response.status_code = 200
+        events = []
+
+        with patch("requests.Session.get", return_value=response):
+            with collect_stats(callback=lambda *event: events.append(event)) as stats:
+                scrapper = BaseScrapper.additional_scrapper(
+                    "https://example.com/", cache=False, parser="html.parser"
+                )
+                scrapper.get_list_by_xpath("//td/text()")
+
+        assert stats["request"].count == 1
+        assert stats["request"].bytes == len(body)
+        assert stats["parse.bs4"].count == 1
+        assert stats["convert"].count == 1
+        assert stats["xpath://td/text()"].count == 1
+        assert stats["clean"].count == 1
+        assert {event[0] for event in events} == set(stats.stages)
+        assert list(stats.to_dataframe().columns) == [
+            "count",
+            "total_time",
+            "mean_time",
+            "min_time",
+            "max_time",
+            "bytes",
+        ]
+
+    def test_nothing_is_recorded_outside_collect_stats(self):
+        """Test that instrumentation is off by default."""
+        stats = ScrapeStats()
+        with collect_stats(stats):
+            pass
+        scrapper = BaseScrapper(url="https://example.com/", requires_season=False)
+        scrapper.page = BaseScrapper.parse_to_xml(make_response(HTML.encode("utf-8")))
+        scrapper.get_list_by_xpath("//td/text()")
+
+        assert current_stats() is None
+        assert stats.summary() == {}
+
+
+@pytest.fixture
+def etag_server():
+    """Fixture serving a page with an ETag, answering matching conditional requests with 304."""
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = HTML.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests_seen
+    server.shutdown()
+
+
+class TestCacheExpiry:
+    """Test suite for the season-aware cache expiry and conditional revalidation."""
+
+    def test_past_seasons_never_expire(self):
+        """Test that only pages of past seasons are cached forever."""
+        past = BaseScrapper(
+            url="https://example.com/{SEASON}/", target_season="2010-2011"
+        )
+        current = BaseScrapper(url="https://example.com/{SEASON}/", expire_cache=60)
+        no_season = BaseScrapper(url="https://example.com/", requires_season=False)
+
+        assert past.cache_expiry == requests_cache.NEVER_EXPIRE
+        assert current.cache_expiry == 60
+        assert no_season.cache_expiry == 7200
+
+    def test_current_season_start(self):
+        """Test that seasons roll over in August."""
+        assert current_season_start(datetime(2024, 7, 31)) == 2023
+        assert current_season_start(datetime(2024, 8, 1)) == 2024
+
+    def test_expired_pages_are_revalidated(self, etag_server, tmp_path):
+        """Test that an expired page is revalidated with a conditional request and served from the cache."""
+        url, requests_seen = etag_server
+        provider = SessionProvider(cache_name=str(tmp_path / "cache"))
+        with patch("premier_league.base.session_provider", provider):
+            scrapper = BaseScrapper(
+                url=f"{url}/", requires_season=False, expire_cache=0
+            )
+            first = scrapper.make_request()
+            second = scrapper.make_request()
+        provider.close()
+
+        assert requests_seen == [None, '"v1"']
+        assert not first.from_cache
+        assert second.from_cache and second.revalidated
+        assert second.content == first.content
+
+    def test_past_season_pages_are_not_refetched(self, etag_server, tmp_path):
+        """Test that a past season page is served from the cache without any request."""
+        url, requests_seen = etag_server
+        provider = SessionProvider(cache_name=str(tmp_path / "cache"))
+        with patch("premier_league.base.session_provider", provider):
+            scrapper = BaseScrapper(
+                url=f"{url}/{{SEASON}}/", target_season="2010-2011", expire_cache=0
+            )
+            scrapper.make_request()
+            response = scrapper.make_request()
+        provider.close()
+
+        assert requests_seen == [None]
+        assert response.from_cache
+
+    def test_cache_hits_skip_penalized_bucket(self, etag_server, tmp_path):
+        """Test that a cached page is served at once while its host is throttled."""
+        url, requests_seen = etag_server
+        provider = SessionProvider(cache_name=str(tmp_path / "cache"))
+        with patch("premier_league.base.session_provider", provider):
+            scrapper = BaseScrapper(
+                url=f"{url}/{{SEASON}}/", target_season="2010-2011", expire_cache=0
+            )
+            scrapper.make_request()
+            rate_limiter.bucket(scrapper.url).penalize(retry_after=2)
+            start = time.monotonic()
+            response = scrapper.make_request()
+            elapsed = time.monotonic() - start
+        provider.close()
+
+        assert response.from_cache
+        assert requests_seen == [None]
+        assert elapsed < 0.5
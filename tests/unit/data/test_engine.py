@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from premier_league.data.engine import (
+    create_sqlite_engine,
+    dispose_engines,
+    get_engine,
+    session_factory,
+    session_scope,
+)
+from premier_league.data.models import Base, League
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "premier_league.db"))
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestSQLiteEngine:
+    def test_pragmas(self, file_engine):
+        with file_engine.connect() as connection:
+            pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1
+            assert pragma("cache_size") == -65536
+            assert pragma("mmap_size") == 268435456
+            assert pragma("temp_store") == 2
+
+    def test_pragmas_override(self, tmp_path):
+        engine = create_sqlite_engine(
+            str(tmp_path / "premier_league.db"), pragmas={"synchronous": "FULL"}
+        )
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+        engine.dispose()
+
+    def test_in_memory_engine_shares_database(self):
+        engine = create_sqlite_engine()
+        Base.metadata.create_all(engine)
+        with session_scope(engine) as session:
+            session.add(League(name="Premier League", up_to_date_season="2023-2024"))
+        with session_scope(engine) as session:
+            assert session.query(League).count() == 1
+        engine.dispose()
+
+    def test_read_while_writing(self, file_engine):
+        with session_scope(file_engine) as session:
+            session.add(League(name="Premier League", up_to_date_season="2023-2024"))
+
+        with file_engine.connect() as writer:
+            transaction = writer.begin()
+            writer.execute(text("UPDATE league SET up_to_date_season = '2024-2025'"))
+
+            # The uncommitted write neither blocks nor leaks into a reader on another thread.
+            seasons = []
+
+            def read():
+                with session_scope(file_engine) as session:
+                    seasons.append(session.query(League.up_to_date_season).scalar())
+
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(timeout=5)
+            assert seasons == ["2023-2024"]
+            transaction.commit()
+
+        with session_scope(file_engine) as session:
+            assert session.query(League.up_to_date_season).scalar() == "2024-2025"
+
+    def test_session_scope_rolls_back_on_error(self, file_engine):
+        with pytest.raises(RuntimeError):
+            with session_scope(file_engine) as session:
+                session.add(League(name="La Liga", up_to_date_season="2023-2024"))
+                session.flush()
+                raise RuntimeError("failed")
+
+        with session_scope(session_factory(file_engine)) as session:
+            assert session.query(League).count() == 0
+
+    def test_session_factory_is_thread_local(self, file_engine):
+        registry = session_factory(file_engine)
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(registry()))
+        thread.start()
+        thread.join()
+        assert registry() is registry()
+        assert sessions[0] is not registry()
+        registry.remove()
+
+    def test_get_engine_is_cached(self, tmp_path):
+        path = str(tmp_path / "premier_league.db")
+        try:
+            assert get_engine(path) is get_engine(path)
+            assert get_engine(path) is not get_engine(str(tmp_path / "other.db"))
+        finally:
+            dispose_engines()
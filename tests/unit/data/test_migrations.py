@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, or_, select
+
+from premier_league.data.engine import create_sqlite_engine
+from premier_league.data.migrations import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    Migration,
+    add_column,
+    create_indexes,
+    migrate,
+    schema_version,
+)
+from premier_league.data.models import Base, Game
+
+NEW_INDEXES = ("idx_game_home_team_date", "idx_game_away_team_date")
+
+
+@pytest.fixture
+def old_engine():
+    """An engine on a database created before the migrations, without their indexes."""
+    engine = create_sqlite_engine()
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for name in NEW_INDEXES:
+            connection.exec_driver_sql(f"DROP INDEX {name}")
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+class TestMigrations:
+    def test_upgrades_existing_database(self, old_engine):
+        assert not index_names(old_engine, "game") & set(NEW_INDEXES)
+
+        assert migrate(old_engine) == len(MIGRATIONS)
+        assert index_names(old_engine, "game") >= set(NEW_INDEXES)
+        with old_engine.connect() as connection:
+            assert schema_version(connection) == SCHEMA_VERSION
+
+        # Applied migrations are not run again.
+        assert migrate(old_engine) == 0
+
+    def test_team_history_uses_indexes(self, old_engine):
+        migrate(old_engine)
+        statement = (
+            select(Game.id)
+            .where(
+                Game.date < datetime(2024, 1, 1),
+                or_(Game.home_team_id == "ars", Game.away_team_id == "ars"),
+            )
+            .order_by(Game.date.desc())
+            .limit(10)
+        )
+        sql = str(statement.compile(old_engine, compile_kwargs={"literal_binds": True}))
+        with old_engine.connect() as connection:
+            plan = " ".join(
+                row[3]
+                for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+        assert all(name in plan for name in NEW_INDEXES)
+
+    def test_failed_migration_keeps_version(self, old_engine):
+        def add_attendance(connection):
+            add_column(connection, "game", "attendance INTEGER")
+            add_column(connection, "game", "attendance INTEGER")
+
+        def fail(connection):
+            raise RuntimeError("failed")
+
+        migrations = [
+            Migration(1, "Add attendance", add_attendance),
+            Migration(2, "Broken", fail),
+        ]
+        with pytest.raises(RuntimeError):
+            migrate(old_engine, migrations)
+
+        columns = {column["name"] for column in inspect(old_engine).get_columns("game")}
+        assert "attendance" in columns
+        with old_engine.connect() as connection:
+            assert schema_version(connection) == 1
+
+    def test_failed_migration_rolls_back_its_ddl(self, old_engine):
+        def create_then_fail(connection):
+            create_indexes(*NEW_INDEXES)(connection)
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            migrate(
+                old_engine, [Migration(1, "Indexes then failure", create_then_fail)]
+            )
+
+        assert not index_names(old_engine, "game") & set(NEW_INDEXES)
+        with old_engine.connect() as connection:
+            assert schema_version(connection) == 0
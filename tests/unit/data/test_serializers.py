@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from premier_league.data.engine import create_sqlite_engine, session_scope
+from premier_league.data.models import Base, Game
+from premier_league.data.serializers import ModelSerializer
+
+
+@pytest.fixture
+def games_engine():
+    engine = create_sqlite_engine()
+    Base.metadata.create_all(engine)
+    with session_scope(engine) as session:
+        session.add_all(
+            [
+                Game(
+                    id="g1",
+                    home_goals=2,
+                    date=datetime(2024, 8, 17),
+                    season="2024-2025",
+                ),
+                Game(
+                    id="g2",
+                    home_goals=None,
+                    date=datetime(2024, 8, 24),
+                    season="2024-2025",
+                ),
+            ]
+        )
+    yield engine
+    engine.dispose()
+
+
+class TestModelSerializer:
+    def test_rows_match_to_dict(self, games_engine):
+        serializer = ModelSerializer(Game)
+        with session_scope(games_engine) as session:
+            rows = session.execute(select(*serializer.columns).order_by(Game.id)).all()
+            games = session.query(Game).order_by(Game.id).all()
+            assert serializer.to_dicts(rows) == [game.to_dict() for game in games]
+            assert serializer.instance_to_dict(games[0]) == games[0].to_dict()
+
+    def test_projection(self, games_engine):
+        serializer = ModelSerializer(Game, ["id", "date"])
+        with session_scope(games_engine) as session:
+            rows = session.execute(select(*serializer.columns).order_by(Game.id))
+            assert serializer.to_dicts(rows)[0] == {
+                "id": "g1",
+                "date": "2024-08-17T00:00:00",
+            }
+        with pytest.raises(ValueError, match="Unknown columns of game: goals"):
+            ModelSerializer(Game, ["id", "goals"])
+
+    def test_to_records(self, games_engine):
+        serializer = ModelSerializer(Game, ["id", "home_goals", "date", "match_week"])
+        with session_scope(games_engine) as session:
+            records = serializer.to_records(
+                session.execute(select(*serializer.columns).order_by(Game.id))
+            )
+        assert list(records.id) == ["g1", "g2"]
+        # A NULL turns the integer column into floats.
+        assert records.home_goals.dtype == np.float64
+        assert np.isnan(records.home_goals[1])
+        assert records.date[0] == np.datetime64("2024-08-17")
+        assert len(serializer.to_records([])) == 0
@@ -0,0 +1,98 @@
+import gzip
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+from premier_league.data.engine import dispose_engines
+from premier_league.data.initialize import init_db
+from premier_league.data.migrations import SCHEMA_VERSION, SEED_LEAGUES
+from premier_league.data.models import Game, League
+from premier_league.data.snapshot import (
+    build_snapshot,
+    install_database,
+    install_snapshot,
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # No bundled database: init_db creates the schema itself.
+    monkeypatch.setattr(
+        "premier_league.data.initialize.install_database", lambda db_path: None
+    )
+    yield tmp_path / "data"
+    dispose_engines()
+
+
+def user_version(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class TestSnapshot:
+    def test_init_db_skips_setup_of_current_databases(self, data_dir):
+        session = init_db("premier_league.db", "data")
+        assert [league.name for league in session.query(League)] == list(SEED_LEAGUES)
+        session.close()
+        assert user_version(data_dir / "premier_league.db") == SCHEMA_VERSION
+
+        statements = []
+        engine = session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        init_db("premier_league.db", "data").close()
+        event.remove(engine, "before_cursor_execute", listener)
+        assert statements == ["PRAGMA user_version"]
+
+    def test_build_and_install_snapshot(self, data_dir, tmp_path):
+        session = init_db("premier_league.db", "data")
+        session.add(Game(id="g1", season="2024-2025"))
+        session.commit()
+        session.close()
+
+        snapshot = tmp_path / "premier_league.db.gz"
+        build_snapshot(str(data_dir / "premier_league.db"), str(snapshot))
+        with gzip.open(snapshot, "rb") as snapshot_file:
+            assert snapshot_file.read(16) == b"SQLite format 3\x00"
+
+        installed = tmp_path / "installed.db"
+        install_snapshot(str(snapshot), str(installed))
+        assert user_version(installed) == SCHEMA_VERSION
+        connection = sqlite3.connect(installed)
+        assert connection.execute("SELECT id FROM game").fetchall() == [("g1",)]
+        connection.close()
+        assert [path.name for path in tmp_path.iterdir() if ".tmp" in path.name] == []
+
+    def test_install_database_prefers_snapshot(self, tmp_path):
+        package = tmp_path / "package"
+        (package / "data").mkdir(parents=True)
+        (package / "data" / "premier_league.sql").write_text(
+            "CREATE TABLE dump (id INTEGER);"
+        )
+        assert (
+            install_database(str(tmp_path / "a.db"), package)
+            == "data/premier_league.sql"
+        )
+
+        source = sqlite3.connect(tmp_path / "source.db")
+        source.execute("CREATE TABLE snapshot (id INTEGER)")
+        source.commit()
+        source.close()
+        build_snapshot(
+            str(tmp_path / "source.db"), str(package / "data" / "premier_league.db.gz")
+        )
+        assert (
+            install_database(str(tmp_path / "b.db"), package)
+            == "data/premier_league.db.gz"
+        )
+        connection = sqlite3.connect(tmp_path / "b.db")
+        tables = connection.execute("SELECT name FROM sqlite_master").fetchall()
+        connection.close()
+        assert tables == [("snapshot",)]
+
+        assert install_database(str(tmp_path / "c.db"), tmp_path / "empty") is None
@@ -1,11 +1,51 @@
-from datetime import datetime
+import itertools
+import random
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import ANY, MagicMock, patch
 
+import pandas as pd
 import pytest
-
-from premier_league.data.models import Game, GameStats, Team
-from premier_league.match_statistics.match_statistics import MatchStatistics
+from lxml import etree
+from sqlalchemy import create_engine, event, or_
+from sqlalchemy.orm import sessionmaker
+
+import premier_league.match_statistics.match_statistics as match_statistics_module
+from premier_league.data.models import (
+    Base,
+    Game,
+    GameFeatures,
+    GameParse,
+    GameStats,
+    League,
+    StandingsSnapshot,
+    Team,
+)
+from premier_league.match_statistics.aggregation import (
+    GAME_STATS_SPEC,
+    StatSpec,
+    aggregate_team_stats,
+    position_groups,
+)
+from premier_league.match_statistics.feature_store import FeatureStore
+from premier_league.match_statistics.features import (
+    STAT_COLUMNS,
+    build_dataset,
+    lag_weights,
+    lagged_team_features,
+    load_game_stats,
+    load_games,
+    stream_dataset,
+)
+from premier_league.match_statistics.ingest import MatchIngestor, existing_game_ids
+from premier_league.match_statistics.listing import decode_cursor, encode_cursor
+from premier_league.match_statistics.match_statistics import (
+    PARSER_VERSION,
+    MatchStatistics,
+)
+from premier_league.match_statistics.tables import read_possession, read_stat_table
+from premier_league.ranking.snapshots import StandingsStore
+from premier_league.ranking.standings import team_standings
 
 
 @pytest.fixture
@@ -124,7 +164,7 @@ class TestMatchStatistics:
             columns_drop_result.tolist.return_value = ["other_column1", "other_column2"]
             df_instance.sort_values.return_value = df_instance
             df_instance.__getitem__.return_value = df_instance
-            match_statistics.create_dataset("test_output.csv")
+            match_statistics.create_dataset("test_output.csv", method="legacy")
 
             match_statistics.session.query.assert_any_call(Game)
             mock_df.assert_called_once()
@@ -145,7 +185,9 @@ class TestMatchStatistics:
             mock_df.return_value = df_instance
             df_instance.sort_values.return_value = df_instance
             match_statistics.session.reset_mock()
-            match_statistics.create_dataset("test_output.csv", rows_count=100)
+            match_statistics.create_dataset(
+                "test_output.csv", rows_count=100, method="legacy"
+            )
             match_statistics.session.query.assert_any_call(Game)
             match_statistics.session.query.return_value.options.return_value.order_by.assert_called_once_with(
                 ANY
@@ -218,42 +260,27 @@ class TestMatchStatistics:
         match_statistics.session.query.assert_any_call(ANY)
         assert result == ["Arsenal", "Chelsea", "Manchester City"]
 
-    def test_get_team_games(self, match_statistics):
+    def test_get_team_games(self, populated_statistics):
         """Test get_team_games method returns games for a specific team."""
-        team = MagicMock()
-        team.id = "team_id"
-        match_statistics.session.query.return_value.filter.return_value.first.return_value = (
-            team
+        session = populated_statistics.session
+        result = populated_statistics.get_team_games("ARS")
+
+        games = (
+            session.query(Game)
+            .filter(or_(Game.home_team_id == "ars", Game.away_team_id == "ars"))
+            .order_by(Game.date)
+            .all()
         )
+        assert len(result) == 12
+        assert result == [game.to_dict(include_relationships=True) for game in games]
+        assert list(result[0]["game_stats"][0]) == GameStats.__table__.columns.keys()
 
-        game1 = MagicMock()
-        game1.to_dict.return_value = {"id": "game1", "home_team": "Arsenal"}
-        game2 = MagicMock()
-        game2.to_dict.return_value = {"id": "game2", "away_team": "Arsenal"}
-
-        match_statistics.session.query.return_value.join.return_value.filter.return_value.options.return_value.all.return_value = [
-            game1,
-            game2,
-        ]
-
-        result = match_statistics.get_team_games("Arsenal")
-        match_statistics.session.query.assert_any_call(Team)
-        match_statistics.session.query.return_value.filter.assert_any_call(ANY)
-        match_statistics.session.query.assert_any_call(Game)
-        assert result == [
-            {"id": "game1", "home_team": "Arsenal"},
-            {"id": "game2", "away_team": "Arsenal"},
-        ]
-
-    def test_get_team_games_team_not_found(self, match_statistics):
+    def test_get_team_games_team_not_found(self, populated_statistics):
         """Test get_team_games raises an error when team is not found."""
-        match_statistics.session.query.return_value.filter.return_value.first.return_value = (
-            None
-        )
         with pytest.raises(
             ValueError, match="No team found with name: NonexistentTeam"
         ):
-            match_statistics.get_team_games("NonexistentTeam")
+            populated_statistics.get_team_games("NonexistentTeam")
 
     def test_get_total_game_count(self, match_statistics):
         """Test the get_total_game_count method."""
@@ -263,126 +290,93 @@ class TestMatchStatistics:
         count = match_statistics.get_total_game_count()
         assert count == 123
 
-    def test_get_games_by_season(self, match_statistics):
-        """Test get_games_by_season returns games for a specific season and match week."""
-        game1 = MagicMock()
-        game1.to_dict.return_value = {
-            "id": "game1",
-            "season": "2021-2022",
-            "match_week": 1,
-        }
-        game2 = MagicMock()
-        game2.to_dict.return_value = {
-            "id": "game2",
-            "season": "2021-2022",
-            "match_week": 1,
-        }
-
-        match_statistics.session.query.return_value.filter_by.return_value.all.return_value = [
-            game1,
-            game2,
-        ]
-        result = match_statistics.get_games_by_season("2021-2022", 1)
-        match_statistics.session.query.assert_any_call(Game)
-        match_statistics.session.query.return_value.filter_by.assert_called_once_with(
-            season="2021-2022", match_week=1
+    def test_get_games_by_season(self, populated_statistics):
+        """Test get_games_by_season returns games for a specific season and match week, with one query."""
+        session = populated_statistics.session
+        statements = []
+        event.listen(
+            session.bind,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
         )
-        assert result == [
-            {"id": "game1", "season": "2021-2022", "match_week": 1},
-            {"id": "game2", "season": "2021-2022", "match_week": 1},
-        ]
+        result = populated_statistics.get_games_by_season("2022-2023", 14)
+        assert len(statements) == 1
+
+        game = session.get(Game, "g14")
+        assert result == [game.to_dict(include_relationships=True)]
+        assert result[0]["home_team"] == {
+            "id": game.home_team_id,
+            "name": game.home_team.name,
+        }
+        assert result[0]["league"] == {"id": 1, "name": "Premier League"}
+        assert len(result[0]["game_stats"]) == 2
+        assert result[0]["date"] == game.date.isoformat()
 
     def test_get_games_by_season_invalid_format(self, match_statistics):
         """Test get_games_by_season raises an error with invalid season format."""
         with pytest.raises(ValueError, match="Invalid format for target_season"):
             match_statistics.get_games_by_season("20212022", 1)
 
-    def test_get_games_by_season_no_games(self, match_statistics):
+    def test_get_games_by_season_no_games(self, populated_statistics):
         """Test get_games_by_season raises an error when no games are found."""
-        match_statistics.session.query.return_value.filter_by.return_value.all.return_value = (
-            []
-        )
-
         with pytest.raises(
-            ValueError, match="No games found for season: 2021-2022 and match week: 1"
+            ValueError, match="No games found for season: 2021-2022 and match week: 14"
         ):
-            match_statistics.get_games_by_season("2021-2022", 1)
+            populated_statistics.get_games_by_season("2021-2022", 14)
 
-    def test_get_games_before_date(self, match_statistics):
+    def test_get_games_before_date(self, populated_statistics):
         """Test get_games_before_date returns games before a specific date."""
-        game1 = MagicMock()
-        game1.to_dict.return_value = {"id": "game1", "date": datetime(2022, 4, 15)}
-        game2 = MagicMock()
-        game2.to_dict.return_value = {"id": "game2", "date": datetime(2022, 4, 10)}
-
-        match_statistics.session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
-            game1,
-            game2,
-        ]
-        test_date = datetime(2022, 5, 1)
-        result = match_statistics.get_games_before_date(test_date, limit=5)
-        match_statistics.session.query.assert_any_call(Game)
-        match_statistics.session.query.return_value.filter.assert_called_once()
-        match_statistics.session.query.return_value.filter.return_value.order_by.assert_called_once()
-        match_statistics.session.query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(
-            5
+        session = populated_statistics.session
+        test_date = session.get(Game, "g20").date
+        result = populated_statistics.get_games_before_date(test_date, limit=5)
+
+        games = (
+            session.query(Game)
+            .filter(Game.date < test_date)
+            .order_by(Game.date.desc())
+            .limit(5)
+            .all()
         )
-        assert result == [
-            {"id": "game1", "date": datetime(2022, 4, 15)},
-            {"id": "game2", "date": datetime(2022, 4, 10)},
-        ]
+        assert [game["id"] for game in result] == ["g19", "g18", "g17", "g16", "g15"]
+        assert result == [game.to_dict(include_relationships=True) for game in games]
 
-    def test_get_games_before_date_with_team(self, match_statistics):
+    def test_get_games_before_date_with_team(self, populated_statistics):
         """Test get_games_before_date with team filter."""
-        team_id = "arsenal_id"
-        query_team_mock = MagicMock()
-        query_team_mock.filter_by.return_value.scalar.return_value = team_id
-
-        game = MagicMock()
-        game.to_dict.return_value = {"id": "game1", "home_team": "Arsenal"}
-
-        query_game_mock = MagicMock()
-        query_game_mock.filter.return_value = query_game_mock
-        query_game_mock.order_by.return_value = query_game_mock
-        query_game_mock.limit.return_value = query_game_mock
-        query_game_mock.all.return_value = [game]
-
-        def query_side_effect(*args, **kwargs):
-            print("query args:", args)
-            if args and args[0] is Team.id:
-                return query_team_mock
-            elif args and args[0] is Game:
-                return query_game_mock
-            else:
-                raise ValueError(f"Unexpected query argument(s): {args}")
+        test_date = populated_statistics.session.get(Game, "g20").date
+        result = populated_statistics.get_games_before_date(
+            test_date, limit=5, team="LIV"
+        )
 
-        match_statistics.session.query.side_effect = query_side_effect
-        test_date = datetime(2022, 5, 1)
-        result = match_statistics.get_games_before_date(
-            test_date, limit=5, team="Arsenal"
+        assert len(result) == 5
+        assert all(
+            "liv" in (game["home_team_id"], game["away_team_id"]) for game in result
         )
-        query_team_mock.filter_by.assert_called_once_with(name="Arsenal")
-        match_statistics.session.query.assert_any_call(Game)
-        assert result == [{"id": "game1", "home_team": "Arsenal"}]
+        assert all(game["date"] < test_date.isoformat() for game in result)
+        assert [game["date"] for game in result] == sorted(
+            (game["date"] for game in result), reverse=True
+        )
+        with pytest.raises(ValueError, match="No team found with name: Unknown"):
+            populated_statistics.get_games_before_date(test_date, team="Unknown")
 
-    def test_get_game_stats_before_date(self, match_statistics):
+    def test_get_game_stats_before_date(self, populated_statistics):
         """Test get_game_stats_before_date returns stats before a specific date."""
-        stat1 = MagicMock()
-        stat1.to_dict.return_value = {"id": "stat1", "xG": 2.5}
-        stat2 = MagicMock()
-        stat2.to_dict.return_value = {"id": "stat2", "xG": 1.8}
-
-        match_statistics.session.query.return_value.join.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
-            stat1,
-            stat2,
-        ]
-
-        test_date = datetime(2022, 5, 1)
-        result = match_statistics.get_game_stats_before_date(test_date)
-        match_statistics.session.query.assert_any_call(GameStats)
-        match_statistics.session.query.return_value.join.assert_called_once_with(Game)
-        match_statistics.session.query.return_value.join.return_value.filter.assert_called_once()
-        assert result == [{"id": "stat1", "xG": 2.5}, {"id": "stat2", "xG": 1.8}]
+        session = populated_statistics.session
+        test_date = session.get(Game, "g20").date
+        result = populated_statistics.get_game_stats_before_date(test_date, team="TOT")
+
+        stats = (
+            session.query(GameStats)
+            .join(Game)
+            .filter(Game.date < test_date, GameStats.team_id == "tot")
+            .order_by(Game.date.desc())
+            .limit(10)
+            .all()
+        )
+        assert len(result) == 8
+        assert result == [stat.to_dict() for stat in stats]
+        assert (
+            populated_statistics.get_game_stats_before_date(datetime(2000, 1, 1)) == []
+        )
 
     def test_get_game_stats_before_date_invalid_date(self, match_statistics):
         """Test get_game_stats_before_date raises error with invalid date type."""
@@ -473,24 +467,31 @@ class TestMatchStatistics:
 
     def test_process_up_to_date_url(self, match_statistics):
         """Test _process_up_to_date_url extracts correct URLs."""
-        match_statistics.pages = [MagicMock(), MagicMock()]
+
+        def schedule_page(rows):
+            cells = "".join(
+                f"<tr><th data-stat='gameweek'>{week}</th>"
+                f"<td data-stat='match_report'><a href='{url}'>Match Report</a></td>"
+                f"<td data-stat='notes'></td></tr>"
+                for week, url in rows
+            )
+            return etree.HTML(f"<html><body><table>{cells}</table></body></html>")
+
+        match_statistics.pages = [
+            schedule_page([(37, "/matches/abc123/"), (38, "/matches/def456/")]),
+            schedule_page([(1, "/matches/ghi789/")]),
+        ]
         with patch.object(match_statistics, "process_xpath") as mock_process:
             mock_process.return_value = [
                 "2021-2022 Premier League Scores",
-                "2021-2022 La Liga Scores",
+                "2022-2023 La Liga Scores",
             ]
             match_statistics.leagues = [
                 ("Premier League", "2021-2022", 38),
                 ("La Liga", "2021-2022", 38),
             ]
-            mock_page1 = match_statistics.pages[0]
-            mock_page1.xpath.return_value = ["/matches/abc123/", "/matches/def456/"]
-
-            mock_page2 = match_statistics.pages[1]
-            mock_page2.xpath.return_value = ["/matches/ghi789/"]
             result = match_statistics._process_up_to_date_url()
             assert result == [
-                "https://fbref.com/matches/abc123/",
                 "https://fbref.com/matches/def456/",
                 "https://fbref.com/matches/ghi789/",
             ]
@@ -503,3 +504,903 @@ class TestMatchStatistics:
         assert wrapped == (result, url)
         wrapped = MatchStatistics._wrap_result_with_url(None, url)
         assert wrapped is None
+
+
+@pytest.fixture
+def archive_statistics(tmp_path, monkeypatch):
+    """Fixture to create a MatchStatistics instance backed by an in-memory database and a temporary page store."""
+    monkeypatch.chdir(tmp_path)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    with patch(
+        "premier_league.match_statistics.match_statistics.init_db",
+        return_value=session,
+    ):
+        stats = MatchStatistics()
+    yield stats
+    session.close()
+
+
+def parsed_match(game_id, xg):
+    """Build the output of MatchStatistics._parse_match_page for a fake game."""
+    return {
+        "league": {"name": "Premier League", "match_week": 1},
+        "home_team": {"id": "home01", "name": "Arsenal"},
+        "away_team": {"id": "away01", "name": "Chelsea"},
+        "game": {
+            "id": game_id,
+            "home_team_id": "home01",
+            "away_team_id": "away01",
+            "home_team_points": 3,
+            "away_team_points": 0,
+            "home_goals": 2,
+            "away_goals": 0,
+            "date": datetime(2023, 8, 12, 15, 0),
+            "match_week": 1,
+            "season": "2023-2024",
+        },
+        "home_stats": {"xG": xg},
+        "away_stats": {"xG": 0.4},
+    }
+
+
+class TestReprocessArchive:
+    """Test suite for rebuilding games from the page archive."""
+
+    URL = "https://fbref.com/en/matches/abc123/Arsenal-Chelsea"
+
+    def test_rebuilds_only_stale_games(self, archive_statistics):
+        """Test that archived games are rebuilt once per parser version."""
+        archive_statistics.page_store.put(self.URL, "<html></html>")
+        with patch.object(
+            MatchStatistics,
+            "_parse_match_page",
+            return_value=parsed_match("abc123", 1.5),
+        ) as mock_parse:
+            assert archive_statistics.reprocess_archive(max_workers=1) == 1
+            assert archive_statistics.reprocess_archive(max_workers=1) == 0
+            assert mock_parse.call_count == 1
+
+        session = archive_statistics.session
+        assert session.query(Game).count() == 1
+        assert session.query(GameParse).one().parser_version == PARSER_VERSION
+
+    def test_in_process_rebuild_leaves_no_worker_store(self, archive_statistics):
+        """Test that parsing in the calling process does not open a page store of its own."""
+        archive_statistics.page_store.put(self.URL, "<html></html>")
+        with patch.object(
+            MatchStatistics,
+            "_parse_match_page",
+            return_value=parsed_match("abc123", 1.5),
+        ), patch(
+            "premier_league.match_statistics.match_statistics.PageStore"
+        ) as mock_store:
+            assert archive_statistics.reprocess_archive(max_workers=1) == 1
+        mock_store.assert_not_called()
+        assert match_statistics_module._archive_store is None
+
+    def test_replaces_existing_statistics(self, archive_statistics):
+        """Test that a forced rebuild overwrites the stored statistics instead of duplicating them."""
+        MatchIngestor(archive_statistics.session, PARSER_VERSION).add_all(
+            [parsed_match("abc123", 1.5)]
+        )
+        archive_statistics.page_store.put(self.URL, "<html></html>")
+        with patch.object(
+            MatchStatistics,
+            "_parse_match_page",
+            return_value=parsed_match("abc123", 2.5),
+        ):
+            assert archive_statistics.reprocess_archive(max_workers=1, force=True) == 1
+
+        home_stats = (
+            archive_statistics.session.query(GameStats)
+            .filter_by(game_id="abc123", team_id="home01")
+            .all()
+        )
+        assert [stats.xG for stats in home_stats] == [2.5]
+
+    def test_process_pool_skips_unparsable_pages(self, archive_statistics):
+        """Test that pages that fail to parse in the process pool are skipped."""
+        archive_statistics.page_store.put(self.URL, "<html><body></body></html>")
+        with patch("builtins.print"):
+            assert archive_statistics.reprocess_archive(max_workers=2) == 0
+        assert archive_statistics.session.query(Game).count() == 0
+
+
+STAT_TABLE_LABELS = {
+    "summary": "Player # Nation Pos Age Min Gls Ast Sh SoT xG npxG xAG SCA GCA Cmp Att Cmp% PrgP",
+    "passing": "Player # Nation Pos Age Min Cmp Att Cmp% TotDist Cmp Att Cmp% xAG xA KP 1/3 PPA CrsPA PrgP",
+    "defence": "Player # Nation Pos Age Min Tkl TklW Def_3rd Tkl Att Tkl% Lost Blocks Int Tkl+Int Clr Err",
+    "possession": "Player # Nation Pos Age Min Touches Att_Pen Att Succ Succ% Carries TotDist CPA Mis Dis",
+    "miscellaneous": "Player # Nation Pos Age Min CrdY CrdR Fls Fld Off PKwon PKcon Won Lost Won%",
+    "goal_keeper": "Player Nation Age Min SoTA Saves Save% PSxG Cmp Att Cmp% Att_(GK) Opp Stp Stp%",
+}
+
+
+def stat_table_html(labels, rng, players=8, data_stats=True):
+    """Build an fbref-like player statistics table with random values and a totals footer."""
+    labels = [label.replace("_", " ") for label in labels.split()]
+    positions = ["FW", "LW,FW", "AM", "CM", "DM,CM", "CB", "LB", "RB", "GK"]
+
+    def cell(index, label, value):
+        tag = "th" if label == "Player" else "td"
+        stat = f' data-stat="stat{index}"' if data_stats else ""
+        return f"<{tag}{stat}>{value}</{tag}>"
+
+    def row(player, footer=False):
+        cells = []
+        for index, label in enumerate(labels):
+            if label == "Player":
+                value = f"<a href='#'>{player}</a>"
+            elif label == "Pos":
+                value = "" if footer else rng.choice(positions)
+            elif label in ("Nation", "Age"):
+                value = "eng ENG" if label == "Nation" else "25-123"
+            elif label.endswith("%"):
+                value = rng.choice(["", f"{rng.random() * 100:.1f}"])
+            elif label in ("xG", "npxG", "xAG", "xA", "PSxG"):
+                value = f"{rng.random() * 2:.1f}"
+            else:
+                value = f"{rng.randint(0, 2500):,}"
+            cells.append(cell(index, label, value))
+        return "<tr>" + "".join(cells) + "</tr>"
+
+    header = "".join(
+        f"<th{f' data-stat={chr(34)}stat{index}{chr(34)}' if data_stats else ''}>{label}</th>"
+        for index, label in enumerate(labels)
+    )
+    body = "".join(row(f"Player {index}") for index in range(players))
+    return (
+        f"<table><thead><tr class='over_header'><th colspan='{len(labels)}'>Group</th></tr>"
+        f"<tr>{header}</tr></thead><tbody>{body}</tbody>"
+        f"<tfoot>{row(f'{players} Players', footer=True)}</tfoot></table>"
+    )
+
+
+def read_html_table(table):
+    """Read a table the way match pages used to be read, through pandas."""
+    return pd.read_html(etree.tostring(table), header=1)[0]
+
+
+class TestStatTables:
+    """Test suite for reading the statistics tables of match pages straight from lxml."""
+
+    @pytest.mark.parametrize("name", list(STAT_TABLE_LABELS))
+    @pytest.mark.parametrize("data_stats", [True, False])
+    def test_matches_read_html(self, name, data_stats):
+        """Test that tables are read into the same DataFrame as pd.read_html."""
+        html = stat_table_html(
+            STAT_TABLE_LABELS[name], random.Random(name), data_stats=data_stats
+        )
+        table = etree.HTML(html).xpath("//table")[0]
+
+        pd.testing.assert_frame_equal(read_stat_table(table), read_html_table(table))
+
+    def test_team_statistics_match_read_html(self):
+        """Test that the extracted team statistics are identical to those of the pandas tables."""
+        rng = random.Random(3)
+        for _ in range(100):
+            tables = [
+                etree.HTML(stat_table_html(labels, rng, players=14)).xpath("//table")[0]
+                for labels in STAT_TABLE_LABELS.values()
+            ]
+            # Every position group and at least one save percentage must be present.
+            try:
+                expected = MatchStatistics._fetch_corresponding_data_from_table(
+                    *map(read_html_table, tables), 55
+                )
+            except KeyError:
+                continue
+            if not pd.isna(expected["save_percentage"]):
+                break
+        else:
+            pytest.fail("Could not generate tables with every position group")
+
+        assert (
+            MatchStatistics._fetch_corresponding_data_from_table(
+                *map(read_stat_table, tables), 55
+            )
+            == expected
+        )
+
+    def test_possession(self):
+        """Test that the possession of both teams is read from the row after the Possession header."""
+        html = (
+            "<table><tr><th colspan='2'>Arsenal</th><th colspan='2'>Chelsea</th></tr>"
+            "<tr><th colspan='4'>Possession</th></tr>"
+            "<tr><td><div><strong>63%</strong></div></td><td><div><strong>37%</strong></div></td></tr>"
+            "<tr><th colspan='4'>Passing Accuracy</th></tr>"
+            "<tr><td>80%</td><td>70%</td></tr></table>"
+        )
+        table = etree.HTML(html).xpath("//table")[0]
+
+        assert read_possession(table) == (63, 37)
+        with pytest.raises(ValueError, match="no possession row"):
+            read_possession(etree.HTML("<table><tr><td>1</td></tr></table>")[0][0])
+
+    def test_table_without_header(self):
+        """Test that tables without a header row are rejected."""
+        table = etree.HTML("<table><tbody><tr><td>1</td></tr></tbody></table>")
+        with pytest.raises(ValueError, match="no header row"):
+            read_stat_table(table.xpath("//table")[0])
+
+
+class TestAggregation:
+    """Test suite for the declarative aggregation of player tables into team statistics."""
+
+    TABLE = pd.DataFrame(
+        {
+            "Pos": ["LW,FW", "FW", "CM", "DM,CB", "CB", "WB", "GK", None],
+            "Sh": [3, 2, 1, 0, 1, 0, 0, 7],
+            "Cmp%": [80.0, None, 90.0, 70.0, 60.0, 50.0, 40.0, 72.5],
+        }
+    )
+
+    def test_position_groups(self):
+        """Test that players are grouped by their primary position, and the totals row falls in Total."""
+        assert position_groups(self.TABLE["Pos"]).tolist() == [
+            "FW",
+            "FW",
+            "MF",
+            "MF",
+            "DF",
+            "Total",
+            "GK",
+            "Total",
+        ]
+
+    def test_aggregates_by_spec(self):
+        """Test that sums and means are computed per position group or over the whole table."""
+        spec = {
+            "shots_FW": StatSpec("summary", "Sh", "sum", "FW"),
+            "shots_total": StatSpec("summary", "Sh", "sum", "Total"),
+            "shots_all": StatSpec("summary", "Sh"),
+            "accuracy_FW": StatSpec("summary", "Cmp%", "mean", "FW"),
+            "accuracy_DF": StatSpec("summary", "Cmp%", "sum", "DF"),
+        }
+        data = aggregate_team_stats({"summary": self.TABLE}, spec)
+
+        assert data == {
+            "shots_FW": 5,
+            "shots_total": 7,
+            "shots_all": 14,
+            "accuracy_FW": 80.0,
+            "accuracy_DF": 60.0,
+        }
+        assert type(data["shots_FW"]) is int
+        assert type(data["accuracy_DF"]) is float
+
+    def test_missing_position_group(self):
+        """Test that a missing position group is an error, as the match cannot be aggregated."""
+        spec = {"shots_MF": StatSpec("summary", "Sh", "sum", "MF")}
+        with pytest.raises(KeyError, match="No MF player"):
+            aggregate_team_stats({"summary": self.TABLE.drop(index=[2, 3])}, spec)
+
+    def test_spec_covers_game_stats(self):
+        """Test that every GameStats column is computed by the spec, or is possession_rate."""
+        columns = {
+            column.name
+            for column in GameStats.__table__.columns
+            if column.name not in ("id", "game_id", "team_id", "possession_rate")
+        }
+        assert set(GAME_STATS_SPEC) == columns
+
+
+class TestMatchIngestor:
+    """Test suite for the batched ingestion of parsed matches."""
+
+    def test_commits_once_per_batch(self, archive_statistics):
+        """Test that matches are written in batches of batch_size, with one commit each."""
+        session = archive_statistics.session
+        ingestor = MatchIngestor(session, PARSER_VERSION, batch_size=2)
+        with patch.object(session, "commit", wraps=session.commit) as mock_commit:
+            for index in range(5):
+                ingestor.add(parsed_match(f"game{index}", index))
+            ingestor.add(None)
+            assert mock_commit.call_count == 2
+            assert session.query(Game).count() == 4
+
+            assert ingestor.flush() == 1
+            assert mock_commit.call_count == 3
+
+        assert ingestor.stored == 5
+        assert session.query(Game).count() == 5
+        assert session.query(GameStats).count() == 10
+        assert session.query(GameParse).count() == 5
+        assert session.query(Team).count() == 2
+        assert session.query(League).one().name == "Premier League"
+
+    def test_existing_games_are_skipped(self, archive_statistics):
+        """Test that ingesting the same matches again leaves the stored games untouched."""
+        session = archive_statistics.session
+        ingestor = MatchIngestor(session, PARSER_VERSION)
+        assert ingestor.add_all([parsed_match("abc123", 1.5)]) == 1
+        assert ingestor.add_all([parsed_match("abc123", 2.5)]) == 0
+
+        home_stats = session.query(GameStats).filter_by(team_id="home01").all()
+        assert [stats.xG for stats in home_stats] == [1.5]
+
+    def test_refreshes_standings_of_written_weeks(self, archive_statistics):
+        """Test that ingestion keeps the standings snapshots of the written seasons up to date."""
+        session = archive_statistics.session
+        second_week = parsed_match("game2", 1.0)
+        second_week["game"].update(match_week=2, home_goals=1, away_goals=1)
+        MatchIngestor(session, PARSER_VERSION).add_all(
+            [parsed_match("game1", 1.0), second_week]
+        )
+        store = StandingsStore(session)
+        assert [
+            row["points"] for row in store.table("Premier League", "2023-2024", 1)
+        ] == [3, 0]
+        assert [
+            row["points"] for row in store.table("Premier League", "2023-2024", 2)
+        ] == [4, 1]
+
+        # Replacing the second week game only recomputes the tables from that week.
+        session.query(StandingsSnapshot).filter_by(match_week=1).update({"played": 7})
+        session.commit()
+        second_week["game"].update(home_goals=0, away_goals=3)
+        MatchIngestor(session, PARSER_VERSION, replace=True).add_all([second_week])
+
+        assert [
+            row["played"] for row in store.table("Premier League", "2023-2024", 1)
+        ] == [7, 7]
+        assert store.table("Premier League", "2023-2024", 2) == team_standings(
+            session, "Premier League", "2023-2024"
+        )
+        assert store.trajectory("Premier League", "2023-2024", "Chelsea") == [
+            (1, 2),
+            (2, 1),
+        ]
+
+    def test_existing_game_ids(self, populated_statistics):
+        """Test that stored games are found with one query per chunk of ids."""
+        session = populated_statistics.session
+        candidates = [f"g{index}" for index in range(1, 31)] + ["g1"]
+        statements = []
+        event.listen(
+            session.bind,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        found = existing_game_ids(session, candidates, chunk_size=10)
+
+        assert found == {f"g{index}" for index in range(1, 25)}
+        assert len(statements) == 3
+        assert existing_game_ids(session, []) == set()
+
+    def test_update_data_set_only_fetches_missing_games(self, populated_statistics):
+        """Test that refresh planning skips the stored games without a query per game."""
+        urls = [
+            f"https://fbref.com/en/matches/{game_id}/Report"
+            for game_id in ("a1", "a2", "a1")
+        ]
+        populated_statistics.session.execute(
+            Game.__table__.update().where(Game.id == "g1").values(id="a1")
+        )
+        populated_statistics.session.commit()
+        with patch.object(
+            populated_statistics, "scrape_and_process_all", return_value=[]
+        ) as mock_scrape, patch.object(
+            populated_statistics, "_process_up_to_date_url", return_value=urls
+        ), patch.object(
+            populated_statistics.session,
+            "query",
+            wraps=populated_statistics.session.query,
+        ) as mock_query, patch(
+            "builtins.print"
+        ):
+            populated_statistics.update_data_set()
+
+        assert mock_scrape.call_args_list[1].args[0] == [urls[1]]
+        assert all(call.args[0] is not Game for call in mock_query.call_args_list)
+
+    def test_replace_invalidates_features(self, populated_statistics, tmp_path):
+        """Test that replaced statistics drop the stored features depending on them."""
+        session = populated_statistics.session
+        store = FeatureStore(session)
+        store.update(lag=2)
+
+        game = session.get(Game, "g1")
+        match_data = {
+            "league": {"name": "Premier League", "match_week": 1},
+            "home_team": {"id": game.home_team_id, "name": game.home_team.name},
+            "away_team": {"id": game.away_team_id, "name": game.away_team.name},
+            "game": {
+                column: getattr(game, column)
+                for column in (
+                    "id",
+                    "home_team_id",
+                    "away_team_id",
+                    "home_team_points",
+                    "away_team_points",
+                    "home_goals",
+                    "away_goals",
+                    "date",
+                    "match_week",
+                    "season",
+                )
+            },
+            "home_stats": {"xG": 42.0},
+            "away_stats": {"xG": 0.1},
+        }
+        ingestor = MatchIngestor(session, PARSER_VERSION, replace=True)
+        assert ingestor.add_all([match_data]) == 1
+
+        assert store.update(lag=2) > 0
+        populated_statistics.create_dataset(tmp_path / "fresh.csv", lag=2)
+        populated_statistics.create_dataset(
+            tmp_path / "stored.csv", lag=2, use_feature_store=True
+        )
+        assert (tmp_path / "stored.csv").read_text() == (
+            tmp_path / "fresh.csv"
+        ).read_text()
+
+
+@pytest.fixture
+def populated_statistics(archive_statistics):
+    """Fixture filling the in-memory database with two seasons of a four team league."""
+    session = archive_statistics.session
+    rng = random.Random(7)
+    session.add(
+        League(
+            id=1,
+            name="Premier League",
+            up_to_date_season="2021-2022",
+            up_to_date_match_week=1,
+        )
+    )
+    teams = ["ars", "che", "liv", "tot"]
+    for team in teams:
+        session.add(Team(id=team, name=team.upper(), league_id=1))
+
+    game_number = 0
+    for season in (2021, 2022):
+        date = datetime(season, 8, 10)
+        for home, away in itertools.permutations(teams, 2):
+            game_number += 1
+            date += timedelta(days=rng.randint(2, 9))
+            session.add(
+                Game(
+                    id=f"g{game_number}",
+                    home_team_id=home,
+                    away_team_id=away,
+                    league_id=1,
+                    home_goals=rng.randint(0, 4),
+                    away_goals=rng.randint(0, 4),
+                    home_team_points=3,
+                    away_team_points=0,
+                    date=date,
+                    match_week=game_number,
+                    season=f"{season}-{season + 1}",
+                )
+            )
+            for team in (home, away):
+                stats = {
+                    column: rng.choice([rng.randint(0, 20), rng.random() * 3])
+                    for column in STAT_COLUMNS
+                }
+                stats["save_percentage"] = rng.choice([None, 0, 50.0, 75.0, 100.0])
+                session.add(GameStats(game_id=f"g{game_number}", team_id=team, **stats))
+    session.commit()
+    return archive_statistics
+
+
+class TestVectorizedDataset:
+    """Test suite for the vectorized lagged feature engine."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"lag": 3},
+            {"lag": 1},
+            {"lag": 2, "weights": "lin"},
+            {"lag": 3, "weights": "exp", "params": 0.7},
+            {"lag": 2, "rows_count": 7},
+        ],
+    )
+    def test_matches_legacy_dataset(self, populated_statistics, tmp_path, options):
+        """Test that the vectorized engine writes exactly the same CSV as the legacy engine."""
+        legacy_path = tmp_path / "legacy.csv"
+        vectorized_path = tmp_path / "vectorized.csv"
+        populated_statistics.create_dataset(legacy_path, method="legacy", **options)
+        populated_statistics.create_dataset(vectorized_path, **options)
+
+        assert legacy_path.read_text() == vectorized_path.read_text()
+        assert len(legacy_path.read_text().splitlines()) > 1
+
+    def test_lag_weights(self):
+        """Test that the most recent game gets the first weight."""
+        assert lag_weights(3) == [1, 1, 1]
+        assert lag_weights(3, "lin") == [3, 2, 1]
+        assert lag_weights(3, "exp", 0.5) == [0.5, 0.25, 0.125]
+
+    def test_invalid_method(self, match_statistics):
+        """Test that an unknown engine is rejected."""
+        with pytest.raises(ValueError, match="method must be either"):
+            match_statistics.create_dataset("test_output.csv", method="numba")
+
+
+class TestStreamingDataset:
+    """Test suite for the bounded memory dataset builder."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"lag": 3},
+            {"lag": 2, "weights": "lin"},
+            {"lag": 3, "weights": "exp", "params": 0.7},
+            {"lag": 2, "rows_count": 7},
+        ],
+    )
+    def test_matches_vectorized_dataset(self, populated_statistics, tmp_path, options):
+        """Test that the streaming builder writes exactly the same CSV as the vectorized engine."""
+        vectorized_path = tmp_path / "vectorized.csv"
+        streaming_path = tmp_path / "streaming.csv"
+        populated_statistics.create_dataset(vectorized_path, **options)
+        populated_statistics.create_dataset(
+            streaming_path, method="streaming", **options
+        )
+
+        assert streaming_path.read_text() == vectorized_path.read_text()
+
+    def test_chunks(self, populated_statistics):
+        """Test that the dataset is yielded in date ordered chunks of at most batch_size games."""
+        session = populated_statistics.session
+        chunks = list(stream_dataset(session, lag=2, weight_type="lin", batch_size=5))
+        games = load_games(session)
+        expected = build_dataset(
+            games, lagged_team_features(games, load_game_stats(session), 2, "lin")
+        )
+
+        assert len(chunks) > 2
+        assert all(len(chunk) <= 5 for chunk in chunks)
+        streamed = pd.concat(chunks, ignore_index=True)
+        assert streamed["date"].is_monotonic_increasing
+        pd.testing.assert_frame_equal(
+            streamed,
+            expected.sort_values("date", ignore_index=True),
+            check_dtype=False,
+        )
+
+    def test_empty_dataset(self, populated_statistics, tmp_path):
+        """Test that a header is still written when no game has enough previous games."""
+        output = tmp_path / "dataset.csv"
+        populated_statistics.create_dataset(output, lag=50, method="streaming")
+
+        assert len(output.read_text().splitlines()) == 1
+
+    def test_partitioned_chunks(self, populated_statistics, tmp_path):
+        """Test that chunks are appended to the partitions written by earlier chunks."""
+        pytest.importorskip("pyarrow")
+        import pyarrow.dataset as ds
+
+        from premier_league.match_statistics.export import DatasetWriter
+
+        output = tmp_path / "dataset"
+        session = populated_statistics.session
+        for _ in range(2):
+            with DatasetWriter(output, "parquet", ["season"]) as writer:
+                for chunk in stream_dataset(session, lag=2, batch_size=4):
+                    writer.write(chunk)
+
+        table = ds.dataset(output, format="parquet", partitioning="hive").to_table()
+        assert table.num_rows == len(
+            pd.concat(stream_dataset(session, lag=2), ignore_index=True)
+        )
+
+
+class TestColumnarExport:
+    """Test suite for the Parquet, Arrow IPC and Feather dataset exports."""
+
+    @pytest.mark.parametrize(
+        "file_name,output_format",
+        [
+            ("dataset.parquet", None),
+            ("dataset.feather", None),
+            ("dataset.arrow", None),
+            ("dataset.bin", "parquet"),
+        ],
+    )
+    def test_round_trip_matches_csv(
+        self, populated_statistics, tmp_path, file_name, output_format
+    ):
+        """Test that columnar datasets hold the CSV dataset with compact dtypes."""
+        pa = pytest.importorskip("pyarrow")
+        populated_statistics.create_dataset(tmp_path / "dataset.csv", lag=2)
+        populated_statistics.create_dataset(
+            tmp_path / file_name, lag=2, output_format=output_format
+        )
+
+        if output_format == "parquet" or file_name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(tmp_path / file_name)
+        else:
+            with pa.memory_map(str(tmp_path / file_name)) as source:
+                table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+
+        assert str(df["home_xG"].dtype) == "float32"
+        assert str(df["home_goals"].dtype) == "Int16"
+        assert str(df["date"].dtype).startswith("datetime64")
+        assert (df["league"] == "Premier League").all()
+
+        expected = pd.read_csv(tmp_path / "dataset.csv", parse_dates=["date"])
+        assert list(df.columns.drop("league")) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            df.drop(columns="league"),
+            expected,
+            check_dtype=False,
+            check_exact=False,
+            rtol=1e-6,
+        )
+
+    def test_partitioned_dataset(self, populated_statistics, tmp_path):
+        """Test that partitioned datasets are written into one directory per league and season."""
+        pytest.importorskip("pyarrow")
+        import pyarrow.dataset as ds
+
+        output = tmp_path / "dataset"
+        populated_statistics.create_dataset(
+            output,
+            lag=2,
+            output_format="parquet",
+            partition_by=["league", "season"],
+            columns=["date", "home_team", "home_xG", "home_goals"],
+        )
+
+        assert (output / "league=Premier%20League" / "season=2021-2022").is_dir()
+        assert (output / "league=Premier%20League" / "season=2022-2023").is_dir()
+        table = ds.dataset(output, format="parquet", partitioning="hive").to_table()
+        assert sorted(table.column_names) == sorted(
+            ["date", "home_team", "home_xG", "home_goals", "league", "season"]
+        )
+
+    def test_column_projection(self, populated_statistics, tmp_path):
+        """Test that only the requested columns are written."""
+        populated_statistics.create_dataset(
+            tmp_path / "dataset.csv", lag=2, columns=["date", "home_xG", "league"]
+        )
+        assert list(pd.read_csv(tmp_path / "dataset.csv").columns) == [
+            "date",
+            "league",
+            "home_xG",
+        ]
+
+        with pytest.raises(ValueError, match="Unknown columns: missing"):
+            populated_statistics.create_dataset(
+                tmp_path / "dataset.csv", lag=2, columns=["date", "missing"]
+            )
+
+    def test_invalid_options(self, match_statistics):
+        """Test that unknown formats and CSV partitioning are rejected."""
+        with pytest.raises(ValueError, match="Invalid output_format"):
+            match_statistics.create_dataset("dataset.csv", output_format="xlsx")
+        with pytest.raises(ValueError, match="partition_by is only supported"):
+            match_statistics.create_dataset("dataset.csv", partition_by=["season"])
+        with pytest.raises(ValueError, match="Invalid partition columns"):
+            match_statistics.create_dataset(
+                "dataset.parquet", partition_by=["home_team"]
+            )
+
+
+class TestFeatureStore:
+    """Test suite for the persistent feature store."""
+
+    def test_dataset_matches_vectorized_engine(self, populated_statistics, tmp_path):
+        """Test that datasets built from stored features are identical to freshly computed ones."""
+        options = {"lag": 2, "weights": "exp", "params": 0.8}
+        populated_statistics.create_dataset(tmp_path / "fresh.csv", **options)
+        populated_statistics.create_dataset(
+            tmp_path / "stored.csv", use_feature_store=True, **options
+        )
+        populated_statistics.create_dataset(
+            tmp_path / "reloaded.csv", use_feature_store=True, **options
+        )
+
+        fresh = (tmp_path / "fresh.csv").read_text()
+        assert (tmp_path / "stored.csv").read_text() == fresh
+        assert (tmp_path / "reloaded.csv").read_text() == fresh
+
+    def test_only_new_games_are_computed(self, populated_statistics):
+        """Test that features are only computed for games without stored features."""
+        store = FeatureStore(populated_statistics.session)
+        total = populated_statistics.get_total_game_count()
+
+        assert store.update(lag=2) == total
+        assert store.update(lag=2) == 0
+        assert store.update(lag=3) == total
+
+    def test_only_affected_seasons_are_recomputed(self, populated_statistics):
+        """Test that only the seasons of the teams of the missing games are recomputed."""
+        session = populated_statistics.session
+        store = FeatureStore(session)
+        store.update(lag=2)
+        session.query(GameFeatures).filter(GameFeatures.game_id == "g1").delete()
+        session.commit()
+
+        with patch(
+            "premier_league.match_statistics.feature_store.lagged_team_features",
+            wraps=lagged_team_features,
+        ) as spy:
+            assert store.update(lag=2) == 1
+        # g1 is ars against che in 2021-2022: every game of the season but the two between liv and tot.
+        games = spy.call_args.args[0]
+        assert len(games) == 10
+        assert set(games["season"]) == {"2021-2022"}
+
+        fresh = lagged_team_features(
+            load_games(session), load_game_stats(session), lag=2
+        )
+        loaded = store.load(lag=2)
+        key = ["game_id", "team_id"]
+        pd.testing.assert_frame_equal(
+            loaded.sort_values(key).reset_index(drop=True),
+            fresh.sort_values(key).reset_index(drop=True),
+        )
+
+    def test_changed_stats_invalidate_later_games(self, populated_statistics, tmp_path):
+        """Test that changing game statistics drops the features of later games of the team in that season."""
+        session = populated_statistics.session
+        store = FeatureStore(session)
+        store.update(lag=2)
+
+        changed = (
+            session.query(GameStats)
+            .join(Game)
+            .filter(Game.season == "2021-2022", GameStats.team_id == "ars")
+            .order_by(Game.date)
+            .first()
+        )
+        changed.xG = 42.0
+        session.commit()
+
+        later_games = (
+            session.query(Game)
+            .filter(
+                Game.season == "2021-2022",
+                or_(Game.home_team_id == "ars", Game.away_team_id == "ars"),
+            )
+            .count()
+        )
+        assert store.update(lag=2) == later_games
+
+        populated_statistics.create_dataset(tmp_path / "fresh.csv", lag=2)
+        populated_statistics.create_dataset(
+            tmp_path / "stored.csv", lag=2, use_feature_store=True
+        )
+        assert (tmp_path / "stored.csv").read_text() == (
+            tmp_path / "fresh.csv"
+        ).read_text()
+
+
+class TestPagination:
+    """Test suite for the keyset-paginated listings."""
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to the position they encode and reject other tokens."""
+        cursor = encode_cursor(datetime(2023, 8, 12, 15, 0), "g1")
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (datetime(2023, 8, 12, 15, 0), "g1")
+        for token in ("not a cursor", encode_cursor(datetime(2023, 1, 1), "g1")[:-3]):
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                decode_cursor(token)
+
+    def test_iter_team_games(self, populated_statistics):
+        """Test the pages of a team's games add up to get_team_games(), one query per page."""
+        session = populated_statistics.session
+        statements = []
+        event.listen(
+            session.bind,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        pages = list(populated_statistics.iter_team_games("ARS", page_size=5))
+        team_queries = 1
+        assert len(statements) == team_queries + len(pages)
+
+        assert [len(page.rows) for page in pages] == [5, 5, 2]
+        assert [page.cursor is None for page in pages] == [False, False, True]
+        assert [game for page in pages for game in page.rows] == (
+            populated_statistics.get_team_games("ARS")
+        )
+
+    def test_resume_from_cursor(self, populated_statistics):
+        """Test a listing resumed from a cursor continues after the page it came from."""
+        stats = populated_statistics
+        first = next(stats.iter_games_by_season("2021-2022", page_size=4))
+        rest = list(stats.iter_games_by_season("2021-2022", cursor=first.cursor))
+        assert [game["id"] for game in first.rows] == ["g1", "g2", "g3", "g4"]
+        assert [game["id"] for game in rest[0].rows] == [f"g{n}" for n in range(5, 13)]
+        assert rest[0].cursor is None
+
+    def test_full_last_page(self, populated_statistics):
+        """Test a listing filling its last page ends with an empty page, not an error."""
+        pages = list(
+            populated_statistics.iter_games_by_season("2021-2022", page_size=6)
+        )
+        assert [len(page.rows) for page in pages] == [6, 6]
+        assert pages[-1].cursor is not None
+
+        after = populated_statistics.iter_games_by_season(
+            "2021-2022", page_size=6, cursor=pages[-1].cursor
+        )
+        assert list(after) == [([], None)]
+
+    def test_same_date_games(self, populated_statistics):
+        """Test games sharing a date are split across pages by id, without repeats or gaps."""
+        session = populated_statistics.session
+        session.query(Game).filter(Game.season == "2022-2023").update(
+            {Game.date: datetime(2023, 1, 1)}
+        )
+        session.commit()
+
+        pages = populated_statistics.iter_games_by_season(
+            "2022-2023", page_size=5, include_relationships=False, columns=["id"]
+        )
+        ids = [game["id"] for page in pages for game in page.rows]
+        assert ids == sorted(f"g{n}" for n in range(13, 25))
+
+    def test_iter_games_before_date(self, populated_statistics):
+        """Test games before a date are listed latest first, projected to the requested columns."""
+        stats = populated_statistics
+        date = datetime(2022, 6, 1)
+        pages = list(
+            stats.iter_games_before_date(
+                date, team="LIV", page_size=4, columns=["match_week"]
+            )
+        )
+        rows = [game for page in pages for game in page.rows]
+        expected = stats.get_games_before_date(date, limit=100, team="LIV")
+        assert [row["match_week"] for row in rows] == [
+            game["match_week"] for game in expected
+        ]
+        assert {key for row in rows for key in row} == {
+            "match_week",
+            "home_team",
+            "away_team",
+            "game_stats",
+            "league",
+        }
+
+    def test_record_batches(self, populated_statistics):
+        """Test pages come as NumPy record arrays of the projected columns."""
+        pages = list(
+            populated_statistics.iter_games_by_season(
+                "2022-2023",
+                page_size=8,
+                columns=["id", "home_goals"],
+                include_relationships=False,
+                records=True,
+            )
+        )
+        assert [len(page.rows) for page in pages] == [8, 4]
+        assert pages[0].rows.dtype.names == ("id", "home_goals")
+        assert pages[0].rows.home_goals.dtype == "i8"
+        assert list(pages[1].rows.id) == ["g21", "g22", "g23", "g24"]
+
+        with pytest.raises(ValueError, match="include_relationships=False"):
+            populated_statistics.iter_team_games("ARS", records=True)
+
+    def test_iter_game_stats_before_date(self, populated_statistics):
+        """Test the pages of statistics before a date match get_game_stats_before_date()."""
+        stats = populated_statistics
+        date = datetime(2023, 1, 1)
+        pages = list(stats.iter_game_stats_before_date(date, team="TOT", page_size=7))
+        expected = stats.get_game_stats_before_date(date, limit=100, team="TOT")
+        assert len(expected) > 7
+        assert [len(page.rows) for page in pages[:-1]] == [7] * (len(pages) - 1)
+        assert [row for page in pages for row in page.rows] == expected
+
+    def test_invalid_arguments(self, populated_statistics):
+        """Test bad arguments fail on the call rather than on the first page."""
+        stats = populated_statistics
+        with pytest.raises(ValueError, match="page_size must be at least 1"):
+            stats.iter_team_games("ARS", page_size=0)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            stats.iter_team_games("ARS", cursor="abc")
+        with pytest.raises(ValueError, match="No team found with name: XYZ"):
+            stats.iter_team_games("XYZ")
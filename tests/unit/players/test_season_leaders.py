@@ -10,11 +10,14 @@ class TestPlayerSeasonLeaders:
     """Tests for the PlayerSeasonLeaders class."""
 
     @staticmethod
-    def base_init_side_effect(self, url, target_season, season_limit, cache):
+    def base_init_side_effect(
+        self, url, target_season, season_limit, cache, parser="lxml"
+    ):
         self.url = url
         self.target_season = target_season
         self.season_limit = season_limit
         self.cache = cache
+        self.parser = parser
         self.__post_init__()
 
     @patch("premier_league.players.season_leaders.BaseScrapper.__init__", autospec=True)
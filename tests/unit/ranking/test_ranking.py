@@ -1,16 +1,127 @@
+import itertools
 import os
+from datetime import date, datetime
 from unittest.mock import MagicMock, PropertyMock, patch
 
+import pytest
 from reportlab.lib.pagesizes import A3
 
 from premier_league import RankingTable
+from premier_league.data.engine import create_sqlite_engine, session_scope
+from premier_league.data.models import Base, Game, League, StandingsSnapshot, Team
+from premier_league.ranking.snapshots import StandingsStore
+from premier_league.ranking.standings import (
+    STANDINGS_HEADER,
+    standings_table,
+    team_standings,
+)
+
+# (match week, day of August 2023, home, away, home goals, away goals)
+RESULTS = [
+    (1, 12, "ars", "che", 2, 1),
+    (1, 12, "liv", "tot", 1, 1),
+    (2, 19, "che", "liv", 0, 3),
+    (2, 20, "tot", "ars", 2, 2),
+    (3, 26, "ars", "liv", 1, 0),
+    (3, 27, "che", "tot", 4, 0),
+]
+
+
+@pytest.fixture
+def standings_session():
+    """Fixture with a session on an in-memory database holding three match weeks of a four team league."""
+    engine = create_sqlite_engine()
+    Base.metadata.create_all(engine)
+    with session_scope(engine) as session:
+        session.add(League(id=1, name="Premier League", up_to_date_season="2023-2024"))
+        session.add(League(id=2, name="La Liga", up_to_date_season="2023-2024"))
+        session.add(
+            League(id=3, name="Fußball-Bundesliga", up_to_date_season="2023-2024")
+        )
+        for team_id in ("ars", "che", "liv", "tot"):
+            session.add(Team(id=team_id, name=team_id.upper(), league_id=1))
+        session.add(Team(id="rma", name="RMA", league_id=2))
+        session.add(Team(id="bay", name="BAY", league_id=3))
+        session.add(Team(id="bvb", name="BVB", league_id=3))
+        for index, (week, day, home, away, home_goals, away_goals) in enumerate(
+            RESULTS
+        ):
+            session.add(
+                Game(
+                    id=f"g{index}",
+                    home_team_id=home,
+                    away_team_id=away,
+                    league_id=1,
+                    home_goals=home_goals,
+                    away_goals=away_goals,
+                    date=datetime(2023, 8, day, 15),
+                    match_week=week,
+                    season="2023-2024",
+                )
+            )
+        # A fixture still to be played, a game of another season and a game of another league.
+        session.add(
+            Game(
+                id="future",
+                home_team_id="ars",
+                away_team_id="tot",
+                league_id=1,
+                date=datetime(2023, 9, 2),
+                match_week=4,
+                season="2023-2024",
+            )
+        )
+        session.add(
+            Game(
+                id="old",
+                home_team_id="tot",
+                away_team_id="che",
+                league_id=1,
+                home_goals=5,
+                away_goals=0,
+                date=datetime(2022, 8, 12),
+                match_week=1,
+                season="2022-2023",
+            )
+        )
+        session.add(
+            Game(
+                id="liga",
+                home_team_id="rma",
+                away_team_id="ars",
+                league_id=2,
+                home_goals=3,
+                away_goals=0,
+                date=datetime(2023, 8, 12),
+                match_week=1,
+                season="2023-2024",
+            )
+        )
+        session.add(
+            Game(
+                id="bundesliga",
+                home_team_id="bay",
+                away_team_id="bvb",
+                league_id=3,
+                home_goals=2,
+                away_goals=2,
+                date=datetime(2023, 8, 18),
+                match_week=1,
+                season="2023-2024",
+            )
+        )
+    with session_scope(engine) as session:
+        yield session
+    engine.dispose()
 
 
 class TestRankingTable:
     """Tests for the RankingTable class."""
 
     @staticmethod
-    def base_init_side_effect(self, url, target_season, season_limit, cache):
+    def base_init_side_effect(
+        self, url, target_season, season_limit, cache, parser="lxml"
+    ):
         """
         Mocks the attribute setting and any post-init processing of BaseScrapper.
         """
@@ -18,6 +129,7 @@ class TestRankingTable:
         self.target_season = target_season
         self.season_limit = season_limit
         self.cache = cache
+        self.parser = parser
         self.__post_init__()
 
     @patch("premier_league.ranking.ranking_table.BaseScrapper.__init__", autospec=True)
@@ -149,3 +261,294 @@ class TestRankingTable:
                 mock_euro_spots.assert_called_once()
                 if os.path.exists("test") and not os.listdir("test"):
                     os.rmdir("test")
+
+
+class TestStandings:
+    """Tests for the league tables computed from the match database."""
+
+    def test_standings_table(self, standings_session):
+        """Test the table has the shape of get_ranking_list and ranks by points, goal difference and goals."""
+        assert standings_table(standings_session, "Premier League", "2023-2024") == [
+            STANDINGS_HEADER,
+            ["1", "ARS", "3", "2", "1", "0", "5", "3", "+2", "7"],
+            ["2", "LIV", "3", "1", "1", "1", "4", "2", "+2", "4"],
+            ["3", "CHE", "3", "1", "0", "2", "5", "5", "0", "3"],
+            ["4", "TOT", "3", "0", "2", "1", "3", "7", "−4", "2"],
+        ]
+
+    def test_snapshots(self, standings_session):
+        """Test tables as of a match week and as of a date."""
+        after_week_one = standings_table(
+            standings_session, "Premier League", "2023-2024", match_week=1
+        )
+        assert [row[1] for row in after_week_one[1:]] == ["ARS", "LIV", "TOT", "CHE"]
+        assert after_week_one[1][2] == "1"
+
+        # Dates include the whole day, datetimes only the games played until then.
+        on_date = team_standings(
+            standings_session, "Premier League", "2023-2024", date=date(2023, 8, 19)
+        )
+        before_kick_off = team_standings(
+            standings_session,
+            "Premier League",
+            "2023-2024",
+            date=datetime(2023, 8, 19, 12),
+        )
+        assert sum(row["played"] for row in on_date) == 6
+        assert sum(row["played"] for row in before_kick_off) == 4
+
+    def test_home_and_away_splits(self, standings_session):
+        """Test the home and away tables only count the games of every team at that venue."""
+        home = team_standings(
+            standings_session, "Premier League", "2023-2024", venue="home"
+        )
+        away = team_standings(
+            standings_session, "Premier League", "2023-2024", venue="away"
+        )
+        arsenal_home = next(row for row in home if row["team_id"] == "ars")
+        arsenal_away = next(row for row in away if row["team_id"] == "ars")
+        assert (arsenal_home["played"], arsenal_home["points"]) == (2, 6)
+        assert (arsenal_away["played"], arsenal_away["goals_for"]) == (1, 2)
+        assert home[0]["team_id"] == "ars" and home[0]["position"] == 1
+        with pytest.raises(ValueError, match="venue must be either home, away or None"):
+            team_standings(standings_session, "Premier League", "2023-2024", venue="x")
+
+    def test_no_games(self, standings_session):
+        """Test a season without played games only has the header."""
+        assert standings_table(standings_session, "Serie A", "2023-2024") == [
+            STANDINGS_HEADER
+        ]
+
+    @patch("premier_league.ranking.ranking_table.RankingTable.request_url_page")
+    def test_ranking_table_from_database(self, mock_request_page, standings_session):
+        """Test RankingTable serves stored seasons from the database without scraping."""
+        ranking = RankingTable(
+            league="premier league",
+            target_season="2023-2024",
+            session=standings_session,
+            match_week=2,
+        )
+        mock_request_page.assert_not_called()
+        assert ranking.page is None
+        assert ranking.get_ranking_list() == standings_table(
+            standings_session, "Premier League", "2023-2024", match_week=2
+        )
+
+    @patch("premier_league.ranking.ranking_table.RankingTable.request_url_page")
+    def test_ranking_table_from_database_other_league(
+        self, mock_request_page, standings_session
+    ):
+        """Test RankingTable finds leagues stored under another name than their ranking key."""
+        ranking = RankingTable(
+            league="bundesliga",
+            target_season="2023-2024",
+            session=standings_session,
+            match_week=1,
+        )
+        mock_request_page.assert_not_called()
+        assert ranking.get_ranking_list() == [
+            STANDINGS_HEADER,
+            ["1", "BAY", "1", "0", "1", "0", "2", "2", "0", "1"],
+            ["2", "BVB", "1", "0", "1", "0", "2", "2", "0", "1"],
+        ]
+
+    @patch("premier_league.ranking.ranking_table.RankingTable._init_ranking_table")
+    @patch("premier_league.ranking.ranking_table.RankingTable.request_url_page")
+    def test_ranking_table_falls_back_to_scraping(
+        self, mock_request_page, mock_init_table, standings_session
+    ):
+        """Test RankingTable scrapes seasons that are not in the database."""
+        mock_init_table.return_value = [["Pos", "Team"]]
+        ranking = RankingTable(
+            league="Serie A", target_season="2023-2024", session=standings_session
+        )
+        mock_request_page.assert_called_once()
+        assert ranking.ranking_list == [["Pos", "Team"]]
+        with pytest.raises(
+            ValueError, match="match_week and date require a database session"
+        ):
+            RankingTable(league="Serie A", match_week=3)
+
+
+# Teams under their fbref names, in the order of the table of the fbref_session seasons.
+FBREF_TEAMS = [
+    "Manchester City",
+    "Manchester Utd",
+    "Tottenham",
+    "Liverpool",
+    "Chelsea",
+    "Arsenal",
+    "Burnley",
+    "Everton",
+    "Newcastle Utd",
+    "Wolves",
+]
+
+
+@pytest.fixture
+def fbref_session():
+    """Fixture with a session on an in-memory database where every team beats the teams below it, in two seasons."""
+    engine = create_sqlite_engine()
+    Base.metadata.create_all(engine)
+    with session_scope(engine) as session:
+        session.add(League(id=1, name="Premier League", up_to_date_season="2022-2023"))
+        for index, name in enumerate(FBREF_TEAMS):
+            session.add(Team(id=f"t{index}", name=name, league_id=1))
+        for season in (2017, 2022):
+            for home, away in itertools.combinations(range(len(FBREF_TEAMS)), 2):
+                session.add(
+                    Game(
+                        id=f"{season}-{home}-{away}",
+                        home_team_id=f"t{home}",
+                        away_team_id=f"t{away}",
+                        league_id=1,
+                        home_goals=1,
+                        away_goals=0,
+                        date=datetime(season, 9, 1),
+                        match_week=1,
+                        season=f"{season}-{season + 1}",
+                    )
+                )
+    with session_scope(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def styled_rows(styles):
+    """The (row, color) of the BACKGROUND styles of a ranking PDF."""
+    return sorted(
+        (style[1][1], style[3].hexval()) for style in styles if len(style) == 4
+    )
+
+
+class TestEuropeanSpots:
+    """Tests for the European qualification spots of tables computed from the database."""
+
+    @patch("premier_league.ranking.ranking_table.RankingTable.get_list_by_xpath")
+    @patch("premier_league.ranking.ranking_table.RankingTable.request_url_page")
+    def test_scraped_spots(
+        self, mock_request_page, mock_list_by_xpath, fbref_session, tmp_path
+    ):
+        """Test the PDF of an older season loads the season page and matches its Wikipedia team names."""
+        qualified = {
+            "Champions League": [
+                "Manchester City F.C.",
+                "Manchester United F.C.",
+                "Tottenham Hotspur F.C.",
+                "Liverpool F.C.",
+            ],
+            "Europa League": [
+                "Chelsea F.C.",
+                "Arsenal F.C.",
+                "Burnley F.C. (Fair Play)",
+            ],
+        }
+        mock_list_by_xpath.side_effect = lambda xpath, tournament: qualified[tournament]
+        ranking = RankingTable(
+            target_season="2017-2018", session=fbref_session, match_week=1
+        )
+        assert ranking.page is None
+
+        assert styled_rows(ranking._scrap_european_qualification_spot()) == [
+            (1, "0xaaff88"),
+            (2, "0xaaff88"),
+            (3, "0xaaff88"),
+            (4, "0xaaff88"),
+            (5, "0x99cc00"),
+            (6, "0x99cc00"),
+        ]
+        mock_request_page.assert_called_once()
+
+        ranking.get_ranking_pdf("table", dir=str(tmp_path / "files"))
+        assert (tmp_path / "files" / "table.pdf").exists()
+        mock_request_page.assert_called_once()
+
+    @patch(
+        "premier_league.ranking.ranking_table.RankingTable._find_european_competition_spot"
+    )
+    @patch("premier_league.ranking.ranking_table.RankingTable.request_url_page")
+    def test_cup_winner_spots(
+        self, mock_request_page, mock_competition_spot, fbref_session
+    ):
+        """Test cup winners named as on Wikipedia get their spot in a table of fbref names."""
+        mock_competition_spot.return_value = {
+            "EFL": "Newcastle United",
+            "FA": "Manchester City",
+            "CL": "Real Madrid",
+            "UEL": None,
+            "UECL": None,
+        }
+        ranking = RankingTable(
+            target_season="2022-2023", session=fbref_session, match_week=1
+        )
+        assert styled_rows(ranking._find_european_qualification_spot()) == [
+            (5, "0x99cc00"),
+            (6, "0x99cc00"),
+            (9, "0x6aa84f"),
+        ]
+        mock_request_page.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "name, row",
+        [
+            ("Manchester City", 1),
+            ("Manchester United F.C.", 2),
+            ("Tottenham Hotspur", 3),
+            ("Wolverhampton Wanderers", 10),
+            ("Real Madrid", None),
+        ],
+    )
+    def test_team_row(self, fbref_session, name, row):
+        """Test Wikipedia team names are found in a table of fbref names."""
+        ranking = RankingTable(
+            target_season="2022-2023", session=fbref_session, match_week=1
+        )
+        assert ranking._team_row(name) == row
+
+
+class TestStandingsStore:
+    """Tests for the materialized standings after every match week."""
+
+    def test_tables_match_computed_standings(self, standings_session):
+        """Test the stored table after every week is the table computed from the games up to it."""
+        store = StandingsStore(standings_session)
+        # 4 teams after each of the 3 played weeks, 2 in 2022-2023, 2 in La Liga and 2 in the Bundesliga.
+        assert store.rebuild() == 18
+
+        for week in (1, 2, 3):
+            assert store.table("Premier League", "2023-2024", week) == team_standings(
+                standings_session, "Premier League", "2023-2024", match_week=week
+            )
+        full_table = team_standings(standings_session, "Premier League", "2023-2024")
+        assert store.table("Premier League", "2023-2024") == full_table
+        assert store.table("Premier League", "2023-2024", 30) == full_table
+        assert store.table("Premier League", "2023-2024", 0) == []
+        with pytest.raises(ValueError, match="No league found with name: Serie B"):
+            store.table("Serie B", "2023-2024")
+
+    def test_trajectory(self, standings_session):
+        """Test the positions of a team along a season."""
+        store = StandingsStore(standings_session)
+        store.rebuild()
+        assert store.trajectory("Premier League", "2023-2024", "CHE") == [
+            (1, 4),
+            (2, 4),
+            (3, 3),
+        ]
+        assert store.trajectory("Premier League", "2023-2024", "RMA") == []
+
+    def test_refresh_keeps_earlier_weeks(self, standings_session):
+        """Test a refresh from a week only rewrites the tables from that week on."""
+        store = StandingsStore(standings_session)
+        store.rebuild()
+        standings_session.query(StandingsSnapshot).filter_by(
+            match_week=1, team_id="ars"
+        ).update({"points": 99})
+        standings_session.get(Game, "g5").home_goals = 0
+        standings_session.flush()
+
+        assert store.refresh("Premier League", "2023-2024", from_week=3) == 4
+        assert store.table("Premier League", "2023-2024", 1)[0]["points"] == 99
+        assert store.table("Premier League", "2023-2024", 3) == team_standings(
+            standings_session, "Premier League", "2023-2024"
+        )
@@ -7,7 +7,9 @@ class TestTransfers:
     """Tests for the Transfers class."""
 
     @staticmethod
-    def base_init_side_effect(self, url, target_season, season_limit, cache):
+    def base_init_side_effect(
+        self, url, target_season, season_limit, cache, parser="lxml"
+    ):
         """
         Mocks the attribute setting and any post-init processing of BaseScrapper.
         """
@@ -15,6 +17,7 @@ class TestTransfers:
         self.target_season = target_season
         self.season_limit = season_limit
         self.cache = cache
+        self.parser = parser
         self.__post_init__()
 
     @patch("premier_league.transfers.transfers.BaseScrapper.__init__", autospec=True)